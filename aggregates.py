@@ -0,0 +1,161 @@
+# MAU2 Democracy Platform - Incremental Analytics Aggregates
+# Running counters and monthly/category rollups, updated inside each store write
+
+import time
+
+CLOSED_STATUSES = ("closed", "resolved")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    month TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    opened INTEGER NOT NULL DEFAULT 0,
+    closed INTEGER NOT NULL DEFAULT 0,
+    response_seconds REAL NOT NULL DEFAULT 0,
+    responses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, kind)
+);
+
+CREATE TABLE IF NOT EXISTS category_rollups (
+    kind TEXT NOT NULL,
+    category TEXT NOT NULL,
+    opened INTEGER NOT NULL DEFAULT 0,
+    closed INTEGER NOT NULL DEFAULT 0,
+    response_seconds REAL NOT NULL DEFAULT 0,
+    responses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, category)
+);
+"""
+
+
+def month_key(timestamp):
+    return time.strftime("%Y-%m", time.gmtime(timestamp))
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def _bump_counter(conn, name, amount=1):
+    conn.execute(
+        "INSERT INTO metric_counters (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, amount),
+    )
+
+
+def _bump_rollups(conn, kind, category, timestamp, opened=0, closed=0, response_seconds=0.0, responses=0):
+    values = (opened, closed, response_seconds, responses)
+    conn.execute(
+        "INSERT INTO monthly_rollups (month, kind, opened, closed, response_seconds, responses) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(month, kind) DO UPDATE SET "
+        "opened = opened + excluded.opened, closed = closed + excluded.closed, "
+        "response_seconds = response_seconds + excluded.response_seconds, responses = responses + excluded.responses",
+        (month_key(timestamp), kind, *values),
+    )
+    conn.execute(
+        "INSERT INTO category_rollups (kind, category, opened, closed, response_seconds, responses) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(kind, category) DO UPDATE SET "
+        "opened = opened + excluded.opened, closed = closed + excluded.closed, "
+        "response_seconds = response_seconds + excluded.response_seconds, responses = responses + excluded.responses",
+        (kind, category, *values),
+    )
+
+
+def record_opened(conn, kind, category, created_at):
+    _bump_counter(conn, f"{kind}_opened")
+    _bump_rollups(conn, kind, category, created_at, opened=1)
+
+
+def record_status_change(conn, kind, category, created_at, old_status, new_status, first_response, now):
+    """Account for a status transition; ``first_response`` marks the first move off the initial status."""
+    closed = int(new_status in CLOSED_STATUSES and old_status not in CLOSED_STATUSES)
+    reopened = int(old_status in CLOSED_STATUSES and new_status not in CLOSED_STATUSES)
+    response_seconds = max(0.0, now - created_at) if first_response else 0.0
+    responses = int(first_response)
+    if closed - reopened:
+        _bump_counter(conn, f"{kind}_closed", closed - reopened)
+    if responses:
+        _bump_counter(conn, f"{kind}_response_seconds", response_seconds)
+        _bump_counter(conn, f"{kind}_responses")
+    if closed or reopened or responses:
+        _bump_rollups(conn, kind, category, now, closed=closed - reopened,
+                      response_seconds=response_seconds, responses=responses)
+
+
+def record_existing(conn, kind, record):
+    """Account for a record written with its history already in place (rebuilds and bulk imports)."""
+    record_opened(conn, kind, record["category"], record["created_at"])
+    if record["first_response_at"] is not None:
+        record_status_change(conn, kind, record["category"], record["created_at"], None, record["status"],
+                             True, record["first_response_at"])
+    elif record["status"] in CLOSED_STATUSES:
+        record_status_change(conn, kind, record["category"], record["created_at"], None, record["status"],
+                             False, record["created_at"])
+
+
+def record_removed(conn, kind, record, closed_at=None):
+    """Take a deleted record (a merged duplicate) back out of every counter and rollup.
+
+    ``closed_at`` is when a closed record was closed, the month its close was counted in.
+    """
+    _bump_counter(conn, f"{kind}_opened", -1)
+    _bump_rollups(conn, kind, record["category"], record["created_at"], opened=-1)
+    if record["first_response_at"] is not None:
+        response_seconds = max(0.0, record["first_response_at"] - record["created_at"])
+        _bump_counter(conn, f"{kind}_response_seconds", -response_seconds)
+        _bump_counter(conn, f"{kind}_responses", -1)
+        _bump_rollups(conn, kind, record["category"], record["first_response_at"],
+                      response_seconds=-response_seconds, responses=-1)
+    if record["status"] in CLOSED_STATUSES:
+        _bump_counter(conn, f"{kind}_closed", -1)
+        _bump_rollups(conn, kind, record["category"],
+                      closed_at or record["first_response_at"] or record["created_at"], closed=-1)
+    # Rollups left with nothing in them would show up as empty bars
+    conn.execute("DELETE FROM monthly_rollups WHERE kind = ? AND opened = 0 AND closed = 0 AND responses = 0",
+                 (kind,))
+    conn.execute(
+        "DELETE FROM category_rollups WHERE kind = ? AND category = ? AND opened = 0 AND closed = 0 AND responses = 0",
+        (kind, record["category"]),
+    )
+
+
+def record_verified(conn, kind, amount=1):
+    _bump_counter(conn, f"{kind}_verified", amount)
+
+
+def record_joined(conn, count=1):
+    _bump_counter(conn, "citizen_joined", count)
+
+
+# === READ SIDE ===
+def snapshot(conn, months=6):
+    """Everything the analytics page needs, read from rollups only."""
+    counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM metric_counters")}
+    monthly = {}
+    for kind in ("petition", "report"):
+        rows = conn.execute(
+            "SELECT * FROM monthly_rollups WHERE kind = ? ORDER BY month DESC LIMIT ?", (kind, months)
+        ).fetchall()
+        monthly[kind] = [dict(row) for row in reversed(rows)]
+    categories = [dict(row) for row in conn.execute("SELECT * FROM category_rollups ORDER BY kind, category")]
+    return {"counters": counters, "monthly": monthly, "categories": categories}
+
+
+def rebuild(conn):
+    """Recompute every aggregate from the base tables (used once for stores that predate the rollups)."""
+    conn.execute("DELETE FROM metric_counters")
+    conn.execute("DELETE FROM monthly_rollups")
+    conn.execute("DELETE FROM category_rollups")
+    for kind, table in (("petition", "petitions"), ("report", "reports")):
+        rows = conn.execute(f"SELECT category, status, created_at, first_response_at FROM {table}").fetchall()
+        for row in rows:
+            record_existing(conn, kind, row)
+    verified = conn.execute("SELECT COUNT(DISTINCT petition_id) FROM evidence").fetchone()[0]
+    if verified:
+        _bump_counter(conn, "petition_verified", verified)
+    citizens = conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0]
+    if citizens:
+        record_joined(conn, citizens)
@@ -0,0 +1,108 @@
+# MAU2 Democracy Platform - Bulk Import Throughput
+# Writes a synthetic complaint log to disk row by row, streams it into a fresh
+# store with bulk_io, and reports overall rows/sec, the spread of per-chunk
+# rates (a steady import keeps p5 close to p50) and peak memory, then exports
+# it back out. Pass --rows 10000000 for the 10M-row run.
+#
+# Usage: python benchmarks/bench_bulk_io.py [--rows 100000 --format csv --chunk-size 5000]
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk_io
+from platform_store import PlatformStore
+
+ISSUES = [
+    ("Pothole on {street}", "Deep pothole near the crossing damages cars and bikes."),
+    ("Broken streetlight on {street}", "The streetlight has been out for weeks and the block is dark."),
+    ("Overflowing bins on {street}", "Trash is piling up next to the park entrance."),
+    ("Speeding cars on {street}", "Drivers race through the school zone every morning."),
+    ("Flooded underpass at {street}", "Drainage is blocked and the underpass floods after rain."),
+]
+STREETS = ["Main Street", "Oak Avenue", "Harbor Road", "Mission Street", "Elm Court", "Pine Street"]
+STATUSES = ["submitted", "in_progress", "resolved", "closed"]
+
+
+def write_log(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["report_type", "description", "category", "status", "reporter", "location",
+                         "created_at", "lat", "lon"])
+        now = time.time()
+        for i in range(rows):
+            title, description = random.choice(ISSUES)
+            street = random.choice(STREETS)
+            writer.writerow([
+                title.format(street=street), description, "", random.choice(STATUSES), f"citizen_{i % 5000}",
+                street, now - random.uniform(0, 365 * 86400),
+                round(random.uniform(37.70, 37.81), 5), round(random.uniform(-122.51, -122.38), 5),
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export throughput")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", choices=("csv", "jsonl", "parquet"), default="csv")
+    parser.add_argument("--chunk-size", type=int, default=bulk_io.CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        source = os.path.join(data_dir, "log.csv")
+        write_log(source, args.rows)
+        if args.format != "csv":
+            # Convert through a scratch store so every format carries the same rows
+            scratch = PlatformStore(os.path.join(data_dir, "scratch.db"))
+            bulk_io.import_file(scratch, "report", source, chunk_size=args.chunk_size)
+            source = os.path.join(data_dir, f"log.{args.format}")
+            bulk_io.export_file(scratch, "report", source, chunk_size=args.chunk_size)
+            scratch.close()
+
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        chunk_rates = []
+        last = {"read": 0, "at": time.perf_counter()}
+
+        def on_chunk(summary):
+            now = time.perf_counter()
+            chunk_rates.append((summary["read"] - last["read"]) / max(now - last["at"], 1e-9))
+            last.update(read=summary["read"], at=now)
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        last["at"] = time.perf_counter()
+        summary = bulk_io.import_file(store, "report", source, chunk_size=args.chunk_size, on_chunk=on_chunk)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        started = time.perf_counter()
+        exported = bulk_io.export_file(store, "report", os.path.join(data_dir, f"export.{args.format}"),
+                                       chunk_size=args.chunk_size)
+        export_seconds = time.perf_counter() - started
+        store.close()
+
+    chunk_rates.sort()
+
+    def pick(q):
+        return round(chunk_rates[min(len(chunk_rates) - 1, int(q * len(chunk_rates)))])
+
+    print(json.dumps({
+        "rows": args.rows,
+        "format": args.format,
+        "chunk_size": args.chunk_size,
+        "inserted": summary["inserted"],
+        "invalid": summary["invalid"],
+        "import_rows_per_sec": summary["rows_per_sec"],
+        "chunk_rows_per_sec": {"p5": pick(0.05), "p50": pick(0.50), "p95": pick(0.95)},
+        "peak_rss_growth_mib": round((rss_after - rss_before) / 1024, 1),
+        "export_rows_per_sec": round(exported / max(export_seconds, 1e-9)),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
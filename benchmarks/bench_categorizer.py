@@ -0,0 +1,95 @@
+# MAU2 Democracy Platform - Categorization Batching Benchmark
+# Runs concurrent categorize() calls against a stub model with a fixed per-call
+# latency, comparing one-call-per-text with batched calls, and reports model
+# calls, cache hit rate and per-request latency.
+#
+# Usage: python benchmarks/bench_categorizer.py [--requests 400 --model-latency 0.05]
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorizer import PETITION_CATEGORIES, CategorizationService, KeywordClassifier
+
+SAMPLES = [
+    ("Add a protected bike lane on Main Street to reduce traffic", "Transportation"),
+    ("Fix the pothole and broken streetlight on Oak Avenue", "Infrastructure"),
+    ("Plant more trees in the park and reduce air pollution", "Environment"),
+    ("More police patrols after a wave of theft and vandalism", "Public Safety"),
+    ("Hire more teachers and open the school library on weekends", "Education"),
+    ("Keep the community clinic open with more nurses and doctors", "Healthcare"),
+    ("Bus route 12 should run every ten minutes during the commute", "Transportation"),
+    ("Repair the sewer drainage that causes flooding every winter", "Infrastructure"),
+]
+
+
+def stub_model(latency):
+    classifier = KeywordClassifier()
+
+    def model(kind, texts, labels):
+        time.sleep(latency)
+        return [classifier.classify(text, labels) for text in texts]
+
+    return model
+
+
+def run(service, texts, concurrency):
+    latencies = []
+
+    def one(text):
+        started = time.perf_counter()
+        service.categorize(text, timeout=60)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, texts))
+    elapsed = time.perf_counter() - started
+    stats = service.stats()
+    service.shutdown()
+    return {
+        "requests": len(texts),
+        "model_calls": stats["model_calls"],
+        "cache_hit_rate": round(stats["cache_hits"] / max(1, stats["cache_hits"] + stats["cache_misses"]), 3),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(max(latencies), 1),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Categorization batching benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--unique", type=float, default=0.75, help="fraction of requests with unique text")
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    random.seed(7)
+    texts = []
+    for i in range(args.requests):
+        text, _ = random.choice(SAMPLES)
+        texts.append(f"{text} (#{i})" if random.random() < args.unique else text)
+
+    results = {
+        "unbatched": run(CategorizationService(stub_model(args.model_latency), batch_size=1, max_wait=0),
+                         texts, args.concurrency),
+        "batched": run(CategorizationService(stub_model(args.model_latency), batch_size=32, max_wait=0.05),
+                       texts, args.concurrency),
+    }
+    classifier = KeywordClassifier()
+    results["keyword_fallback_accuracy"] = round(
+        sum(classifier.classify(text, PETITION_CATEGORIES) == label for text, label in SAMPLES) / len(SAMPLES), 3
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
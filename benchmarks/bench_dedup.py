@@ -0,0 +1,70 @@
+# MAU2 Democracy Platform - Near-Duplicate Lookup Latency
+# Seeds the store with N petitions (a share of them reworded copies of each other)
+# and times similar_petitions() lookups, which should stay flat as N grows
+# because only petitions sharing an LSH bucket are scored.
+#
+# Usage: python benchmarks/bench_dedup.py [--sizes 1000 5000 10000]
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from platform_store import PlatformStore
+
+STREETS = ["Main Street", "Oak Avenue", "Harbor Road", "Mission Street", "Pine Street", "Elm Court"]
+ISSUES = ["Pothole", "Broken streetlight", "Flooded underpass", "Missing crosswalk", "Overflowing bins"]
+WORDS = ("community council budget library park school clinic bus route noise market water housing "
+         "youth centre playground sidewalk traffic safety garden bridge recycling transit").split()
+
+
+def seed(store, count, rng):
+    for i in range(count):
+        if i % 10 == 0:
+            issue, street = rng.choice(ISSUES), rng.choice(STREETS)
+            title = f"{issue} on {street}"
+            description = f"The {issue.lower()} on {street} has not been fixed for months."
+        else:
+            title = " ".join(rng.sample(WORDS, 4)).capitalize() + f" {i}"
+            description = " ".join(rng.choices(WORDS, k=20))
+        store.add_petition(title, description, "Infrastructure", f"citizen_{i % 500}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate lookup latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        rng = random.Random(size)
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = PlatformStore(os.path.join(data_dir, "bench.db"))
+            started = time.perf_counter()
+            seed(store, size, rng)
+            seeded = time.perf_counter() - started
+            latencies, hits = [], 0
+            for _ in range(args.lookups):
+                query = f"{rng.choice(ISSUES)} on {rng.choice(STREETS)}"
+                started = time.perf_counter()
+                hits += bool(store.similar_petitions(query))
+                latencies.append((time.perf_counter() - started) * 1000)
+            results[size] = {
+                "insert_ms_per_petition": round(seeded * 1000 / size, 3),
+                "lookup_median_ms": round(statistics.median(latencies), 3),
+                "lookup_max_ms": round(max(latencies), 3),
+                "lookups_with_suggestions": hits,
+            }
+            store.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
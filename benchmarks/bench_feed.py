@@ -0,0 +1,73 @@
+# MAU2 Democracy Platform - Civic Feed Pagination Latency
+# Seeds the store with N petitions and times keyset-paginated feed pages at
+# several sizes, to show page latency stays flat as the table grows.
+#
+# Usage: python benchmarks/bench_feed.py [--sizes 1000 10000 100000]
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from platform_store import PlatformStore
+
+CATEGORIES = ["Transportation", "Environment", "Infrastructure", "Public Safety", "Education", "Healthcare"]
+PAGE_SIZE = 4
+
+
+def seed(store, count):
+    now = time.time()
+    rows = [
+        (f"petition_bench_{i:08d}", f"Petition {i}", "Seeded petition for the feed benchmark.",
+         random.choice(CATEGORIES), "active", "bench", "", random.randint(0, 5000), now - i)
+        for i in range(count)
+    ]
+    with store.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO petitions (id, title, description, category, status, creator, location, votes, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def time_pages(store, order, pages):
+    latencies, cursor = [], None
+    for _ in range(pages):
+        started = time.perf_counter()
+        _, cursor = store.petition_feed(order, cursor, PAGE_SIZE)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if cursor is None:
+            break
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Civic feed pagination latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = PlatformStore(os.path.join(data_dir, "bench.db"))
+            seed(store, size)
+            for order in ("recent", "votes"):
+                latencies = time_pages(store, order, args.pages)
+                results[f"{size}:{order}"] = {
+                    "pages": len(latencies),
+                    "median_ms": round(statistics.median(latencies), 3),
+                    "max_ms": round(max(latencies), 3),
+                }
+            store.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# MAU2 Democracy Platform - Lifecycle Log Throughput
+# Moves a batch of reports through submitted -> acknowledged -> in_progress ->
+# resolved from many threads, once with one transaction per transition and once
+# through the group-commit LifecycleLog, then times a full replay of the event
+# log against a replay from the latest snapshot, and checks the histogram
+# percentiles against exact ones computed from the log.
+#
+# Usage: python benchmarks/bench_lifecycle.py [--reports 5000 --threads 16]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lifecycle
+from platform_store import PlatformStore
+
+STEPS = ("acknowledged", "in_progress", "resolved")
+CATEGORIES = ["Infrastructure", "Environment", "Public Safety", "Transportation"]
+
+
+def seed(store, reports):
+    now = time.time()
+    records = [{
+        "report_type": "Pothole", "description": "Deep pothole near the crossing.",
+        "category": random.choice(CATEGORIES), "status": "submitted", "location": "", "reporter": "bench",
+        "anonymous": 0, "created_at": now - random.uniform(3600, 30 * 86400), "first_response_at": None,
+        "coordinates": None,
+    } for _ in range(reports)]
+    store.import_records("report", records)
+    return [record["id"] for record in records]
+
+
+def run(ids, threads, transition):
+    chunks = [ids[i::threads] for i in range(threads)]
+
+    def work(chunk):
+        for status in STEPS:
+            for record_id in chunk:
+                transition(record_id, status)
+
+    workers = [threading.Thread(target=work, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(ids) * len(STEPS) / (time.perf_counter() - started)
+
+
+def exact_percentile(conn, quantile):
+    rows = conn.execute(
+        "SELECT e.at - o.at FROM lifecycle_events e JOIN lifecycle_events o "
+        "ON o.record_id = e.record_id AND o.previous IS NULL "
+        "WHERE e.previous = 'submitted' ORDER BY 1"
+    ).fetchall()
+    return rows[min(len(rows) - 1, int(quantile * len(rows)))][0]
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lifecycle log group commit, snapshots and percentiles")
+    parser.add_argument("--reports", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+
+        direct = run(seed(store, args.reports), args.threads,
+                     lambda record_id, status: store.set_report_status(record_id, status))
+
+        log = lifecycle.LifecycleLog(store, snapshot_every=10 ** 12).start()
+        grouped = run(seed(store, args.reports), args.threads,
+                      lambda record_id, status: log.transition("report", record_id, status).result())
+        log.stop()
+
+        full_state, full_replay = timed(store.lifecycle_state)
+        store.snapshot_lifecycle()
+        # A little traffic after the snapshot, as there would be between snapshots
+        for record_id in seed(store, 100):
+            store.set_report_status(record_id, "acknowledged")
+        state, snapshot_replay = timed(store.lifecycle_state)
+
+        estimated, query_seconds = timed(lambda: store.response_percentiles(quantiles=(0.5, 0.9, 0.99)))
+        with store.connection() as conn:
+            exact = {quantile: exact_percentile(conn, quantile) for quantile in estimated}
+        store.close()
+
+    print(json.dumps({
+        "reports": args.reports * 2,
+        "threads": args.threads,
+        "transitions_per_sec": {"one_commit_each": round(direct), "group_commit": round(grouped)},
+        "group_commit_batches": log.batches,
+        "replay_ms": {"full_log": round(full_replay * 1000, 1), "from_snapshot": round(snapshot_replay * 1000, 1)},
+        "replayed_records": {"full_log": len(full_state), "from_snapshot": len(state)},
+        "percentile_query_ms": round(query_seconds * 1000, 2),
+        "response_hours": {
+            f"p{round(quantile * 100)}": {"histogram": round(estimated[quantile] / 3600, 2),
+                                          "exact": round(exact[quantile] / 3600, 2)}
+            for quantile in estimated
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# MAU2 Democracy Platform - Evidence Thumbnail Benchmark
+# Stores a batch of large phone-sized JPEGs as evidence, then compares what a
+# feed page of cards costs when each card resizes its original on the request
+# path against looking up derivatives made by the media worker. Also times
+# generating all derivatives in-process versus on the worker's process pool
+# (the pool only pulls ahead with more than one CPU).
+#
+# Usage: python benchmarks/bench_media.py [--photos 16 --workers 2 --megapixels 24]
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import media
+from evidence_store import EvidenceStore
+from platform_store import PlatformStore
+
+PAGE_SIZE = 4
+
+
+def photo(megapixels, seed):
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    image = Image.effect_noise((width, width * 3 // 4), 40 + seed).convert("RGB")
+    file = io.BytesIO()
+    image.save(file, "JPEG", quality=90)
+    file.seek(0)
+    file.name = f"photo_{seed}.jpg"
+    file.type = "image/jpeg"
+    return file
+
+
+def page_ms(pages, render):
+    timings = []
+    for page in pages:
+        started = time.perf_counter()
+        for record in page:
+            render(record)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"p50": round(statistics.median(timings), 3), "max": round(max(timings), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed card cost with inline resizing vs cached derivatives")
+    parser.add_argument("--photos", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--megapixels", type=float, default=24)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        evidence = EvidenceStore(store, root=os.path.join(data_dir, "blobs"))
+        records = [evidence.store_upload(photo(args.megapixels, seed)) for seed in range(args.photos)]
+        pages = [records[start:start + PAGE_SIZE] for start in range(0, len(records), PAGE_SIZE)]
+
+        def inline(record):
+            # What a card would do without the worker: decode the original and resize it per render
+            with Image.open(evidence.blob_path(record["sha256"])) as image:
+                image.thumbnail((media.THUMBNAIL_SIZE, media.THUMBNAIL_SIZE))
+                image.save(io.BytesIO(), "JPEG", quality=media.JPEG_QUALITY)
+
+        inline_ms = page_ms(pages, inline)
+
+        serial_root = os.path.join(data_dir, "serial")
+        started = time.perf_counter()
+        for record in records:
+            prefix = os.path.join(serial_root, record["sha256"])
+            os.makedirs(serial_root, exist_ok=True)
+            media.derive(evidence.blob_path(record["sha256"]), record["content_type"], prefix)
+        serial_seconds = time.perf_counter() - started
+
+        worker = media.MediaWorker(evidence, root=os.path.join(data_dir, "derived"), max_workers=args.workers)
+        # Includes starting the worker processes, which happens on the first request
+        started = time.perf_counter()
+        for record in records:
+            worker.request(record["sha256"], record["content_type"])
+        while worker.pending():
+            time.sleep(0.005)
+        pool_seconds = time.perf_counter() - started
+
+        cached_ms = page_ms(pages, lambda record: worker.thumbnail(record["sha256"], record["content_type"]))
+        fresh = media.MediaWorker(evidence, root=worker.root)
+        cold_ms = page_ms(pages, lambda record: fresh.thumbnail(record["sha256"], record["content_type"]))
+        thumbnails = [os.path.getsize(worker.thumbnail(record["sha256"], record["content_type"]))
+                      for record in records]
+        worker.shutdown()
+        store.close()
+
+    print(json.dumps({
+        "photos": args.photos,
+        "cpus": os.cpu_count(),
+        "original_kb": round(statistics.mean(record["size"] for record in records) / 1024),
+        "thumbnail_kb": round(statistics.mean(thumbnails) / 1024, 1),
+        "feed_page_ms": {
+            "inline_resize": inline_ms,
+            "cached_derivatives": cached_ms,
+            "cached_after_restart": cold_ms,
+        },
+        "generate_all_seconds": {
+            "in_process": round(serial_seconds, 2),
+            f"pool_{args.workers}_workers": round(pool_seconds, 2),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
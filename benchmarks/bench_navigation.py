@@ -0,0 +1,54 @@
+# MAU2 Democracy Platform - Per-Navigation Latency
+# Clicks through the navigation bar headlessly and reports, per page, the latency
+# recorded by the app's own navigation timing (button click -> page fragment
+# rendered) next to the wall time of a full script rerun. AppTest always
+# re-executes the whole script, so its wall time is the pre-fragment cost.
+#
+# Usage: python benchmarks/bench_navigation.py [--rounds 10]
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "democracy_app_streamlit.py")
+NAV_KEYS = ["nav_dashboard", "nav_analytics", "nav_settings", "nav_petitions", "nav_reports", "nav_home"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-navigation latency")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    os.environ.setdefault("MAU2_DATA_DIR", tempfile.mkdtemp(prefix="mau2-bench-"))
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.session_state["current_page"] = "dashboard"
+    app.run()
+
+    fragment_ms, full_rerun_ms = {}, {}
+    for _ in range(args.rounds):
+        for key in NAV_KEYS:
+            started = time.perf_counter()
+            app.button(key=key).click().run()
+            elapsed = (time.perf_counter() - started) * 1000
+            page, page_ms = app.session_state["nav_timings"][-1]
+            fragment_ms.setdefault(page, []).append(page_ms)
+            full_rerun_ms.setdefault(page, []).append(elapsed)
+
+    results = {
+        page: {
+            "fragment_median_ms": round(statistics.median(fragment_ms[page]), 2),
+            "full_rerun_median_ms": round(statistics.median(full_rerun_ms[page]), 2),
+        }
+        for page in fragment_ms
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# MAU2 Democracy Platform - Notification Fan-Out Load Test
+# A burst of upvotes on many petitions plus status changes fanned out to their
+# followers; reports how many inbox rows coalescing saved, how long publishers
+# were blocked, and checks that no inbox grew past INBOX_SIZE.
+#
+# Usage: python benchmarks/bench_notifications.py [--petitions 200 --followers 50 --votes 20000]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notifications import INBOX_SIZE, NotificationHub
+from platform_store import PlatformStore
+from votes import VoteCounter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notification fan-out and coalescing")
+    parser.add_argument("--petitions", type=int, default=200)
+    parser.add_argument("--followers", type=int, default=50, help="subscribers per petition")
+    parser.add_argument("--votes", type=int, default=20000)
+    parser.add_argument("--status-changes", type=int, default=400)
+    parser.add_argument("--coalesce", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        hub = NotificationHub(store, coalesce_seconds=args.coalesce).start()
+        counter = VoteCounter(store, flush_interval=0.1, on_flush=hub.votes_received).start()
+        petitions = [
+            store.add_petition(f"Petition {i}", "Fan-out target.", "Transportation", f"author_{i % 20}")["id"]
+            for i in range(args.petitions)
+        ]
+        for petition_id in petitions:
+            for follower in random.sample(range(args.followers * 4), args.followers):
+                hub.subscribe(f"citizen_{follower}", "petition", petition_id)
+
+        started = time.perf_counter()
+        for i in range(args.votes):
+            counter.upvote(random.choice(petitions), f"voter_{i}")
+        publish_started = time.perf_counter()
+        for _ in range(args.status_changes):
+            hub.publish("petition", random.choice(petitions), "status", detail="under_review")
+        publish_seconds = time.perf_counter() - publish_started
+        counter.stop()
+        hub.stop()
+        elapsed = time.perf_counter() - started
+
+        with store.connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+            largest = conn.execute(
+                "SELECT COALESCE(MAX(n), 0) FROM (SELECT COUNT(*) AS n FROM notifications GROUP BY user_name)"
+            ).fetchone()[0]
+        store.close()
+
+    uncoalesced = args.votes + args.status_changes * args.followers
+    print(json.dumps({
+        "petitions": args.petitions,
+        "followers_per_petition": args.followers,
+        "events": args.votes + args.status_changes,
+        "deliveries_without_coalescing": uncoalesced,
+        "inbox_rows_written": hub.delivered,
+        "inbox_rows_kept": rows,
+        "largest_inbox": largest,
+        "inboxes_bounded": largest <= INBOX_SIZE,
+        "publish_us_per_event": round(publish_seconds / max(args.status_changes, 1) * 1e6, 1),
+        "total_seconds": round(elapsed, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# MAU2 Democracy Platform - Page Import Cost
+# For each registered page, measures in a fresh interpreter the cold-start import
+# time of its module (after the shell the main script always loads) and the
+# per-rerun cost of resolving it through the page registry once cached.
+#
+# Usage: python benchmarks/bench_page_imports.py
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import streamlit, components, html_fragments, resources, submissions, views
+shell_modules = set(sys.modules)
+started = time.perf_counter()
+views.load_page({page!r})
+cold_ms = (time.perf_counter() - started) * 1000
+started = time.perf_counter()
+for _ in range(1000):
+    views.load_page({page!r})
+warm_us = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "cold_import_ms": round(cold_ms, 2),
+    "per_rerun_us": round(warm_us, 3),
+    "new_modules": len(set(sys.modules) - shell_modules),
+    "loads_pandas": "pandas" in sys.modules,
+}}))
+"""
+
+
+def main():
+    sys.path.insert(0, ROOT)
+    from views import PAGES
+
+    results = {}
+    for page in PAGES:
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=ROOT, page=page)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        results[page] = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
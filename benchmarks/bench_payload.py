@@ -0,0 +1,51 @@
+# MAU2 Democracy Platform - Bytes Sent per Rerun
+# Renders every page headlessly and measures the serialized element payload
+# that a single script rerun pushes over the websocket.
+#
+# Usage: python benchmarks/bench_payload.py [--reruns 3]
+
+import argparse
+import json
+import os
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "democracy_app_streamlit.py")
+PAGES = ["landing", "onboarding", "dashboard", "create_petition", "petition_evidence", "analytics", "settings"]
+
+
+def element_bytes(node):
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if proto is not None and hasattr(proto, "ByteSize") else 0
+    for child in getattr(node, "children", {}).values():
+        total += element_bytes(child)
+    return total
+
+
+def measure(page, reruns):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.session_state["current_page"] = page
+    sizes = []
+    for _ in range(reruns):
+        app.run()
+        sizes.append(element_bytes(app._tree))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes sent per rerun")
+    parser.add_argument("--reruns", type=int, default=3)
+    args = parser.parse_args()
+    os.environ.setdefault("MAU2_DATA_DIR", tempfile.mkdtemp(prefix="mau2-bench-"))
+    results = {}
+    for page in PAGES:
+        sizes = measure(page, args.reruns)
+        results[page] = {"first_rerun_bytes": sizes[0], "later_rerun_bytes": sizes[-1]}
+    results["total_later_rerun_bytes"] = sum(page["later_rerun_bytes"] for page in results.values())
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
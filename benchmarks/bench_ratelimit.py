@@ -0,0 +1,118 @@
+# MAU2 Democracy Platform - Spam Burst Benchmark
+# A handful of spammers (sharing two IPs) hammer the submission queue while
+# ordinary citizens submit one petition with evidence per second. The run is
+# done twice, without and with the admission controller, and reports what the
+# ordinary citizens saw: how many submissions got through and how long each
+# took from submit to stored (queue wait included), plus the peak queue depth.
+#
+# Usage: python benchmarks/bench_ratelimit.py [--spammers 8 --citizens 20 --seconds 5]
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evidence_store import EvidenceStore
+from platform_store import PlatformStore
+from ratelimit import AdmissionController, SubmissionRejected
+from submissions import SubmissionQueue
+
+EVIDENCE = os.urandom(256 * 1024)
+
+
+def upload(name):
+    # BytesIO shares the payload buffer until written to, so queued uploads cost no extra memory
+    file = io.BytesIO(EVIDENCE)
+    file.name = name
+    return file
+
+
+def run(args, protected):
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        queue = SubmissionQueue(store, evidence_store=EvidenceStore(store, root=os.path.join(data_dir, "blobs")),
+                                max_workers=args.workers)
+        admission = AdmissionController(queue.depth, max_depth=args.max_depth) if protected else None
+        tickets = {"citizen": [], "spam": []}
+        attempts = {"citizen": 0, "spam": 0}
+        peak_depth = [0]
+        lock = threading.Lock()
+        deadline = time.monotonic() + args.seconds
+
+        def submit(role, citizen, ip, interval):
+            number = 0
+            while time.monotonic() < deadline:
+                number += 1
+                with lock:
+                    attempts[role] += 1
+                try:
+                    if admission is not None:
+                        admission.admit(citizen, ip)
+                    ticket_id = queue.submit({"title": f"{role} petition {citizen} {number}", "category": "Other",
+                                              "description": "Submitted during the burst."},
+                                             [upload("photo.jpg")], creator=citizen)
+                    with lock:
+                        tickets[role].append(ticket_id)
+                        peak_depth[0] = max(peak_depth[0], queue.depth())
+                except SubmissionRejected:
+                    pass
+                time.sleep(interval)
+
+        threads = [threading.Thread(target=submit, args=("spam", f"spammer_{n}", f"10.0.0.{n % 2}", 0.01))
+                   for n in range(args.spammers)]
+        threads += [threading.Thread(target=submit, args=("citizen", f"citizen_{n}", f"192.168.1.{n}", 1.0))
+                    for n in range(args.citizens)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        queue.shutdown(wait=True)
+        drained = time.perf_counter() - started
+
+        latencies = sorted(status["finished_at"] - status["created_at"]
+                           for status in map(queue.status, tickets["citizen"]))
+        result = {
+            "citizen_attempts": attempts["citizen"],
+            "citizen_accepted": len(tickets["citizen"]),
+            "citizen_latency_ms": {
+                "p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+                "p99": round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 1)
+                if latencies else None,
+            },
+            "spam_attempts": attempts["spam"],
+            "spam_accepted": len(tickets["spam"]),
+            "peak_queue_depth": peak_depth[0],
+            "seconds_to_drain": round(drained, 2),
+        }
+        if admission is not None:
+            result["rejected"] = admission.stats()["rejected"]
+        store.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submission spam burst with and without admission control")
+    parser.add_argument("--spammers", type=int, default=8)
+    parser.add_argument("--citizens", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-depth", type=int, default=32)
+    args = parser.parse_args()
+    print(json.dumps({
+        "spammers": args.spammers,
+        "citizens": args.citizens,
+        "seconds": args.seconds,
+        "unprotected": run(args, protected=False),
+        "protected": run(args, protected=True),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# MAU2 Democracy Platform - Oversight Review Queue Benchmark
+# Fills the Police queue with 1k / 10k / 100k reports and times leasing the
+# next report (own assignment and stolen) plus acking it, with the SQLite query
+# plans that show both lookups are index seeks. Then a team of reviewers drains
+# a queue concurrently, checking that no report is handed to two reviewers at
+# once, and one abandoned lease is checked to come back after it expires.
+#
+# Usage: python benchmarks/bench_review_queue.py [--sizes 1000,10000,100000 --reviewers 8]
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import review_queue
+from platform_store import PlatformStore
+
+DESCRIPTIONS = [
+    "Officer stopped traffic and was rude to drivers at the crossing.",
+    "Someone was injured in an assault outside the station, police were slow to arrive.",
+    "Speeding cars on the school road every morning.",
+]
+
+
+def seed(store, reports):
+    now = time.time()
+    store.import_records("report", [{
+        "report_type": "Police Misconduct", "description": random.choice(DESCRIPTIONS), "category": "Public Safety",
+        "status": "submitted", "location": "", "reporter": "bench", "anonymous": 0,
+        "created_at": now - random.uniform(0, 86400), "first_response_at": None, "coordinates": None,
+    } for _ in range(reports)])
+
+
+def time_leases(store, reviewer, rounds):
+    """Median/p99 ms to lease the next report and ack it, one transaction each."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        with store.transaction() as conn:
+            leased = review_queue.lease(conn, "Police", reviewer)
+            review_queue.ack(conn, leased["report_id"], reviewer)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {"p50": round(statistics.median(timings), 3), "p99": round(timings[int(0.99 * len(timings))], 3)}
+
+
+def query_plans(store):
+    with store.connection() as conn:
+        plan = lambda sql, params: [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        return {
+            "own": plan("SELECT * FROM review_queue WHERE body = ? AND assignee = ? AND available_at <= ? "
+                        "ORDER BY priority DESC, seq LIMIT 1", ("Police", "alice", time.time())),
+            "steal": plan("SELECT * FROM review_queue WHERE body = ? AND available_at <= ? "
+                          "ORDER BY priority DESC, seq LIMIT 1", ("Police", time.time())),
+        }
+
+
+def backlog_run(size, rounds, plans=False):
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        store.join_review_team("Police", "alice")
+        seed(store, size)
+        # Nobody else joined, so every report is alice's; bob only ever steals
+        store.join_review_team("Police", "bob")
+        result = {
+            "backlog": store.review_backlog()["Police"]["queued"],
+            "own_lease_ack_ms": time_leases(store, "alice", rounds),
+            "stolen_lease_ack_ms": time_leases(store, "bob", rounds),
+        }
+        if plans:
+            result["query_plans"] = query_plans(store)
+        store.close()
+    return result
+
+
+def team_run(reports, reviewers):
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        names = [f"reviewer_{n}" for n in range(reviewers)]
+        for name in names:
+            store.join_review_team("Police", name)
+        seed(store, reports)
+        handled = {name: [] for name in names}
+        stolen = [0]
+        lock = threading.Lock()
+
+        def work(name):
+            # Uneven reviewers: the fast ones run out of their own work and steal from the slow ones
+            pause = 0.002 if name.endswith(("0", "1")) else 0.0
+            while True:
+                report = store.next_review("Police", name)
+                if report is None:
+                    return
+                time.sleep(pause)
+                store.complete_review(report["id"], name, "in_progress")
+                handled[name].append(report["id"])
+                if report["lease"]["stolen"]:
+                    with lock:
+                        stolen[0] += 1
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in names]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        ids = [report_id for done in handled.values() for report_id in done]
+
+        # One abandoned lease: it must be handed out again once it expires, and the old ack must fail
+        seed(store, 1)
+        first = store.next_review("Police", names[0], lease_seconds=0.05)
+        hidden = store.next_review("Police", names[1]) is None
+        time.sleep(0.1)
+        again = store.next_review("Police", names[1])
+        redelivery = {
+            "hidden_while_leased": hidden,
+            "redelivered": again is not None and again["id"] == first["id"] and again["lease"]["attempts"] == 2,
+            "expired_ack_rejected": not store.complete_review(first["id"], names[0]),
+        }
+        store.close()
+    return {
+        "reports": reports,
+        "reviewers": reviewers,
+        "reviews_per_second": round(len(ids) / elapsed),
+        "handled_once": len(ids) == len(set(ids)) == reports,
+        "stolen": stolen[0],
+        "per_reviewer": sorted(len(done) for done in handled.values()),
+        "redelivery": redelivery,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Review queue lease latency and concurrent reviewers")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--reviewers", type=int, default=8)
+    args = parser.parse_args()
+    print(json.dumps({
+        "lease_latency": [backlog_run(size, args.rounds, plans=size == max(args.sizes)) for size in args.sizes],
+        "team": team_run(args.reports, args.reviewers),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
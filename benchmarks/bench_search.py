@@ -0,0 +1,97 @@
+# MAU2 Democracy Platform - Full-Text Search Latency
+# Bulk-loads N petitions into the store and its search index, then times
+# BM25-ranked searches with and without facet filters.
+#
+# Usage: python benchmarks/bench_search.py [--size 1000000]  (1M takes a couple of minutes to index)
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search
+from platform_store import PlatformStore
+
+CATEGORIES = ["Transportation", "Environment", "Infrastructure", "Public Safety", "Education", "Healthcare"]
+STATUSES = ["active", "under_review", "closed"]
+PLACES = ["Main Street", "Oak Avenue", "Harbor Road", "Mission District", "Port Louis", "Curepipe", "Downtown"]
+WORDS = ("pothole streetlight bus route park tree school clinic library noise flooding sidewalk bridge "
+         "crosswalk recycling market housing youth playground traffic safety garden transit water "
+         "council budget repair broken dangerous children elderly night weekend").split()
+# Rarer vocabulary so some queries match only a handful of records
+RARE = [f"landmark{i}" for i in range(5000)]
+
+QUERIES = [
+    {"query": "pothole"},
+    {"query": "broken streetlight"},
+    {"query": "pothole", "category": "Infrastructure", "status": "active"},
+    {"query": "bus route", "location": "Main Street"},
+    {"query": "landmark42"},
+    {"query": "play"},
+    {"query": "", "category": "Education", "location": "Curepipe"},
+]
+
+
+def seed(store, count, rng, batch=20000):
+    now = time.time()
+    for start in range(0, count, batch):
+        petitions = []
+        for i in range(start, min(count, start + batch)):
+            words = rng.choices(WORDS, k=3) + ([rng.choice(RARE)] if rng.random() < 0.2 else [])
+            petitions.append({
+                "id": f"petition_bench_{i:08d}",
+                "title": " ".join(words).capitalize(),
+                "description": " ".join(rng.choices(WORDS, k=25)),
+                "category": rng.choice(CATEGORIES),
+                "status": rng.choice(STATUSES),
+                "location": rng.choice(PLACES),
+                "created_at": now - i,
+            })
+        with store.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO petitions (id, title, description, category, status, creator, location, votes, "
+                "created_at) VALUES (:id, :title, :description, :category, :status, 'bench', :location, 0, "
+                ":created_at)",
+                petitions,
+            )
+            for petition in petitions:
+                search.index(conn, "petition", petition)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search latency")
+    parser.add_argument("--size", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(args.size)
+    results = {"records": args.size}
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        started = time.perf_counter()
+        seed(store, args.size, rng)
+        results["index_seconds"] = round(time.perf_counter() - started, 1)
+        for spec in QUERIES:
+            latencies = []
+            for _ in range(args.repeats):
+                started = time.perf_counter()
+                items, *_ = store.search_petitions(limit=10, **spec)
+                latencies.append((time.perf_counter() - started) * 1000)
+            label = " | ".join(f"{key}={value}" for key, value in spec.items())
+            results[label] = {
+                "median_ms": round(statistics.median(latencies), 2),
+                "max_ms": round(max(latencies), 2),
+                "results": len(items),
+            }
+        store.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
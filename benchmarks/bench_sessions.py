@@ -0,0 +1,81 @@
+# MAU2 Democracy Platform - Memory per Session
+# Drives headless citizen sessions through the dashboard, search and petition
+# drafting, sizes each session's st.session_state, and extrapolates to
+# --citizens concurrent sessions. Also checks that a draft survives a
+# reconnect (fresh session, same URL) and that idle sessions are evicted.
+#
+# Usage: python benchmarks/bench_sessions.py [--sessions 20 --citizens 5000]
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "democracy_app_streamlit.py")
+sys.path.insert(0, ROOT)
+
+
+def citizen_session(index):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=30)
+    app.session_state["user_name"] = f"citizen_{index}"
+    app.session_state["current_page"] = "dashboard"
+    app.run()
+    app.button(key="nav_petitions").click().run()
+    app.text_input(key="search_petition_query").input("park").run()
+    app.session_state["current_page"] = "create_petition"
+    app.run()
+    app.text_input(key="petition_title").input(f"Fix the streetlights on block {index}").run()
+    app.text_area(key="petition_description").input("Half of them have been out for weeks. " * 10).run()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session state memory per citizen")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--citizens", type=int, default=5000, help="concurrent sessions to extrapolate to")
+    args = parser.parse_args()
+    os.environ.setdefault("MAU2_DATA_DIR", tempfile.mkdtemp(prefix="mau2-bench-"))
+
+    from streamlit.testing.v1 import AppTest
+
+    from sessions import SessionRegistry, deep_size
+
+    registry = SessionRegistry(idle_timeout=0.0)
+    sizes = []
+    draft_ids = []
+    for index in range(args.sessions):
+        app = citizen_session(index)
+        state = app.session_state.to_dict()
+        sizes.append(deep_size(state))
+        draft_ids.append(state.get("draft_id"))
+        # AppTest gives every session the same ID, so register them here under distinct ones
+        registry.touch(f"session_{index}", user_name=state.get("user_name"), page=state.get("current_page"),
+                       draft_id=state.get("draft_id"), state=state)
+    report = registry.memory_report()
+
+    # Reconnect: a brand-new session opened on the same URL resumes the last draft
+    reconnected = AppTest.from_file(APP, default_timeout=30)
+    reconnected.query_params["draft"] = draft_ids[-1]
+    reconnected.session_state["current_page"] = "create_petition"
+    reconnected.run()
+    resumed = reconnected.text_input(key="petition_title").value == f"Fix the streetlights on block {args.sessions - 1}"
+
+    median = statistics.median(sizes)
+    print(json.dumps({
+        "sessions": args.sessions,
+        "state_bytes_median": round(median),
+        "state_bytes_max": max(sizes),
+        "registry_bytes_per_session": round(report["registry_bytes"] / max(report["sessions"], 1)),
+        f"state_mib_at_{args.citizens}_citizens": round(median * args.citizens / 2 ** 20, 2),
+        "draft_resumed_after_reconnect": resumed,
+        "idle_sessions_evicted": registry.evict_idle(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# MAU2 Democracy Platform - Submission Throughput Benchmark
+# Simulates concurrent citizen sessions submitting petitions with evidence.
+#
+# Usage: python benchmarks/bench_submissions.py [--sessions 50] [--per-session 20]
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from platform_store import PlatformStore
+from submissions import DONE, SubmissionQueue
+
+# The old handler held the script thread for time.sleep(2) + time.sleep(1)
+BLOCKING_HANDLER_SECONDS = 3.0
+
+
+def run(sessions, per_session, workers):
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        queue = SubmissionQueue(store, max_workers=workers)
+        submit_latencies = []
+        tickets = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(sessions)
+
+        def citizen(session_no):
+            barrier.wait()
+            for i in range(per_session):
+                draft = {
+                    "title": f"Pothole report {session_no}-{i}",
+                    "category": "Infrastructure",
+                    "description": "Large pothole causing traffic hazards on Main Street.",
+                }
+                started = time.perf_counter()
+                ticket_id = queue.submit(draft, [], creator=f"citizen_{session_no}", location="Main Street")
+                elapsed = time.perf_counter() - started
+                with lock:
+                    submit_latencies.append(elapsed)
+                    tickets.append(ticket_id)
+
+        threads = [threading.Thread(target=citizen, args=(n,)) for n in range(sessions)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        accepted = time.perf_counter() - started
+        completed = sum(1 for ticket_id in tickets if queue.wait(ticket_id)["state"] == DONE)
+        total = time.perf_counter() - started
+        queue.shutdown()
+        store.close()
+
+    submit_latencies.sort()
+    count = len(submit_latencies)
+    return {
+        "sessions": sessions,
+        "submissions": count,
+        "completed": completed,
+        "submit_p50_ms": round(submit_latencies[count // 2] * 1000, 3),
+        "submit_p99_ms": round(submit_latencies[min(count - 1, int(count * 0.99))] * 1000, 3),
+        "accepted_per_sec": round(count / accepted, 1),
+        "completed_per_sec": round(completed / total, 1),
+        "blocking_handler_per_sec": round(sessions / BLOCKING_HANDLER_SECONDS, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submission throughput benchmark")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--per-session", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sessions, args.per_session, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
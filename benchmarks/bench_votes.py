@@ -0,0 +1,75 @@
+# MAU2 Democracy Platform - Viral Petition Upvote Load Test
+# Many threads hammer one petition with upvotes (including repeat clicks from the
+# same voters) while the batched flusher runs, then checks that the stored count
+# equals the number of distinct voters: no lost votes and no double counts.
+#
+# Usage: python benchmarks/bench_votes.py [--threads 32 --voters 20000 --repeats 3]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from platform_store import PlatformStore
+from votes import VoteCounter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upvote throughput and exactly-once counting")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--voters", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3, help="clicks per voter (duplicates must be dropped)")
+    parser.add_argument("--flush-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = PlatformStore(os.path.join(data_dir, "bench.db"))
+        petition = store.add_petition("Viral petition", "Load test target.", "Transportation", "bench")
+        counter = VoteCounter(store, flush_interval=args.flush_interval).start()
+
+        clicks = [f"voter_{i}" for i in range(args.voters)] * args.repeats
+        random.shuffle(clicks)
+        chunks = [clicks[i::args.threads] for i in range(args.threads)]
+        accepted = [0] * args.threads
+
+        def click(index):
+            for voter in chunks[index]:
+                accepted[index] += counter.upvote(petition["id"], voter)
+
+        threads = [threading.Thread(target=click, args=(i,)) for i in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        clicked = time.perf_counter() - started
+        counter.stop()
+        elapsed = time.perf_counter() - started
+
+        stored = store.get_petition(petition["id"])["votes"]
+        with store.connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM petition_votes WHERE petition_id = ?",
+                                (petition["id"],)).fetchone()[0]
+        store.close()
+
+    print(json.dumps({
+        "threads": args.threads,
+        "clicks": len(clicks),
+        "distinct_voters": args.voters,
+        "buffered": sum(accepted),
+        "stored_votes": stored,
+        "vote_rows": rows,
+        "exactly_once": stored == rows == args.voters,
+        "clicks_per_sec": round(len(clicks) / clicked),
+        "total_seconds": round(elapsed, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
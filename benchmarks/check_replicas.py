@@ -0,0 +1,143 @@
+# MAU2 Democracy Platform - Multi-Replica Consistency Check
+# Starts N replica processes on one shared store, each with its own change feed,
+# read cache, notification hub and draft store (as each app process has). Every
+# round one replica writes while the others hold warm caches, then all of them
+# read back: feed pages and analytics through the read cache must show the
+# write immediately, inboxes and drafts once the background poller has run.
+# Prints JSON and exits non-zero on any stale read.
+#
+# Usage: python benchmarks/check_replicas.py [--replicas 4 --rounds 20]
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# === REPLICA (runs in a worker process) ===
+def replica(db_path, commands, results):
+    sys.path.insert(0, ROOT)
+    from notifications import NotificationHub
+    from platform_store import PlatformStore
+    from replication import ANALYTICS, PETITIONS, ChangeFeed, ReadCache
+    from sessions import DraftStore
+
+    store = PlatformStore(db_path)
+    feed = ChangeFeed(store).start()
+    cache = ReadCache(feed)
+    hub = NotificationHub(store).start()
+    feed.listen(hub.invalidate)
+    drafts = DraftStore(store=store)
+    feed.listen(drafts.invalidate)
+
+    def first_page():
+        return cache.get(PETITIONS, ("feed", "recent", None), lambda: store.petition_feed("recent", None, 10))[0]
+
+    def opened():
+        snapshot = cache.get(ANALYTICS, ("snapshot",), store.analytics_snapshot)
+        return int(snapshot["counters"].get("petition_opened", 0))
+
+    while True:
+        command, *args = commands.get()
+        if command == "stop":
+            break
+        if command == "warm":
+            first_page()
+            opened()
+            hub.inbox("citizen")
+            drafts.get(args[0])
+            results.put(None)
+        elif command == "write":
+            round_no, draft_id = args
+            petition = store.add_petition(f"Replica petition {round_no}", "Written by one replica.",
+                                          "Transportation", "citizen")
+            store.add_notification("citizen", f"message {round_no}")
+            drafts.save(draft_id, f"Draft revision {round_no}", "Draft body")
+            results.put(petition["id"])
+        elif command == "read":
+            petition_id, round_no, draft_id = args
+            started = time.perf_counter()
+            in_feed = any(item["id"] == petition_id for item in first_page())
+            count = opened()
+            read_ms = (time.perf_counter() - started) * 1000
+            # Inboxes and drafts are invalidated by the poller; give it one interval
+            time.sleep(feed.poll_interval * 2)
+            inbox = hub.inbox("citizen")
+            draft = drafts.get(draft_id)
+            results.put({
+                "feed": in_feed,
+                "analytics": count == round_no + 1,
+                "inbox": bool(inbox) and inbox[0]["message"] == f"message {round_no}",
+                "draft": draft is not None and draft.title == f"Draft revision {round_no}",
+                "read_ms": read_ms,
+            })
+    hub.stop()
+    feed.stop()
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-after-write consistency across app replicas")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as data_dir:
+        db_path = os.path.join(data_dir, "shared.db")
+        sys.path.insert(0, ROOT)
+        from platform_store import PlatformStore
+        PlatformStore(db_path).close()
+
+        queues = [(context.Queue(), context.Queue()) for _ in range(args.replicas)]
+        workers = [context.Process(target=replica, args=(db_path, commands, results))
+                   for commands, results in queues]
+        for worker in workers:
+            worker.start()
+
+        draft_id = "draft_shared"
+        stale = {"feed": 0, "analytics": 0, "inbox": 0, "draft": 0}
+        read_ms = []
+        for round_no in range(args.rounds):
+            for commands, results in queues:
+                commands.put(("warm", draft_id))
+            for _, results in queues:
+                results.get()
+            writer = round_no % args.replicas
+            queues[writer][0].put(("write", round_no, draft_id))
+            petition_id = queues[writer][1].get()
+            for commands, _ in queues:
+                commands.put(("read", petition_id, round_no, draft_id))
+            for _, results in queues:
+                seen = results.get()
+                read_ms.append(seen.pop("read_ms"))
+                for check, ok in seen.items():
+                    stale[check] += not ok
+
+        for commands, _ in queues:
+            commands.put(("stop",))
+        for worker in workers:
+            worker.join()
+
+    read_ms.sort()
+    consistent = not any(stale.values())
+    print(json.dumps({
+        "replicas": args.replicas,
+        "rounds": args.rounds,
+        "reads": len(read_ms),
+        "stale_reads": stale,
+        "consistent": consistent,
+        "read_ms": {"p50": round(statistics.median(read_ms), 3),
+                    "p99": round(read_ms[min(len(read_ms) - 1, int(0.99 * len(read_ms)))], 3)},
+    }, indent=2))
+    sys.exit(0 if consistent else 1)
+
+
+if __name__ == "__main__":
+    main()
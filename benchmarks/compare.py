@@ -0,0 +1,78 @@
+# MAU2 Democracy Platform - Load Test Comparison
+# Compares two load_test.py artifacts (e.g. main vs. a branch) metric by metric
+# and exits non-zero when any metric regressed by more than --tolerance.
+#
+# Usage: python benchmarks/compare.py before.json after.json [--tolerance 0.10]
+
+import argparse
+import json
+import sys
+
+# metric path -> True when higher is better
+METRICS = {
+    ("rerun", "p50_ms"): False,
+    ("rerun", "p95_ms"): False,
+    ("rerun", "p99_ms"): False,
+    ("submissions_per_sec",): True,
+    ("session_state_bytes",): False,
+    ("process_max_rss_mib",): False,
+}
+
+
+def lookup(report, path):
+    for key in path:
+        if not isinstance(report, dict) or key not in report:
+            return None
+        report = report[key]
+    return report
+
+
+def compare(before, after, tolerance):
+    metrics = dict(METRICS)
+    for step in sorted(set(before.get("steps", {})) & set(after.get("steps", {}))):
+        metrics[("steps", step, "p95_ms")] = False
+
+    rows = {}
+    for path, higher_is_better in metrics.items():
+        old, new = lookup(before, path), lookup(after, path)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        rows[".".join(path)] = {
+            "before": old,
+            "after": new,
+            "change_pct": round(change * 100, 1),
+            "regressed": worse > tolerance,
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two load test artifacts")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    with open(args.before) as handle:
+        before = json.load(handle)
+    with open(args.after) as handle:
+        after = json.load(handle)
+    if (before.get("citizens"), before.get("rounds")) != (after.get("citizens"), after.get("rounds")):
+        print("warning: artifacts were recorded with different --citizens/--rounds", file=sys.stderr)
+
+    rows = compare(before, after, args.tolerance)
+    regressions = [metric for metric, row in rows.items() if row["regressed"]]
+    print(json.dumps({
+        "before": before.get("commit"),
+        "after": after.get("commit"),
+        "tolerance_pct": round(args.tolerance * 100, 1),
+        "metrics": rows,
+        "regressions": regressions,
+    }, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# MAU2 Democracy Platform - Concurrent Citizen Load Test
+# Runs N headless citizens at once, one process each (AppTest keeps process-wide
+# runtime state, so sessions cannot share a process), against one shared store.
+# Every citizen loops through the same journey: navigation bar -> dashboard ->
+# petition_form -> evidence submission -> petition search. Each rerun is timed,
+# and the results are written as a JSON artifact for benchmarks/compare.py.
+# Only submissions that were issued a ticket count towards submissions_per_sec;
+# ones turned away by the rate limits or the queue-depth check are reported apart.
+#
+# Usage: python benchmarks/load_test.py [--citizens 8 --rounds 5 --output load.json]
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "democracy_app_streamlit.py")
+NAV_KEYS = ["nav_dashboard", "nav_petitions", "nav_reports", "nav_analytics", "nav_settings"]
+
+
+# === CITIZEN JOURNEY (runs in a worker process) ===
+def _button(app, label):
+    return next(button for button in app.button if button.label == label)
+
+
+def citizen(index, rounds, data_dir, start_at):
+    os.environ["MAU2_DATA_DIR"] = data_dir
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    from sessions import deep_size
+
+    timings = {}
+
+    def timed(step, element):
+        started = time.perf_counter()
+        element.run()
+        timings.setdefault(step, []).append((time.perf_counter() - started) * 1000)
+        if app.exception:
+            raise RuntimeError(f"{step}: {app.exception[0].value}")
+
+    app = AppTest.from_file(APP, default_timeout=60)
+    app.session_state["user_name"] = f"citizen_{index}"
+    app.run()
+    # All citizens start together once their processes are warm
+    time.sleep(max(0.0, start_at - time.time()))
+
+    submissions = rejected = 0
+    started = time.perf_counter()
+    for round_no in range(rounds):
+        for key in NAV_KEYS:
+            timed("navigate", app.button(key=key).click())
+        timed("navigate", app.button(key="nav_dashboard").click())
+        timed("open_form", _button(app, "📋 Create Petition").click())
+        timed("type_title", app.text_input(key="petition_title").input(
+            f"Citizen {index} asks for safer crossings near school {round_no}"))
+        timed("type_description", app.text_area(key="petition_description").input(
+            "Cars speed through the crossing every morning while children walk to class."))
+        timed("submit_form", _button(app, "Next →").click())
+        # Turned away while the submission queue is backed up: the form stays open
+        if app.session_state["current_page"] == "petition_evidence":
+            timed("type_location", app.text_input[0].input("Main Street"))
+            timed("submit_evidence", app.button(key="submit_report").click())
+        # Only a submission that got a ticket moves on to the dashboard; a rate-limited one stays put
+        if app.session_state["current_page"] == "dashboard":
+            submissions += 1
+        else:
+            rejected += 1
+        timed("search", app.button(key="nav_petitions").click())
+        timed("search", app.text_input(key="search_petition_query").input("crossing school"))
+    # Wait for this citizen's queued submissions to be persisted
+    while app.session_state["pending_submissions"]:
+        time.sleep(0.05)
+        app.run()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "timings": timings,
+        "submissions": submissions,
+        "rejected": rejected,
+        "elapsed": elapsed,
+        "state_bytes": deep_size(app.session_state.to_dict()),
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+# === REPORT ===
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {"count": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+            "mean_ms": round(statistics.fmean(ordered), 2)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent citizen load test")
+    parser.add_argument("--citizens", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5, help="journeys per citizen")
+    parser.add_argument("--output", help="also write the JSON artifact to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="mau2-load-") as data_dir:
+        # Warm-up (imports, AppTest start) is excluded: everyone starts at the same wall-clock time
+        start_at = time.time() + 5.0 + args.citizens * 0.5
+        context = multiprocessing.get_context("spawn")
+        wall_started = time.time()
+        with context.Pool(args.citizens) as pool:
+            results = pool.starmap(citizen, [(i, args.rounds, data_dir, start_at) for i in range(args.citizens)])
+        wall = time.time() - max(start_at, wall_started)
+
+    steps = {}
+    for result in results:
+        for step, samples in result["timings"].items():
+            steps.setdefault(step, []).extend(samples)
+    every_rerun = [sample for samples in steps.values() for sample in samples]
+    submissions = sum(result["submissions"] for result in results)
+    rejected = sum(result["rejected"] for result in results)
+
+    report = {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "citizens": args.citizens,
+        "rounds": args.rounds,
+        "rerun": percentiles(every_rerun),
+        "steps": {step: percentiles(samples) for step, samples in sorted(steps.items())},
+        "submissions": submissions,
+        "submissions_rejected": rejected,
+        "submissions_per_sec": round(submissions / wall, 2),
+        "session_state_bytes": round(statistics.median(result["state_bytes"] for result in results)),
+        "process_max_rss_mib": round(statistics.median(result["max_rss_kib"] for result in results) / 1024, 1),
+        "wall_seconds": round(wall, 2),
+    }
+    artifact = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(artifact + "\n")
+    print(artifact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+# MAU2 Democracy Platform - Bulk Import/Export
+# Streams CSV, JSONL or Parquet files into the store in fixed-size chunks, one
+# transaction per chunk, validating each row on the way; memory stays flat no
+# matter how large the file is. Exports page through the store by ID and write
+# the same formats chunk by chunk, so an export can be imported again as-is.
+#
+# Usage: python bulk_io.py import petition complaints.csv [--chunk-size 5000]
+#        python bulk_io.py export report reports.parquet
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+
+from categorizer import PETITION_CATEGORIES, KeywordClassifier
+from lifecycle import LIFECYCLES
+
+CHUNK_SIZE = 5000
+MAX_ERRORS = 1000
+MAX_TEXT = 10000
+MAX_VOTES = 10 ** 10
+# Timestamps must be representable as a date (up to the end of year 9999)
+MAX_TIMESTAMP = datetime(9999, 12, 31, 23, 59, 59, tzinfo=timezone.utc).timestamp()
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".parquet": "parquet"}
+
+CATEGORIES = PETITION_CATEGORIES + ("Other",)
+STATUSES = LIFECYCLES
+# Columns written by exports; imports accept the same names
+EXPORT_COLUMNS = {
+    "petition": ("id", "title", "description", "category", "status", "creator", "location", "votes",
+                 "created_at", "first_response_at", "lat", "lon"),
+    "report": ("id", "report_type", "description", "category", "status", "reporter", "anonymous", "location",
+               "created_at", "first_response_at", "lat", "lon"),
+}
+
+
+class RowError(ValueError):
+    pass
+
+
+# === READERS ===
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    fmt = FORMATS.get(os.path.splitext(name)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot tell the format of {path}; pass one of: csv, jsonl, parquet")
+    return fmt
+
+
+def _open_text(path, mode="r"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet files need pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def _json_lines(handle):
+    for number, line in enumerate(handle, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            # Passed on in place of the row, so validate() rejects just this line
+            yield RowError(f"line {number} is not valid JSON: {exc}")
+
+
+def read_chunks(path, fmt=None, chunk_size=CHUNK_SIZE):
+    """Yield lists of up to ``chunk_size`` raw rows; only one chunk is in memory at a time.
+
+    Rows are dicts as read; a malformed JSONL line comes through as a RowError.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "parquet":
+        _, parquet = _parquet()
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+    with _open_text(path) as handle:
+        if fmt == "csv":
+            rows = csv.DictReader(handle)
+        elif fmt == "jsonl":
+            rows = _json_lines(handle)
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+        yield from _chunks(rows, chunk_size)
+
+
+# === VALIDATION ===
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or \
+        (isinstance(value, float) and math.isnan(value))
+
+
+def _text(row, field, required=False, default=""):
+    value = row.get(field)
+    if _blank(value):
+        if required:
+            raise RowError(f"{field} is required")
+        return default
+    value = str(value).strip()
+    if len(value) > MAX_TEXT:
+        raise RowError(f"{field} is longer than {MAX_TEXT} characters")
+    return value
+
+
+def _number(value, field):
+    try:
+        number = float(value)
+    except (TypeError, ValueError, OverflowError):
+        raise RowError(f"{field} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise RowError(f"{field} must be a finite number, got {value!r}")
+    return number
+
+
+def _timestamp(row, field, default=None):
+    value = row.get(field)
+    if _blank(value):
+        return default
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = float(value)
+        except (TypeError, ValueError, OverflowError):
+            try:
+                parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+            except ValueError:
+                raise RowError(f"{field} must be a Unix timestamp or ISO 8601 date, got {value!r}") from None
+    if isinstance(parsed, datetime):
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        parsed = parsed.timestamp()
+    # Also rejects nan and inf
+    if not 0 <= parsed <= MAX_TIMESTAMP:
+        raise RowError(f"{field} is out of range: {value!r}")
+    return parsed
+
+
+def _coordinates(row):
+    lat, lon = row.get("lat"), row.get("lon")
+    if _blank(lat) and _blank(lon):
+        return None
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError, OverflowError):
+        raise RowError("lat and lon must both be numbers") from None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise RowError(f"coordinates out of range: {lat}, {lon}")
+    return lat, lon
+
+
+def _choice(value, choices, field):
+    by_name = {choice.lower(): choice for choice in choices}
+    choice = by_name.get(value.lower())
+    if choice is None:
+        raise RowError(f"{field} {value!r} is not one of: {', '.join(choices)}")
+    return choice
+
+
+def validate(kind, row, classifier):
+    """Normalize one raw row into a store record, or raise RowError."""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError(f"row must be an object, got {type(row).__name__}")
+    record_id = _text(row, "id")
+    title_field = "title" if kind == "petition" else "report_type"
+    title = _text(row, title_field, required=True)
+    description = _text(row, "description", required=kind == "petition")
+    category = _text(row, "category")
+    # Logs without a category are filed with the offline keyword classifier
+    category = _choice(category, CATEGORIES, "category") if category else \
+        classifier.classify(f"{title}\n{description}", PETITION_CATEGORIES)
+    status = _choice(_text(row, "status", default=STATUSES[kind][0]), STATUSES[kind], "status")
+    created_at = _timestamp(row, "created_at", default=time.time())
+    record = {
+        title_field: title,
+        "description": description,
+        "category": category,
+        "status": status,
+        "location": _text(row, "location"),
+        "created_at": created_at,
+        "first_response_at": _timestamp(row, "first_response_at"),
+        "coordinates": _coordinates(row),
+    }
+    if record_id:
+        record["id"] = record_id
+    if kind == "petition":
+        record["creator"] = _text(row, "creator", default="Anonymous")
+        record["votes"] = int(_number(row.get("votes") or 0, "votes"))
+        if not 0 <= record["votes"] <= MAX_VOTES:
+            raise RowError(f"votes must be between 0 and {MAX_VOTES:,}")
+    else:
+        anonymous = str(row.get("anonymous") or "").strip().lower() in ("1", "true", "yes", "y")
+        record["anonymous"] = int(anonymous)
+        record["reporter"] = "Anonymous" if anonymous else _text(row, "reporter", default="Anonymous")
+    return record
+
+
+# === IMPORT ===
+def import_file(store, kind, path, fmt=None, chunk_size=CHUNK_SIZE, max_errors=MAX_ERRORS, on_chunk=None):
+    """Stream ``path`` into the store; returns a summary dict.
+
+    Invalid rows are skipped and reported (row numbers are 1-based data rows);
+    the import stops once more than ``max_errors`` rows were rejected.
+    ``on_chunk(summary)`` is called after each committed chunk.
+    """
+    if kind not in STATUSES:
+        raise ValueError(f"Unknown record kind: {kind}")
+    classifier = KeywordClassifier()
+    summary = {"kind": kind, "read": 0, "inserted": 0, "already_present": 0, "invalid": 0, "errors": []}
+    started = time.perf_counter()
+    for chunk in read_chunks(path, fmt, chunk_size):
+        records = []
+        for row in chunk:
+            summary["read"] += 1
+            try:
+                records.append(validate(kind, row, classifier))
+            except RowError as exc:
+                summary["invalid"] += 1
+                if len(summary["errors"]) < 20:
+                    summary["errors"].append({"row": summary["read"], "error": str(exc)})
+        if records:
+            inserted, skipped = store.import_records(kind, records)
+            summary["inserted"] += inserted
+            summary["already_present"] += skipped
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        summary["rows_per_sec"] = round(summary["read"] / max(summary["seconds"], 1e-9))
+        if on_chunk is not None:
+            on_chunk(summary)
+        if summary["invalid"] > max_errors:
+            summary["aborted"] = f"more than {max_errors} invalid rows"
+            break
+    summary.setdefault("seconds", 0.0)
+    summary.setdefault("rows_per_sec", 0)
+    return summary
+
+
+# === EXPORT ===
+def iter_export(store, kind, chunk_size=CHUNK_SIZE):
+    columns = EXPORT_COLUMNS[kind]
+    after_id = None
+    while True:
+        rows = store.export_rows(kind, columns, after_id, chunk_size)
+        if not rows:
+            return
+        yield [dict(row) for row in rows]
+        after_id = rows[-1]["id"]
+
+
+def export_file(store, kind, path, fmt=None, chunk_size=CHUNK_SIZE):
+    """Write every petition/report to ``path`` chunk by chunk; returns the number of rows written."""
+    fmt = fmt or detect_format(path)
+    columns = EXPORT_COLUMNS[kind]
+    written = 0
+    if fmt == "parquet":
+        pyarrow, parquet = _parquet()
+        schema = _parquet_schema(pyarrow, kind)
+        with parquet.ParquetWriter(path, schema) as writer:
+            for chunk in iter_export(store, kind, chunk_size):
+                writer.write_table(pyarrow.Table.from_pylist(chunk, schema=schema))
+                written += len(chunk)
+        return written
+    with _open_text(path, "w") as handle:
+        if fmt == "csv":
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+        for chunk in iter_export(store, kind, chunk_size):
+            if fmt == "csv":
+                writer.writerows(chunk)
+            else:
+                buffer = io.StringIO()
+                for row in chunk:
+                    buffer.write(json.dumps(row, ensure_ascii=False))
+                    buffer.write("\n")
+                handle.write(buffer.getvalue())
+            written += len(chunk)
+    return written
+
+
+def _parquet_schema(pyarrow, kind):
+    numeric = {"votes": pyarrow.int64(), "anonymous": pyarrow.int64(), "created_at": pyarrow.float64(),
+               "first_response_at": pyarrow.float64(), "lat": pyarrow.float64(), "lon": pyarrow.float64()}
+    return pyarrow.schema([(column, numeric.get(column, pyarrow.string())) for column in EXPORT_COLUMNS[kind]])
+
+
+# === COMMAND LINE ===
+def main():
+    from platform_store import PlatformStore
+
+    parser = argparse.ArgumentParser(description="Bulk import/export of petitions and reports")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("kind", choices=("petition", "report"))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "jsonl", "parquet"))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--max-errors", type=int, default=MAX_ERRORS)
+    parser.add_argument("--db", help="SQLite store path (defaults to MAU2_DB_PATH / mau2_data/platform.db)")
+    args = parser.parse_args()
+
+    store = PlatformStore(args.db) if args.db else PlatformStore()
+    try:
+        if args.action == "import":
+            result = import_file(store, args.kind, args.path, args.format, args.chunk_size, args.max_errors)
+        else:
+            started = time.perf_counter()
+            rows = export_file(store, args.kind, args.path, args.format, args.chunk_size)
+            result = {"kind": args.kind, "written": rows, "seconds": round(time.perf_counter() - started, 3)}
+    finally:
+        store.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# MAU2 Democracy Platform - Batched, Cached Categorization & Routing
+# Pending texts are grouped into one model call per batch, results are cached by
+# normalized-text hash (LRU + TTL), and a local keyword/TF-IDF classifier answers
+# whenever no model is configured or the model call fails.
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger("mau2")
+
+PETITION_CATEGORIES = ("Transportation", "Environment", "Infrastructure", "Public Safety", "Education", "Healthcare")
+DEPARTMENTS = ("Police", "Legal", "NGO")
+
+KIND_LABELS = {
+    "petition": PETITION_CATEGORIES,
+    "report": PETITION_CATEGORIES,
+    "route": DEPARTMENTS,
+}
+
+# Seed vocabulary for the offline classifier; a term's weight falls with the number of labels using it
+KEYWORDS = {
+    "Transportation": "bus buses train transit traffic road roads bike bicycle lane parking commute subway "
+                      "tram rail station crossing pedestrian speed car cars highway route",
+    "Environment": "park parks tree trees pollution air water river green recycling waste litter climate "
+                   "noise beach wildlife garden emissions trash plastic clean",
+    "Infrastructure": "pothole potholes streetlight streetlights sidewalk bridge pipe sewer drainage flooding "
+                      "water road repair construction lighting broken building power outage",
+    "Public Safety": "crime police safety theft violence assault robbery vandalism emergency fire dangerous "
+                     "unsafe harassment drugs gang security patrol",
+    "Education": "school schools teacher teachers student students class classes library education "
+                 "university college tuition books learning playground",
+    "Healthcare": "hospital clinic doctor doctors nurse health medical medicine ambulance care mental "
+                  "vaccine pharmacy disease patients",
+    "Police": "crime theft assault robbery violence stolen burglary attack threat gang drugs emergency "
+              "harassment vandalism break-in",
+    "Legal": "rights lawyer court lease landlord eviction contract discrimination legal law tenant "
+             "compensation unfair dismissal lawsuit",
+    "NGO": "community support shelter homeless food poverty volunteer charity environment animals "
+           "welfare youth elderly",
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)?")
+
+
+def normalize(text):
+    return " ".join(_TOKEN.findall((text or "").lower()))
+
+
+def cache_key(kind, text):
+    return hashlib.sha256(f"{kind}\x00{normalize(text)}".encode()).hexdigest()
+
+
+# === LRU + TTL CACHE ===
+class TTLCache:
+    def __init__(self, maxsize=4096, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+# === OFFLINE CLASSIFIER ===
+class KeywordClassifier:
+    """TF-IDF scoring of a text against each label's seed vocabulary."""
+
+    def __init__(self, keywords=KEYWORDS):
+        self.vocab = {label: set(words.split()) for label, words in keywords.items()}
+        document_frequency = Counter(term for terms in self.vocab.values() for term in terms)
+        total = len(self.vocab)
+        self.idf = {term: math.log(1 + total / count) for term, count in document_frequency.items()}
+
+    def scores(self, text, labels):
+        counts = Counter(normalize(text).split())
+        return {
+            label: sum(count * self.idf[term] for term, count in counts.items() if term in self.vocab.get(label, ()))
+            for label in labels
+        }
+
+    def classify(self, text, labels):
+        scores = self.scores(text, labels)
+        best = max(labels, key=lambda label: scores[label])
+        # Nothing matched: keep the first label as a deterministic default
+        return best if scores[best] > 0 else labels[0]
+
+
+# === OPTIONAL MODEL ===
+def load_default_model():
+    """A byLLM-backed batch model when MAU2_LLM_MODEL is set and byllm is installed, else None."""
+    model_name = os.environ.get("MAU2_LLM_MODEL")
+    if not model_name:
+        return None
+    try:
+        from byllm.lib import Model, by
+    except ImportError:
+        logger.warning("MAU2_LLM_MODEL is set but byllm is not installed; using the keyword classifier")
+        return None
+
+    llm = Model(model_name=model_name)
+
+    @by(llm)
+    def classify_batch(texts: list[str], labels: list[str], task: str) -> list[str]:
+        """For each text, pick the single best label from ``labels`` for the given task."""
+
+    def model(kind, texts, labels):
+        task = "route a citizen report to the department that should handle it" if kind == "route" \
+            else f"categorize a civic {kind}"
+        return classify_batch(texts, list(labels), task)
+
+    return model
+
+
+# === BATCHING SERVICE ===
+class CategorizationService:
+    """Queues categorize/route requests and answers them in batches on one background thread.
+
+    ``model(kind, texts, labels)`` must return one label per text; it is called
+    once per kind per batch. Without a model every request is answered by the
+    keyword classifier.
+    """
+
+    def __init__(self, model=None, batch_size=32, max_wait=0.05, cache_size=4096, ttl=3600.0):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.cache = TTLCache(cache_size, ttl)
+        self.fallback = KeywordClassifier()
+        self.model_calls = 0
+        self.fallbacks = 0
+        self._pending = []
+        self._inflight = {}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="mau2-categorizer", daemon=True)
+        self._thread.start()
+
+    def submit(self, text, kind="petition"):
+        """Future resolving to the label for ``text``; cached answers resolve immediately."""
+        if kind not in KIND_LABELS:
+            raise ValueError(f"Unknown categorization kind: {kind}")
+        key = cache_key(kind, text)
+        cached = self.cache.get(key)
+        future = Future()
+        if cached is not None:
+            future.set_result(cached)
+            return future
+        with self._cond:
+            # Identical texts already waiting share one slot in the next batch
+            if key in self._inflight:
+                return self._inflight[key]
+            self._inflight[key] = future
+            self._pending.append((kind, key, text))
+            self._cond.notify()
+        return future
+
+    def categorize(self, text, kind="petition", timeout=5.0):
+        try:
+            return self.submit(text, kind).result(timeout)
+        except Exception:
+            return self.fallback.classify(text, KIND_LABELS[kind])
+
+    def route_to_department(self, text, timeout=5.0):
+        return self.categorize(text, "route", timeout)
+
+    def classify_report(self, report_type, description, timeout=5.0):
+        """(category, department) for a new report; both requests go into the same batch."""
+        text = f"{report_type}\n{description}"
+        category, department = self.submit(text, "report"), self.submit(text, "route")
+        labels = []
+        for future, kind in ((category, "report"), (department, "route")):
+            try:
+                labels.append(future.result(timeout))
+            except Exception:
+                labels.append(self.fallback.classify(text, KIND_LABELS[kind]))
+        return tuple(labels)
+
+    def stats(self):
+        return {
+            "model_calls": self.model_calls,
+            "fallbacks": self.fallbacks,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cached": len(self.cache),
+        }
+
+    def shutdown(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join()
+
+    # --- Batcher ---
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._stop:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Give concurrent submitters a moment to fill the batch
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.batch_size and not self._stop:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            by_kind = {}
+            for kind, key, text in batch:
+                by_kind.setdefault(kind, []).append((key, text))
+            for kind, items in by_kind.items():
+                labels = KIND_LABELS[kind]
+                results = self._classify(kind, [text for _, text in items], labels)
+                for (key, _), label in zip(items, results):
+                    self.cache.put(key, label)
+                    with self._cond:
+                        future = self._inflight.pop(key, None)
+                    if future is not None:
+                        future.set_result(label)
+
+    def _classify(self, kind, texts, labels):
+        answers = None
+        if self.model is not None:
+            try:
+                self.model_calls += 1
+                answers = list(self.model(kind, texts, labels))
+            except Exception:
+                logger.exception("categorization model call failed; using the keyword classifier")
+        if answers is None or len(answers) != len(texts):
+            answers = [None] * len(texts)
+        results = []
+        for text, answer in zip(texts, answers):
+            if answer not in labels:
+                self.fallbacks += 1
+                answer = self.fallback.classify(text, labels)
+            results.append(answer)
+        return results
@@ -0,0 +1,73 @@
+# MAU2 Democracy Platform - Persistent Civic Graph
+# Citizen nodes and citizen -> petition/report edges, stored next to the platform tables
+# so the graph survives reruns and is shared by every process using the same database.
+
+import time
+
+CREATED_PETITION = "created_petition"
+FILED_REPORT = "filed_report"
+# The author of a petition merged into another one backs the surviving petition
+SUPPORTED_PETITION = "supported_petition"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS citizens (
+    name TEXT PRIMARY KEY,
+    joined_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS graph_edges (
+    source TEXT NOT NULL,
+    label TEXT NOT NULL,
+    target TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (source, label, target)
+);
+CREATE INDEX IF NOT EXISTS idx_graph_edges_source ON graph_edges (source, label, created_at);
+CREATE INDEX IF NOT EXISTS idx_graph_edges_target ON graph_edges (target, label);
+"""
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def join(conn, name, now=None):
+    """Register citizen ``name``; returns True only the first time."""
+    now = time.time() if now is None else now
+    cursor = conn.execute("INSERT OR IGNORE INTO citizens (name, joined_at) VALUES (?, ?)", (name, now))
+    return bool(cursor.rowcount)
+
+
+def connect(conn, source, label, target, created_at):
+    conn.execute(
+        "INSERT OR IGNORE INTO graph_edges (source, label, target, created_at) VALUES (?, ?, ?, ?)",
+        (source, label, target, created_at),
+    )
+
+
+# === READ SIDE ===
+def get_citizen(conn, name):
+    row = conn.execute("SELECT * FROM citizens WHERE name = ?", (name,)).fetchone()
+    return dict(row) if row else None
+
+
+def neighbours(conn, table, source, label, limit=20):
+    """Rows of ``table`` reached from ``source`` over ``label`` edges, newest first."""
+    rows = conn.execute(
+        f"SELECT t.* FROM graph_edges e JOIN {table} t ON t.id = e.target "
+        "WHERE e.source = ? AND e.label = ? ORDER BY e.created_at DESC LIMIT ?",
+        (source, label, limit),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def rebuild(conn):
+    """Derive citizen nodes and edges from existing petitions/reports (for stores that predate the graph)."""
+    for row in conn.execute(
+        "SELECT creator, id, created_at FROM petitions WHERE creator != 'Anonymous' ORDER BY created_at"
+    ).fetchall():
+        join(conn, row["creator"], row["created_at"])
+        connect(conn, row["creator"], CREATED_PETITION, row["id"], row["created_at"])
+    for row in conn.execute(
+        "SELECT reporter, id, created_at FROM reports WHERE anonymous = 0 AND reporter != 'Anonymous' "
+        "ORDER BY created_at"
+    ).fetchall():
+        join(conn, row["reporter"], row["created_at"])
+        connect(conn, row["reporter"], FILED_REPORT, row["id"], row["created_at"])
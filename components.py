@@ -0,0 +1,114 @@
+# MAU2 Democracy Platform - Shared UI Components
+
+import time
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from ratelimit import TRUST_PROXY
+from resources import get_notification_hub, get_session_registry
+
+# === NAVIGATION COMPONENT ===
+NAV_ITEMS = [
+    ("🏠 Home", "nav_home", 'landing'),
+    ("📋 Petitions", "nav_petitions", 'petitions'),
+    ("📝 Reports", "nav_reports", 'reports'),
+    ("🏛️ Dashboard", "nav_dashboard", 'dashboard'),
+    ("📊 Analytics", "nav_analytics", 'analytics'),
+    ("⚙️ Settings", "nav_settings", 'settings'),
+]
+
+def go_to(page):
+    st.session_state.current_page = page
+    st.session_state.nav_started = time.perf_counter()
+
+def rerun_page():
+    # Only the page fragment reruns; CSS, initialization and the header are left alone
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        # Full-script runs (first load, AppTest) cannot request a fragment-scoped rerun
+        st.rerun()
+
+def navigate(page):
+    go_to(page)
+    rerun_page()
+
+def render_navigation():
+    st.markdown("""
+    <div class="nav-container">
+    """, unsafe_allow_html=True)
+    
+    # Buttons live inside the page fragment, so a click reruns just the fragment after go_to() runs
+    for column, (label, key, page) in zip(st.columns(len(NAV_ITEMS)), NAV_ITEMS):
+        with column:
+            st.button(label, key=key, use_container_width=True, on_click=go_to, args=(page,))
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# === CITIZEN IDENTITY ===
+def citizen_key():
+    """Who is voting/following: the signed-in name, else one key per browser session.
+
+    Never the display placeholder, which every signed-out visitor shares.
+    """
+    citizen = st.session_state.get('user_name')
+    if not citizen:
+        ctx = get_script_run_ctx()
+        citizen = f"session:{ctx.session_id if ctx else 'bare'}"
+    return citizen
+
+def submitter_keys():
+    """(citizen key, client IP) used by the submission rate limits."""
+    # st.context.ip_address is missing from older Streamlit releases; no IP means no per-IP limit
+    ip = getattr(st.context, 'ip_address', None)
+    if TRUST_PROXY:
+        # Behind the load balancer the last X-Forwarded-For hop is the one it appended itself;
+        # earlier hops come from the client and cannot be trusted
+        forwarded = st.context.headers.get('X-Forwarded-For')
+        if forwarded:
+            ip = forwarded.split(",")[-1].strip()
+    return citizen_key(), ip
+
+# === NOTIFICATION INBOX ===
+def render_notification_bell():
+    # Rendered inside the page fragment: the inbox refreshes on every interaction, no polling timer
+    hub = get_notification_hub()
+    user_name = citizen_key()
+    unread = hub.unread_count(user_name)
+    
+    _, col_bell = st.columns([6, 1])
+    with col_bell:
+        with st.popover(f"🔔 {unread}" if unread else "🔔", use_container_width=True):
+            items = hub.inbox(user_name, limit=10)
+            if not items:
+                st.caption("No notifications yet.")
+            for item in items:
+                st.markdown(f"**{item['message']}**" if not item['is_read'] else item['message'])
+            if unread:
+                st.button("Mark all as read", key="notifications_read", use_container_width=True,
+                          on_click=hub.mark_all_read, args=(user_name,))
+
+# === PETITION DRAFTS ===
+# The draft itself is kept server-side; the session and the URL only carry its ID,
+# so a reconnecting browser (which gets a fresh session) finds the draft again
+def get_draft():
+    draft = get_session_registry().drafts.get(st.session_state.get('draft_id') or st.query_params.get('draft'))
+    if draft is not None:
+        st.session_state.draft_id = draft.id
+    return draft
+
+def save_draft(title, description, category=None):
+    draft_id = st.session_state.get('draft_id') or st.query_params.get('draft')
+    draft_id = get_session_registry().drafts.save(draft_id, title, description, category)
+    st.session_state.draft_id = draft_id
+    if st.query_params.get('draft') != draft_id:
+        st.query_params['draft'] = draft_id
+    return draft_id
+
+def clear_draft():
+    draft_id = st.session_state.pop('draft_id', None)
+    if draft_id:
+        get_session_registry().drafts.discard(draft_id)
+    st.query_params.pop('draft', None)
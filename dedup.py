@@ -0,0 +1,144 @@
+# MAU2 Democracy Platform - Near-Duplicate Petition Index
+# MinHash signatures over character shingles, banded into an LSH table in SQLite,
+# so "is this already a petition?" touches only the rows sharing a bucket.
+# Titles and full texts are indexed separately: a title typed on its own would
+# otherwise be diluted by the descriptions of the petitions it is compared with.
+
+import re
+import struct
+import zlib
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DEFAULT_THRESHOLD = 0.3
+TITLE, FULL_TEXT = "title", "full"
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _permutations(count, seed=0x4D415532):
+    # Fixed pseudo-random (a, b) pairs so signatures stay comparable across processes and restarts
+    state, pairs = seed, []
+    for _ in range(count):
+        state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        a = (state >> 3) % (_PRIME - 1) + 1
+        state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        b = (state >> 3) % _PRIME
+        pairs.append((a, b))
+    return pairs
+
+
+_PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS petition_signatures (
+    petition_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (petition_id, field)
+);
+
+CREATE TABLE IF NOT EXISTS petition_lsh (
+    field TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    petition_id TEXT NOT NULL,
+    PRIMARY KEY (field, band, bucket, petition_id)
+);
+CREATE INDEX IF NOT EXISTS idx_petition_lsh_petition ON petition_lsh (petition_id);
+"""
+
+
+# === MINHASH ===
+def shingles(text):
+    normalized = " ".join(_WORD.findall((text or "").lower()))
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return tuple(min((a * value + b) % _PRIME for value in hashes) & _MAX_HASH for a, b in _PERMUTATIONS)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERMUTATIONS
+
+
+def bands(sig):
+    for band in range(BANDS):
+        rows = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        yield band, zlib.crc32(struct.pack(f"<{ROWS_PER_BAND}I", *rows))
+
+
+def _fields(title, description):
+    fields = {TITLE: signature(title)}
+    if description:
+        fields[FULL_TEXT] = signature(f"{title}\n{description}")
+    return {field: sig for field, sig in fields.items() if sig is not None}
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def record(conn, petition_id, title, description):
+    for field, sig in _fields(title, description).items():
+        conn.execute(
+            "INSERT OR REPLACE INTO petition_signatures (petition_id, field, signature) VALUES (?, ?, ?)",
+            (petition_id, field, struct.pack(f"<{NUM_PERMUTATIONS}I", *sig)),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO petition_lsh (field, band, bucket, petition_id) VALUES (?, ?, ?, ?)",
+            [(field, band, bucket, petition_id) for band, bucket in bands(sig)],
+        )
+
+
+def forget(conn, petition_id):
+    conn.execute("DELETE FROM petition_lsh WHERE petition_id = ?", (petition_id,))
+    conn.execute("DELETE FROM petition_signatures WHERE petition_id = ?", (petition_id,))
+
+
+# === READ SIDE ===
+def similar(conn, title, description="", limit=5, threshold=DEFAULT_THRESHOLD):
+    """[(petition_id, similarity)] of indexed petitions close to the draft, most similar first.
+
+    The title is compared with titles and, when given, the full text with full texts;
+    a petition scores the better of the two.
+    """
+    best = {}
+    for field, sig in _fields(title, description).items():
+        candidates = set()
+        for band, bucket in bands(sig):
+            candidates.update(row[0] for row in conn.execute(
+                "SELECT petition_id FROM petition_lsh WHERE field = ? AND band = ? AND bucket = ?",
+                (field, band, bucket),
+            ))
+        for petition_id in candidates:
+            row = conn.execute(
+                "SELECT signature FROM petition_signatures WHERE petition_id = ? AND field = ?", (petition_id, field)
+            ).fetchone()
+            if row is not None:
+                score = similarity(sig, struct.unpack(f"<{NUM_PERMUTATIONS}I", row[0]))
+                best[petition_id] = max(score, best.get(petition_id, 0.0))
+    scored = sorted(
+        ((petition_id, score) for petition_id, score in best.items() if score >= threshold),
+        key=lambda item: item[1], reverse=True,
+    )
+    return scored[:limit]
+
+
+def rebuild(conn):
+    """Index every petition that has no signature yet (stores that predate the index)."""
+    rows = conn.execute(
+        "SELECT id, title, description FROM petitions "
+        "WHERE id NOT IN (SELECT petition_id FROM petition_signatures)"
+    ).fetchall()
+    for row in rows:
+        record(conn, row["id"], row["title"], row["description"])
+    return len(rows)
@@ -0,0 +1,82 @@
+# MAU2 Democracy Platform - Content-Addressed Evidence Storage
+# Uploads are streamed to disk in chunks and deduplicated by SHA-256
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+
+from platform_store import DEFAULT_DATA_DIR
+
+DEFAULT_BLOB_DIR = os.environ.get("MAU2_BLOB_DIR", os.path.join(DEFAULT_DATA_DIR, "blobs"))
+CHUNK_SIZE = 1024 * 1024
+MAX_EVIDENCE_BYTES = 25 * 1024 * 1024
+
+
+class EvidenceTooLarge(ValueError):
+    pass
+
+
+# === BLOB STORE ===
+class EvidenceStore:
+    """Writes evidence files into a sharded blob directory keyed by their SHA-256."""
+
+    def __init__(self, store, root=DEFAULT_BLOB_DIR, max_bytes=MAX_EVIDENCE_BYTES):
+        self.store = store
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def put(self, fileobj):
+        """Stream ``fileobj`` into the blob directory; returns (sha256, size, created)."""
+        digest = hashlib.sha256()
+        size = 0
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = fileobj.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise EvidenceTooLarge(f"Evidence exceeds {self.max_bytes // (1024 * 1024)}MB limit")
+                    digest.update(chunk)
+                    out.write(chunk)
+            sha256 = digest.hexdigest()
+            target = self.blob_path(sha256)
+            if os.path.exists(target):
+                os.unlink(tmp_path)
+                return sha256, size, False
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp_path, target)
+            return sha256, size, True
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def store_upload(self, fileobj):
+        """Store an uploaded file; returns the evidence record to link to a petition."""
+        filename = getattr(fileobj, "name", "evidence")
+        content_type = getattr(fileobj, "type", None) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        sha256, size, created = self.put(fileobj)
+        return {
+            "sha256": sha256,
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "deduplicated": not created,
+        }
+
+    def link(self, petition_id, record, actor=None):
+        self.store.link_evidence(petition_id, record["sha256"], record["filename"], record["content_type"], record["size"],
+                                 actor=actor)
+
+    def open(self, sha256):
+        return open(self.blob_path(sha256), "rb")
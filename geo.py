@@ -0,0 +1,204 @@
+# MAU2 Democracy Platform - Offline Geocoding & Spatial Grid Index
+# Locations are geocoded against a local gazetteer and indexed by geohash
+
+import csv
+import os
+import re
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+
+GEOHASH_PRECISION = 9
+TILE_PRECISIONS = (3, 4, 5, 6, 7)
+MAX_COVER_CELLS = 256
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_COORDINATES = re.compile(r"^\s*(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)\s*$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Words shared by places everywhere; a fuzzy match has to rest on the others
+GENERIC_TOKENS = frozenset(
+    "the of and at near city hall park square street st road rd avenue ave main district island bridge "
+    "center centre downtown town north south east west".split()
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geo_tiles (
+    precision INTEGER NOT NULL,
+    cell TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (precision, cell)
+);
+CREATE INDEX IF NOT EXISTS idx_geo_tiles_count ON geo_tiles (precision, count);
+"""
+
+
+# === GEOHASH ===
+def encode(lat, lon, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash):
+    """Return (min_lat, min_lon, max_lat, max_lon) of a geohash cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def decode(geohash):
+    min_lat, min_lon, max_lat, max_lon = decode_bbox(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+def cover(bbox, precision):
+    """Geohash cells of ``precision`` covering bbox (min_lat, min_lon, max_lat, max_lon), or None if too many."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    cell_min_lat, cell_min_lon, cell_max_lat, cell_max_lon = decode_bbox(encode(min_lat, min_lon, precision))
+    lat_step, lon_step = cell_max_lat - cell_min_lat, cell_max_lon - cell_min_lon
+    rows = int((max_lat - cell_min_lat) // lat_step) + 1
+    cols = int((max_lon - cell_min_lon) // lon_step) + 1
+    if rows * cols > MAX_COVER_CELLS:
+        return None
+    cells = set()
+    for row in range(rows):
+        lat = min(cell_min_lat + (row + 0.5) * lat_step, 90.0)
+        for col in range(cols):
+            lon = min(cell_min_lon + (col + 0.5) * lon_step, 180.0)
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def cover_ranges(bbox):
+    """Merge a bbox cover into [start, end) ranges usable against an indexed geohash column."""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cells = cover(bbox, precision)
+        if cells is not None:
+            return [(cell, cell + "~") for cell in cells]
+    return [("", "~")]
+
+
+# === WRITE-SIDE TILE ROLLUPS (called inside the store's transaction) ===
+def record_point(conn, geohash):
+    for precision in TILE_PRECISIONS:
+        conn.execute(
+            "INSERT INTO geo_tiles (precision, cell, count) VALUES (?, ?, 1) "
+            "ON CONFLICT(precision, cell) DO UPDATE SET count = count + 1",
+            (precision, geohash[:precision]),
+        )
+
+
+def remove_point(conn, geohash):
+    for precision in TILE_PRECISIONS:
+        conn.execute(
+            "UPDATE geo_tiles SET count = MAX(count - 1, 0) WHERE precision = ? AND cell = ?",
+            (precision, geohash[:precision]),
+        )
+        conn.execute(
+            "DELETE FROM geo_tiles WHERE precision = ? AND cell = ? AND count = 0", (precision, geohash[:precision])
+        )
+
+
+def tiles(conn, precision=5, bbox=None, limit=2000):
+    """Server-side heatmap tiles: [{'cell', 'lat', 'lon', 'count'}] ordered by density."""
+    # Empty tiles are deleted as they empty; the count filter also hides ones left by older stores
+    if bbox is None:
+        rows = conn.execute(
+            "SELECT cell, count FROM geo_tiles WHERE precision = ? AND count > 0 ORDER BY count DESC LIMIT ?",
+            (precision, limit),
+        ).fetchall()
+    else:
+        cells = cover(bbox, precision) or []
+        rows = []
+        for start in range(0, len(cells), 500):
+            batch = cells[start:start + 500]
+            rows.extend(conn.execute(
+                f"SELECT cell, count FROM geo_tiles WHERE precision = ? AND count > 0 "
+                f"AND cell IN ({','.join('?' * len(batch))})",
+                (precision, *batch),
+            ).fetchall())
+        rows = sorted(rows, key=lambda row: row["count"], reverse=True)[:limit]
+    result = []
+    for row in rows:
+        lat, lon = decode(row["cell"])
+        result.append({"cell": row["cell"], "lat": lat, "lon": lon, "count": row["count"]})
+    return result
+
+
+# === OFFLINE GAZETTEER ===
+def _tokens(text):
+    return _TOKEN.findall(text.lower())
+
+
+class Gazetteer:
+    """Resolves free-text locations against a local CSV of named places (name, region, lat, lon)."""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.places = []
+        self._by_name = {}
+        self._by_token = {}
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle):
+                    self.add(row["name"], row.get("region", ""), float(row["lat"]), float(row["lon"]))
+
+    def add(self, name, region, lat, lon):
+        tokens = set(_tokens(name))
+        place = {"name": name, "region": region, "lat": lat, "lon": lon, "tokens": tokens,
+                 "distinctive": tokens - GENERIC_TOKENS}
+        self.places.append(place)
+        self._by_name.setdefault(" ".join(_tokens(name)), place)
+        for token in place["tokens"]:
+            self._by_token.setdefault(token, []).append(place)
+
+    def geocode(self, text):
+        """Return {'name', 'lat', 'lon'} for ``text`` or None when it cannot be resolved offline."""
+        if not text:
+            return None
+        match = _COORDINATES.match(text)
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                return {"name": text.strip(), "lat": lat, "lon": lon}
+            return None
+        tokens = _tokens(text)
+        place = self._by_name.get(" ".join(tokens))
+        if place is None:
+            # Every distinctive word of the place must appear: "Park" or "123 Main St, City Hall"
+            # name no place in particular, so they stay text-only instead of landing somewhere arbitrary
+            query = set(tokens)
+            best, best_matched = None, 0
+            for token in query - GENERIC_TOKENS:
+                for candidate in self._by_token.get(token, ()):
+                    if not candidate["distinctive"] <= query:
+                        continue
+                    matched = len(candidate["tokens"] & query)
+                    if matched > best_matched:
+                        best, best_matched = candidate, matched
+            place = best
+        if place is None:
+            return None
+        return {"name": place["name"], "lat": place["lat"], "lon": place["lon"]}
@@ -0,0 +1,199 @@
+# MAU2 Democracy Platform - Cached HTML Fragments
+# Templates are minified once at import and rendered at most once per (template, params)
+
+import html
+import re
+from functools import lru_cache
+
+STYLESHEET_URL = "app/static/mau2.css"
+
+
+def _minify(markup):
+    # Collapse inter-tag whitespace so each fragment goes over the websocket as one compact line
+    return re.sub(r">\s+<", "><", " ".join(line.strip() for line in markup.strip().splitlines()))
+
+
+# === TEMPLATES ===
+TEMPLATES = {
+    "stylesheet": f"""
+        <style>@import url('{STYLESHEET_URL}');</style>
+    """,
+
+    "header": """
+        <div class="mau2-header">
+            <div class="mau2-logo">
+                <span style="background: linear-gradient(45deg, #ffffff, #3b82f6); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: 800;">MAU2</span>
+            </div>
+            <div class="mau2-nav">
+                <span class="mau2-nav-item" onclick="window.location.reload()">Home</span>
+                <span class="mau2-nav-item">Petitions</span>
+                <span class="mau2-nav-item">Reports</span>
+                <span class="mau2-nav-item">Community</span>
+                <span class="mau2-nav-item">About</span>
+                <div style="margin-left: 1rem;">
+                    <span style="background: rgba(255,255,255,0.2); padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem;">
+                        👤 {user_name}
+                    </span>
+                </div>
+            </div>
+        </div>
+    """,
+
+    "hero": """
+        <div class="mau2-hero">
+            <h1>Welcome to<br><span style="color: #3b82f6;">MAU2</span></h1>
+            <p>Your platform for civic engagement. Create, track, and resolve community issues with transparency and collaboration.</p>
+            <br>
+            <p style="font-size: 0.9rem; margin-top: 2rem;">
+                By continuing, you agree to our <a href="#" style="color: #3b82f6;">Terms of Service</a> and <a href="#" style="color: #3b82f6;">Privacy Policy</a>.
+            </p>
+        </div>
+    """,
+
+    "feature_card": """
+        <div class="mau2-card">
+            <div style="text-align: center; margin-bottom: 1rem;">
+                <div style="width: 60px; height: 60px; background: linear-gradient(135deg, {color_from}, {color_to}); border-radius: 50%; margin: 0 auto 1rem; display: flex; align-items: center; justify-content: center;">
+                    <span style="color: white; font-size: 1.5rem;">{icon}</span>
+                </div>
+                <h3>{title}</h3>
+                <p style="color: #64748b; font-size: 0.9rem;">{text}</p>
+            </div>
+        </div>
+    """,
+
+    "onboarding": """
+        <div style="max-width: 600px; margin: 4rem auto; text-align: center;">
+            <div style="width: 80px; height: 80px; background: linear-gradient(135deg, #3b82f6, #1d4ed8); border-radius: 50%; margin: 0 auto 2rem; display: flex; align-items: center; justify-content: center;">
+                <span style="color: white; font-size: 2rem;">🛡️</span>
+            </div>
+            <h1 style="color: #1e293b; margin-bottom: 2rem;">Know Your Rights</h1>
+            <p style="color: #64748b; font-size: 1.1rem; line-height: 1.6; margin-bottom: 3rem;">
+                As a citizen, you have the right to petition your government and escalate issues through proper channels. MAU2 helps you navigate this process effectively.
+            </p>
+            <div style="display: flex; justify-content: center; gap: 2rem; margin-bottom: 3rem;">
+                <div style="width: 8px; height: 8px; border-radius: 50%; background: #e2e8f0;"></div>
+                <div style="width: 8px; height: 8px; border-radius: 50%; background: #3b82f6;"></div>
+                <div style="width: 8px; height: 8px; border-radius: 50%; background: #e2e8f0;"></div>
+            </div>
+        </div>
+    """,
+
+    "profile_card": """
+        <div class="mau2-card">
+            <div style="text-align: center;">
+                <div style="width: 80px; height: 80px; border-radius: 50%; background: linear-gradient(135deg, #3b82f6, #1d4ed8); margin: 0 auto 1rem; display: flex; align-items: center; justify-content: center;">
+                    <span style="color: white; font-size: 2rem;">👤</span>
+                </div>
+                <h3 style="margin-bottom: 0.5rem;">{user_name}</h3>
+                <p style="color: #64748b; font-size: 0.9rem; margin-bottom: 1rem;">{role}<br>Joined {joined}</p>
+                <div style="display: flex; justify-content: space-around; margin: 2rem 0;">
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.5rem; font-weight: 700; color: #1e293b;">{petitions}</div>
+                        <div style="font-size: 0.8rem; color: #64748b;">Petitions</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.5rem; font-weight: 700; color: #1e293b;">{reports}</div>
+                        <div style="font-size: 0.8rem; color: #64748b;">Reports</div>
+                    </div>
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.5rem; font-weight: 700; color: #1e293b;">{resolved}</div>
+                        <div style="font-size: 0.8rem; color: #64748b;">Resolved</div>
+                    </div>
+                </div>
+            </div>
+        </div>
+    """,
+
+    "feed_card": """
+        <div class="mau2-card">
+            <div style="height: 120px; background: linear-gradient(135deg, {color_from}, {color_to}); border-radius: 8px; margin-bottom: 1rem; display: flex; align-items: center; justify-content: center;">
+                <span style="color: white; font-size: 2rem;">{icon}</span>
+            </div>
+            <h4>{title}</h4>
+            <p style="font-size: 0.9rem; color: #64748b; margin: 0.5rem 0;">{text}</p>
+            <p style="font-size: 0.8rem; color: #94a3b8; margin: 0.5rem 0;">{meta}</p>
+            <button style="background: none; border: none; color: #3b82f6; font-weight: 500; cursor: pointer;">{action}</button>
+        </div>
+    """,
+
+    # Feed card below an evidence thumbnail, which st.image serves as its own media file
+    "feed_card_text": """
+        <div class="mau2-card">
+            <h4>{title}</h4>
+            <p style="font-size: 0.9rem; color: #64748b; margin: 0.5rem 0;">{text}</p>
+            <p style="font-size: 0.8rem; color: #94a3b8; margin: 0.5rem 0;">{meta}</p>
+            <button style="background: none; border: none; color: #3b82f6; font-weight: 500; cursor: pointer;">{action}</button>
+        </div>
+    """,
+
+    "progress": """
+        <div class="mau2-progress">{steps_html}</div>
+    """,
+
+    "form_header": """
+        <div class="mau2-form-container">
+            <div class="mau2-form-header">
+                <h2>{title}</h2>
+                <p>{subtitle}</p>
+            </div>
+        </div>
+    """,
+
+    "map_placeholder": """
+        <div class="map-placeholder" style="height: {height}px;">
+            <div style="text-align: center;">
+                <div>{icon} {title}</div>
+                <div style="font-size: 0.9rem; margin-top: 0.5rem;">{subtitle}</div>
+            </div>
+        </div>
+    """,
+
+    "heat_legend": """
+        <div style="margin-top: 1rem; display: flex; justify-content: center; gap: 1rem;">
+            <span style="background: #ef4444; color: white; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.8rem;">High Activity</span>
+            <span style="background: #f59e0b; color: white; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.8rem;">Medium Activity</span>
+            <span style="background: #10b981; color: white; padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.8rem;">Low Activity</span>
+        </div>
+    """,
+
+    "metric_card": """
+        <div class="mau2-metric-card">
+            <div class="mau2-metric-value">{value}</div>
+            <div class="mau2-metric-label">{label}</div>
+            <div style="color: {trend_color}; font-size: 0.9rem; margin-top: 0.5rem;">{trend}</div>
+        </div>
+    """,
+}
+
+_COMPILED = {name: _minify(markup) for name, markup in TEMPLATES.items()}
+
+
+# === RENDERING ===
+@lru_cache(maxsize=2048)
+def _render(name, params):
+    values = {
+        key: value if key.endswith("_html") else html.escape(str(value))
+        for key, value in params
+    }
+    return _COMPILED[name].format(**values)
+
+
+def fragment(name, **params):
+    """Render template ``name``; parameters ending in ``_html`` are inserted unescaped."""
+    return _render(name, tuple(sorted(params.items())))
+
+
+def progress_steps(current, total=3):
+    steps = []
+    for step in range(1, total + 1):
+        if step < current:
+            steps.append('<div class="mau2-progress-step completed">✓</div>')
+        elif step == current:
+            steps.append(f'<div class="mau2-progress-step active">{step}</div>')
+        else:
+            steps.append(f'<div class="mau2-progress-step">{step}</div>')
+        if step < total:
+            color = "#10b981" if step < current else "#e2e8f0"
+            steps.append(f'<div style="width: 50px; height: 2px; background: {color};"></div>')
+    return fragment("progress", steps_html="".join(steps))
@@ -0,0 +1,78 @@
+# MAU2 Democracy Platform - Time-Ordered IDs
+# ULID-style identifiers: 48-bit millisecond timestamp + 80 random bits, Crockford base32.
+# IDs generated later sort later, so an ID works directly as a pagination/index key.
+
+import os
+import threading
+import time
+
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+ULID_LENGTH = 26
+
+_state = threading.local()
+
+
+def _reset_after_fork():
+    # A forked child inherits the parent's per-thread counters; drop them so the
+    # child does not continue the parent's sequence and mint the same IDs
+    global _state
+    _state = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _encode(value, length):
+    chars = []
+    for _ in range(length):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+# === GENERATION ===
+def ulid(now_ms=None):
+    """A 26-character ID, strictly increasing within the calling thread.
+
+    Each thread keeps its own last timestamp/random pair, so no lock is shared:
+    within one millisecond the random part is incremented, and a clock that
+    steps backwards keeps the last timestamp. Threads and processes stay
+    collision-free through the 80 random bits each sequence starts from.
+    """
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
+    last_ms = getattr(_state, "last_ms", -1)
+    if now_ms > last_ms:
+        randomness = int.from_bytes(os.urandom(10), "big")
+        # Leave headroom so a burst within one millisecond cannot overflow
+        randomness >>= 1
+    else:
+        now_ms = last_ms
+        randomness = _state.last_random + 1
+        if randomness > _RANDOM_MAX:
+            now_ms += 1
+            randomness = int.from_bytes(os.urandom(10), "big") >> 1
+    _state.last_ms, _state.last_random = now_ms, randomness
+    return _encode(now_ms, 10) + _encode(randomness, 16)
+
+
+def new_id(prefix):
+    """``<prefix>_<ulid>``, e.g. ``petition_01JAZ3...``."""
+    return f"{prefix}_{ulid()}"
+
+
+# === DECODING ===
+def timestamp_ms(identifier):
+    """Creation time (ms since epoch) embedded in an ID produced by ``new_id``/``ulid``."""
+    value = 0
+    for char in identifier.rsplit("_", 1)[-1][:10].upper():
+        value = (value << 5) | _ALPHABET.index(char)
+    return value
+
+
+def is_ulid(identifier):
+    text = identifier.rsplit("_", 1)[-1].upper()
+    return len(text) == ULID_LENGTH and all(char in _ALPHABET for char in text)
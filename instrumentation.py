@@ -0,0 +1,232 @@
+# MAU2 Democracy Platform - Opt-In Render Instrumentation
+# With MAU2_INSTRUMENT=1, page renderers and initialize_platform() record wall
+# time, markdown bytes emitted and call counts, exposed in Prometheus text format
+# on MAU2_METRICS_PORT (/metrics) and on the hidden ?admin=metrics page.
+# A sampling profiler can be triggered from either one (/profile?seconds=5).
+# The page only opens with ?admin_token= matching MAU2_ADMIN_TOKEN; without a
+# token configured it stays closed and the loopback-only endpoint is the way in.
+# Without the variable, instrument() returns functions unchanged.
+
+import collections
+import functools
+import hmac
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ENABLED = os.environ.get("MAU2_INSTRUMENT", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.environ.get("MAU2_METRICS_PORT", "9464"))
+ADMIN_TOKEN = os.environ.get("MAU2_ADMIN_TOKEN", "")
+
+# Render latency histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_PROFILE_SECONDS = 60.0
+
+_local = threading.local()
+
+
+# === METRICS ===
+class _Series:
+    __slots__ = ("calls", "seconds", "markdown_bytes", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.markdown_bytes = 0
+        self.buckets = [0] * len(BUCKETS)
+
+
+class Metrics:
+    def __init__(self):
+        self._series = {}
+        self._reruns = collections.Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, markdown_bytes):
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series()
+            series.calls += 1
+            series.seconds += seconds
+            series.markdown_bytes += markdown_bytes
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series.buckets[index] += 1
+
+    def rerun(self, scope):
+        with self._lock:
+            self._reruns[scope] += 1
+
+    def summary(self):
+        """[{function, calls, mean_ms, markdown_bytes_per_call}] slowest first."""
+        with self._lock:
+            rows = [
+                {
+                    "function": name,
+                    "calls": series.calls,
+                    "mean_ms": round(series.seconds / series.calls * 1000, 2),
+                    "markdown_bytes_per_call": series.markdown_bytes // series.calls,
+                }
+                for name, series in self._series.items()
+            ]
+        return sorted(rows, key=lambda row: row["mean_ms"], reverse=True)
+
+    def prometheus(self):
+        lines = [
+            "# HELP mau2_render_seconds Wall time of instrumented render functions.",
+            "# TYPE mau2_render_seconds histogram",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+            reruns = sorted(self._reruns.items())
+            for name, data in series:
+                for bound, count in zip(BUCKETS, data.buckets):
+                    lines.append(f'mau2_render_seconds_bucket{{function="{name}",le="{bound}"}} {count}')
+                lines.append(f'mau2_render_seconds_bucket{{function="{name}",le="+Inf"}} {data.calls}')
+                lines.append(f'mau2_render_seconds_sum{{function="{name}"}} {data.seconds:.6f}')
+                lines.append(f'mau2_render_seconds_count{{function="{name}"}} {data.calls}')
+            lines += [
+                "# HELP mau2_render_markdown_bytes_total Markdown bytes emitted by instrumented render functions.",
+                "# TYPE mau2_render_markdown_bytes_total counter",
+            ]
+            lines += [f'mau2_render_markdown_bytes_total{{function="{name}"}} {data.markdown_bytes}'
+                      for name, data in series]
+            lines += [
+                "# HELP mau2_reruns_total Script and page-fragment reruns.",
+                "# TYPE mau2_reruns_total counter",
+            ]
+            lines += [f'mau2_reruns_total{{scope="{scope}"}} {count}' for scope, count in reruns]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+# === WRAPPING ===
+def _count_markdown(markdown):
+    @functools.wraps(markdown)
+    def counting_markdown(body, *args, **kwargs):
+        # Nested instrumented calls each count the bytes emitted inside them
+        for frame in getattr(_local, "stack", ()):
+            frame[0] += len(str(body).encode())
+        return markdown(body, *args, **kwargs)
+
+    counting_markdown.counts_bytes = True
+    return counting_markdown
+
+
+def install():
+    """Route st.markdown through the byte counter (once per process)."""
+    import streamlit as st
+
+    if not getattr(st.markdown, "counts_bytes", False):
+        st.markdown = _count_markdown(st.markdown)
+
+
+def instrument(name):
+    """Decorator recording wall time and markdown bytes of each call as ``name``."""
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stack = getattr(_local, "stack", None)
+            if stack is None:
+                stack = _local.stack = []
+            frame = [0]
+            stack.append(frame)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                METRICS.observe(name, time.perf_counter() - started, frame[0])
+                stack.pop()
+
+        return wrapper
+    return decorate
+
+
+def record_rerun(scope):
+    if ENABLED:
+        METRICS.rerun(scope)
+
+
+# === ADMIN ACCESS ===
+def admin_authorized(token):
+    """True when ``token`` matches MAU2_ADMIN_TOKEN; always False while no token is configured."""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+# === SAMPLING PROFILER ===
+def sample_stacks(seconds=5.0, interval=0.005, ignore=()):
+    """Sample every thread's stack for ``seconds``; returns {collapsed stack: samples}.
+
+    The output is in the collapsed format flame-graph tools read ("a;b;c 12").
+    """
+    seconds = min(float(seconds), MAX_PROFILE_SECONDS)
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me or ident in ignore:
+                continue
+            calls = []
+            while frame is not None:
+                code = frame.f_code
+                calls.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            calls.append(names.get(ident, str(ident)))
+            stacks[";".join(reversed(calls))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def collapsed(stacks):
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+# === METRICS ENDPOINT ===
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            body = METRICS.prometheus()
+            content_type = "text/plain; version=0.0.4"
+        elif url.path == "/profile":
+            seconds = parse_qs(url.query).get("seconds", ["5"])[0]
+            try:
+                body = collapsed(sample_stacks(float(seconds), ignore=(self.server.thread_ident,)))
+            except ValueError:
+                self.send_error(400, "seconds must be a number")
+                return
+            content_type = "text/plain"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve /metrics and /profile on a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, name="mau2-metrics", daemon=True)
+    thread.start()
+    server.thread_ident = thread.ident
+    return server
@@ -0,0 +1,339 @@
+# MAU2 Democracy Platform - Petition/Report Lifecycle Log
+# Every status transition is appended to an event log (never updated in place).
+# Current state can be rebuilt from the latest snapshot plus the events after it,
+# and response/resolution times are folded into log-scale histograms as events
+# are written, so percentiles never need a replay.
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+from aggregates import CLOSED_STATUSES
+
+logger = logging.getLogger("mau2")
+
+LIFECYCLES = {
+    "report": ("submitted", "acknowledged", "in_progress", "resolved", "closed"),
+    "petition": ("active", "under_review", "resolved", "closed"),
+}
+
+RESPONSE = "response"
+RESOLUTION = "resolution"
+# Four buckets per doubling: any reported percentile is within ~9% of the true value
+BUCKETS_PER_DOUBLING = 4
+SNAPSHOT_EVERY = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lifecycle_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    previous TEXT,
+    status TEXT NOT NULL,
+    at REAL NOT NULL,
+    actor TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_lifecycle_events_record ON lifecycle_events (record_id, seq);
+
+CREATE TABLE IF NOT EXISTS lifecycle_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seq INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    records INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lifecycle_snapshot_rows (
+    snapshot_id INTEGER NOT NULL,
+    record_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    opened_at REAL NOT NULL,
+    first_response_at REAL,
+    resolved_at REAL,
+    PRIMARY KEY (snapshot_id, record_id)
+);
+
+CREATE TABLE IF NOT EXISTS lifecycle_histograms (
+    kind TEXT NOT NULL,
+    category TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, category, metric, bucket)
+);
+"""
+
+
+def check_status(kind, status):
+    if status not in LIFECYCLES[kind]:
+        raise ValueError(f"Unknown {kind} status {status!r}; expected one of: {', '.join(LIFECYCLES[kind])}")
+
+
+# === HISTOGRAMS ===
+def bucket(seconds):
+    """Log-scale bucket index; bucket 0 holds everything under one second."""
+    if seconds < 1:
+        return 0
+    return int(math.log2(seconds) * BUCKETS_PER_DOUBLING) + 1
+
+
+def bucket_value(index):
+    """Representative seconds for a bucket (geometric middle of its range)."""
+    if index == 0:
+        return 0.5
+    return 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING)
+
+
+def observe(conn, kind, category, metric, seconds):
+    conn.execute(
+        "INSERT INTO lifecycle_histograms (kind, category, metric, bucket, count) VALUES (?, ?, ?, ?, 1) "
+        "ON CONFLICT(kind, category, metric, bucket) DO UPDATE SET count = count + 1",
+        (kind, category, metric, bucket(max(0.0, seconds))),
+    )
+
+
+def _quantiles(buckets, quantiles):
+    total = sum(count for _, count in buckets)
+    if not total:
+        return {}
+    results, seen = {}, 0
+    pending = sorted(quantiles)
+    for index, count in buckets:
+        seen += count
+        while pending and seen >= pending[0] * total:
+            results[pending.pop(0)] = bucket_value(index)
+    return results
+
+
+def percentiles(conn, metric=RESPONSE, quantiles=(0.5, 0.9, 0.99), kind=None, category=None):
+    """{quantile: seconds} for ``metric`` over the matching histograms (empty when nothing was observed)."""
+    clauses, params = ["metric = ?"], [metric]
+    if kind:
+        clauses.append("kind = ?")
+        params.append(kind)
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    rows = conn.execute(
+        f"SELECT bucket, SUM(count) FROM lifecycle_histograms WHERE {' AND '.join(clauses)} "
+        "GROUP BY bucket ORDER BY bucket",
+        params,
+    ).fetchall()
+    return _quantiles([(row[0], row[1]) for row in rows], quantiles)
+
+
+def percentiles_by_category(conn, metric=RESPONSE, quantile=0.5):
+    rows = conn.execute(
+        "SELECT category, bucket, SUM(count) FROM lifecycle_histograms WHERE metric = ? "
+        "GROUP BY category, bucket ORDER BY category, bucket",
+        (metric,),
+    ).fetchall()
+    by_category = {}
+    for category, index, count in rows:
+        by_category.setdefault(category, []).append((index, count))
+    return {category: _quantiles(buckets, (quantile,))[quantile] for category, buckets in by_category.items()}
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def _append(conn, kind, record_id, category, previous, status, at, actor=None):
+    conn.execute(
+        "INSERT INTO lifecycle_events (kind, record_id, category, previous, status, at, actor) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (kind, record_id, category, previous, status, at, actor),
+    )
+
+
+def record_opened(conn, kind, record, actor=None):
+    _append(conn, kind, record["id"], record["category"], None, LIFECYCLES[kind][0], record["created_at"], actor)
+
+
+def record_transition(conn, kind, record, previous, status, first_response, now, actor=None):
+    """Log one transition; ``record`` needs id, category and created_at."""
+    _append(conn, kind, record["id"], record["category"], previous, status, now, actor)
+    if first_response:
+        observe(conn, kind, record["category"], RESPONSE, now - record["created_at"])
+    if status in CLOSED_STATUSES and previous not in CLOSED_STATUSES:
+        observe(conn, kind, record["category"], RESOLUTION, now - record["created_at"])
+
+
+def record_existing(conn, kind, record):
+    """Log a record written with its history already in place (imports and rebuilds)."""
+    record_opened(conn, kind, record)
+    initial = LIFECYCLES[kind][0]
+    if record["status"] != initial:
+        at = record["first_response_at"] or record["created_at"]
+        record_transition(conn, kind, record, initial, record["status"],
+                          record["first_response_at"] is not None, at)
+
+
+def rebuild(conn):
+    """Log every petition/report that has no events yet (stores that predate the log)."""
+    logged = 0
+    for kind, table in (("petition", "petitions"), ("report", "reports")):
+        rows = conn.execute(
+            f"SELECT id, category, status, created_at, first_response_at FROM {table} "
+            "WHERE id NOT IN (SELECT record_id FROM lifecycle_events) ORDER BY created_at"
+        ).fetchall()
+        for row in rows:
+            record_existing(conn, kind, row)
+        logged += len(rows)
+    return logged
+
+
+# === REPLAY & SNAPSHOTS ===
+def _apply(state, event):
+    record = state.get(event["record_id"])
+    if event["previous"] is None or record is None:
+        record = state[event["record_id"]] = {
+            "kind": event["kind"], "category": event["category"], "status": event["status"],
+            "opened_at": event["at"], "first_response_at": None, "resolved_at": None,
+        }
+        if event["previous"] is None:
+            return
+    if record["first_response_at"] is None:
+        record["first_response_at"] = event["at"]
+    if event["status"] in CLOSED_STATUSES:
+        if event["previous"] not in CLOSED_STATUSES:
+            record["resolved_at"] = event["at"]
+    else:
+        record["resolved_at"] = None
+    record["status"] = event["status"]
+
+
+def _latest_snapshot(conn):
+    return conn.execute("SELECT id, seq FROM lifecycle_snapshots ORDER BY id DESC LIMIT 1").fetchone()
+
+
+def replay(conn, record_id=None):
+    """{record_id: state} from the latest snapshot plus every event after it."""
+    snapshot = _latest_snapshot(conn)
+    state, after = {}, 0
+    if snapshot is not None:
+        after = snapshot["seq"]
+        where, params = ("AND record_id = ?", (record_id,)) if record_id else ("", ())
+        for row in conn.execute(
+            "SELECT record_id, kind, category, status, opened_at, first_response_at, resolved_at "
+            f"FROM lifecycle_snapshot_rows WHERE snapshot_id = ? {where}",
+            (snapshot["id"], *params),
+        ):
+            state[row["record_id"]] = {key: row[key] for key in row.keys() if key != "record_id"}
+    where, params = ("AND record_id = ?", (record_id,)) if record_id else ("", ())
+    for event in conn.execute(f"SELECT * FROM lifecycle_events WHERE seq > ? {where} ORDER BY seq", (after, *params)):
+        _apply(state, event)
+    return state
+
+
+def history(conn, record_id):
+    rows = conn.execute(
+        "SELECT previous, status, at, actor FROM lifecycle_events WHERE record_id = ? ORDER BY seq", (record_id,)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def events_since_snapshot(conn):
+    snapshot = _latest_snapshot(conn)
+    last = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM lifecycle_events").fetchone()[0]
+    return last - (snapshot["seq"] if snapshot else 0)
+
+
+def take_snapshot(conn):
+    """Write the replayed state as a new snapshot and drop the older ones; returns records captured."""
+    seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM lifecycle_events").fetchone()[0]
+    state = replay(conn)
+    snapshot_id = conn.execute(
+        "INSERT INTO lifecycle_snapshots (seq, created_at, records) VALUES (?, ?, ?)", (seq, time.time(), len(state))
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO lifecycle_snapshot_rows (snapshot_id, record_id, kind, category, status, opened_at, "
+        "first_response_at, resolved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(snapshot_id, record_id, record["kind"], record["category"], record["status"], record["opened_at"],
+          record["first_response_at"], record["resolved_at"]) for record_id, record in state.items()],
+    )
+    conn.execute("DELETE FROM lifecycle_snapshot_rows WHERE snapshot_id < ?", (snapshot_id,))
+    conn.execute("DELETE FROM lifecycle_snapshots WHERE id < ?", (snapshot_id,))
+    return len(state)
+
+
+# === GROUP COMMIT ===
+class LifecycleLog:
+    """Batches status transitions from many threads into one store transaction.
+
+    Transitions that queue up while a commit is running all go into the next
+    one; ``commit_interval`` can hold a batch open a little longer. Each
+    ``transition`` returns a Future that resolves (to True when the status
+    changed) once the batch holding it has committed. A snapshot is taken on
+    the writer thread whenever SNAPSHOT_EVERY events have accumulated.
+    """
+
+    def __init__(self, store, commit_interval=0.0, max_batch=512, snapshot_every=SNAPSHOT_EVERY):
+        self.store = store
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.snapshot_every = snapshot_every
+        self.batches = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    def transition(self, kind, record_id, status, actor=None):
+        check_status(kind, status)
+        future = Future()
+        with self._cond:
+            self._pending.append(((kind, record_id, status, actor), future))
+            self._cond.notify()
+        return future
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mau2-lifecycle", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Commit whatever is pending, then stop the writer thread."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending and not self._stop:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Let concurrent writers join this commit
+            deadline = time.monotonic() + self.commit_interval
+            while len(self._pending) < self.max_batch and not self._stop:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                results = self.store.apply_transitions([transition for transition, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            for (_, future), changed in zip(batch, results):
+                future.set_result(changed)
+            try:
+                self.store.snapshot_lifecycle(min_events=self.snapshot_every)
+            except Exception:
+                logger.exception("lifecycle snapshot failed; will retry after the next batch")
@@ -0,0 +1,306 @@
+# MAU2 Democracy Platform - Evidence Media Derivatives
+# Thumbnails, video poster frames and audio durations are produced from the
+# evidence blobs on a process pool, away from both the Streamlit script thread
+# and the submission workers. Derivatives are written next to each other under
+# the derivative directory, keyed by the blob's SHA-256; since blobs never
+# change, a derivative never goes stale. Feed pages only ever look up the small
+# derivative files and schedule the missing ones, so they never open originals.
+#
+# Pillow comes with Streamlit. Video posters need ffmpeg on PATH; durations use
+# mutagen or ffprobe when available and otherwise read MP3/WAV headers directly.
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from platform_store import DEFAULT_DATA_DIR
+
+logger = logging.getLogger("mau2")
+
+DEFAULT_DERIVATIVE_DIR = os.environ.get("MAU2_DERIVATIVE_DIR", os.path.join(DEFAULT_DATA_DIR, "derived"))
+THUMBNAIL_SIZE = 480
+JPEG_QUALITY = 80
+TOOL_TIMEOUT = 60
+
+IMAGE = "image"
+VIDEO = "video"
+AUDIO = "audio"
+
+
+def media_kind(content_type):
+    """IMAGE, VIDEO, AUDIO or None for evidence we make no derivatives of (PDFs, documents)."""
+    kind = (content_type or "").split("/", 1)[0]
+    return kind if kind in (IMAGE, VIDEO, AUDIO) else None
+
+
+class ToolMissing(RuntimeError):
+    """The library or binary needed for a derivative is not installed; the result is not cached."""
+
+
+# === DERIVATIVES (run in the worker processes) ===
+def _pillow():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ToolMissing("Thumbnails need Pillow: pip install pillow") from None
+    return Image, ImageOps
+
+
+def _save_jpeg(image, path):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".thumb-")
+    os.close(fd)
+    try:
+        image.convert("RGB").save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return image.size
+
+
+def make_thumbnail(source, target, size=THUMBNAIL_SIZE):
+    Image, ImageOps = _pillow()
+    with Image.open(source) as image:
+        # JPEGs decode straight at 1/2, 1/4 or 1/8 scale, which is most of the work saved on large photos
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        return _save_jpeg(image, target)
+
+
+def _run_tool(*args):
+    binary = shutil.which(args[0])
+    if binary is None:
+        raise ToolMissing(f"{args[0]} is not installed")
+    return subprocess.run([binary, *args[1:]], capture_output=True, timeout=TOOL_TIMEOUT, check=True).stdout
+
+
+def make_poster(source, target, size=THUMBNAIL_SIZE):
+    fd, frame = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".frame-", suffix=".png")
+    os.close(fd)
+    try:
+        # One second in skips black lead-in frames; clips shorter than that use their first frame
+        for offset in ("1", "0"):
+            _run_tool("ffmpeg", "-v", "error", "-y", "-ss", offset, "-i", source, "-frames:v", "1", frame)
+            if os.path.getsize(frame):
+                break
+        else:
+            raise ValueError("video has no frames")
+        return make_thumbnail(frame, target, size)
+    finally:
+        os.unlink(frame)
+
+
+# MPEG audio layer III: samples per frame and sample rates by version bits
+_MP3_SAMPLES = {3: 1152, 2: 576, 0: 576}
+_MP3_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+def _mp3_duration(path):
+    """Duration from the first frame header: the Xing/Info frame count if present, else constant bitrate."""
+    with open(path, "rb") as handle:
+        head = handle.read(10)
+        start = 0
+        if head[:3] == b"ID3":
+            start = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+        handle.seek(start)
+        data = handle.read(64 * 1024)
+    for offset in range(len(data) - 4):
+        if data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+            continue
+        header = struct.unpack(">I", data[offset:offset + 4])[0]
+        version, layer = (header >> 19) & 3, (header >> 17) & 3
+        bitrate_index, rate_index = (header >> 12) & 15, (header >> 10) & 3
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        sample_rate = _MP3_RATES[version][rate_index]
+        mono = (header >> 6) & 3 == 3
+        side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        xing = data[offset + 4 + side_info:offset + 4 + side_info + 12]
+        if xing[:4] in (b"Xing", b"Info") and struct.unpack(">I", xing[4:8])[0] & 1:
+            frames = struct.unpack(">I", xing[8:12])[0]
+            return frames * _MP3_SAMPLES[version] / sample_rate
+        bitrate = _MP3_BITRATES[3 if version == 3 else 2][bitrate_index] * 1000
+        return (os.path.getsize(path) - start - offset) * 8 / bitrate
+    raise ValueError("no MPEG audio frame found")
+
+
+def audio_duration(source, content_type):
+    try:
+        import mutagen
+    except ImportError:
+        mutagen = None
+    if mutagen is not None:
+        audio = mutagen.File(source)
+        if audio is not None and audio.info:
+            return audio.info.length
+    if shutil.which("ffprobe"):
+        output = _run_tool("ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", source)
+        return float(output.strip())
+    if content_type in ("audio/wav", "audio/x-wav", "audio/wave"):
+        with wave.open(source) as audio:
+            return audio.getnframes() / audio.getframerate()
+    if content_type in ("audio/mpeg", "audio/mp3"):
+        return _mp3_duration(source)
+    raise ToolMissing(f"Durations of {content_type} need mutagen or ffprobe")
+
+
+def video_duration(source):
+    try:
+        return float(_run_tool("ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0",
+                               source).strip())
+    except ToolMissing:
+        return None
+
+
+def derive(source, content_type, prefix, size=THUMBNAIL_SIZE):
+    """Produce the derivatives of one blob and write ``<prefix>.json`` (plus ``<prefix>.jpg``).
+
+    Returns the metadata. Files that cannot be decoded get metadata with an
+    ``error`` so they are not retried; ToolMissing is raised and nothing is written.
+    """
+    kind = media_kind(content_type)
+    meta = {"kind": kind, "content_type": content_type, "thumbnail": None, "width": None, "height": None,
+            "duration": None, "error": None}
+    try:
+        if kind == IMAGE:
+            meta["width"], meta["height"] = make_thumbnail(source, prefix + ".jpg", size)
+            meta["thumbnail"] = os.path.basename(prefix) + ".jpg"
+        elif kind == VIDEO:
+            meta["width"], meta["height"] = make_poster(source, prefix + ".jpg", size)
+            meta["thumbnail"] = os.path.basename(prefix) + ".jpg"
+            meta["duration"] = video_duration(source)
+        elif kind == AUDIO:
+            meta["duration"] = audio_duration(source, content_type)
+    except ToolMissing:
+        raise
+    except Exception as exc:
+        meta["error"] = f"{type(exc).__name__}: {exc}"
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(prefix), prefix=".meta-")
+    with os.fdopen(fd, "w") as out:
+        json.dump(meta, out)
+    os.replace(tmp_path, prefix + ".json")
+    return meta
+
+
+# === MEDIA WORKER ===
+class MediaWorker:
+    """Schedules derivative generation on a process pool and serves finished derivatives.
+
+    ``derivatives`` and ``thumbnail`` never block: when nothing is cached yet
+    they queue the blob (once, however many sessions ask) and return None.
+    """
+
+    def __init__(self, evidence_store, root=DEFAULT_DERIVATIVE_DIR, max_workers=2, size=THUMBNAIL_SIZE,
+                 max_cached=4096):
+        self.evidence_store = evidence_store
+        self.root = root
+        self.max_workers = max_workers
+        self.size = size
+        self.max_cached = max_cached
+        self.generated = 0
+        self.failed = 0
+        self._executor = None
+        self._pending = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def prefix(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def request(self, sha256, content_type):
+        """Queue derivatives for a blob unless they exist or are already queued; returns the Future or None."""
+        if media_kind(content_type) is None or self._lookup(sha256) is not None:
+            return None
+        return self._schedule(sha256, content_type)
+
+    def derivatives(self, sha256, content_type):
+        """The derivative metadata of a blob, or None while it is still being made."""
+        meta = self._lookup(sha256)
+        if meta is None and media_kind(content_type) is not None:
+            self._schedule(sha256, content_type)
+        return meta
+
+    def thumbnail(self, sha256, content_type):
+        """Path of the blob's thumbnail or poster frame, or None if there is none (yet)."""
+        meta = self.derivatives(sha256, content_type)
+        if meta is None or not meta["thumbnail"]:
+            return None
+        return os.path.join(os.path.dirname(self.prefix(sha256)), meta["thumbnail"])
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _schedule(self, sha256, content_type):
+        with self._lock:
+            future = self._pending.get(sha256)
+            if future is None:
+                prefix = self.prefix(sha256)
+                os.makedirs(os.path.dirname(prefix), exist_ok=True)
+                if self._executor is None:
+                    # Spawned, not forked: the app process is full of threads holding locks
+                    self._executor = ProcessPoolExecutor(self.max_workers, multiprocessing.get_context("spawn"))
+                future = self._executor.submit(derive, self.evidence_store.blob_path(sha256), content_type,
+                                               prefix, self.size)
+                self._pending[sha256] = future
+                future.add_done_callback(lambda done: self._finished(sha256, done))
+            return future
+
+    def _lookup(self, sha256):
+        with self._lock:
+            if sha256 in self._cache:
+                self._cache.move_to_end(sha256)
+                return self._cache[sha256]
+        try:
+            with open(self.prefix(sha256) + ".json") as handle:
+                meta = json.load(handle)
+        except FileNotFoundError:
+            return None
+        self._remember(sha256, meta)
+        return meta
+
+    def _remember(self, sha256, meta):
+        with self._lock:
+            self._cache[sha256] = meta
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def _finished(self, sha256, future):
+        with self._lock:
+            self._pending.pop(sha256, None)
+        try:
+            meta = future.result()
+        except ToolMissing as exc:
+            # Nothing was written, so a restart with the tool installed tries again
+            logger.info("skipping media derivatives for %s: %s", sha256[:12], exc)
+            self._remember(sha256, {"kind": None, "thumbnail": None, "duration": None, "error": str(exc)})
+            return
+        except Exception:
+            logger.exception("media derivatives failed for %s", sha256[:12])
+            self.failed += 1
+            return
+        self.generated += 1
+        if meta["error"]:
+            self.failed += 1
+        self._remember(sha256, meta)
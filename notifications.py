@@ -0,0 +1,257 @@
+# MAU2 Democracy Platform - Notification Fan-Out
+# Events on a petition or report are published to a topic and fanned out to its
+# subscribers by one background dispatcher shared by every session. Bursts on
+# the same topic are coalesced ("12 new votes" instead of twelve rows), each
+# citizen's stored preferences are honoured, and inboxes are capped at INBOX_SIZE.
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from replication import INBOX, PREFERENCES
+
+logger = logging.getLogger("mau2")
+
+INBOX_SIZE = 50
+COALESCE_SECONDS = 2.0
+
+GENERAL = "general"
+INTERACTION = "interaction"
+
+# Default audience: the record's author, or everyone subscribed to its topic
+OWNER = "owner"
+FOLLOWERS = "followers"
+
+# event -> (preference it falls under, default audience, message for one event, message for a burst)
+KINDS = {
+    "votes": (INTERACTION, OWNER, "👍 New vote on “{title}”", "👍 {count:,} new votes on “{title}”"),
+    "evidence": (INTERACTION, OWNER, "📎 New evidence added to “{title}”", "📎 {count:,} new files added to “{title}”"),
+    "created": (GENERAL, OWNER, "✅ “{title}” is live", "✅ “{title}” is live"),
+    "status": (GENERAL, FOLLOWERS, "📌 “{title}” is now {detail}", "📌 “{title}” is now {detail}"),
+    "merged": (GENERAL, FOLLOWERS, "🔗 “{title}” was merged into “{detail}”",
+               "🔗 “{title}” was merged into “{detail}”"),
+}
+
+
+def topic(kind, record_id):
+    return f"{kind}:{record_id}"
+
+
+class _Pending:
+    __slots__ = ("deadline", "count", "title", "detail")
+
+    def __init__(self, deadline, title, detail):
+        self.deadline = deadline
+        self.count = 0
+        self.title = title
+        self.detail = detail
+
+
+# === NOTIFICATION HUB ===
+class NotificationHub:
+    """Pub/sub fan-out into bounded per-citizen inboxes.
+
+    ``publish`` only enqueues, so it is safe to call from a script run or a
+    worker thread; subscriber lookup, preference checks, coalescing and the
+    batched insert all happen on the dispatcher thread.
+    """
+
+    def __init__(self, store, inbox_size=INBOX_SIZE, coalesce_seconds=COALESCE_SECONDS):
+        self.store = store
+        self.inbox_size = inbox_size
+        self.coalesce_seconds = coalesce_seconds
+        self.delivered = 0
+        self._events = queue.Queue()
+        self._pending = {}
+        self._preferences = {}
+        self._inboxes = {}
+        # Bumped whenever an inbox changes, so a load that raced a change is not cached
+        self._inbox_version = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._busy = 0
+        self._thread = None
+
+    # --- Subscriptions & preferences ---
+    def subscribe(self, user_name, kind, record_id):
+        self.store.subscribe(topic(kind, record_id), user_name)
+
+    def preferences(self, user_name):
+        with self._lock:
+            cached = self._preferences.get(user_name)
+        if cached is None:
+            cached = self.store.get_notification_preferences(user_name)
+            with self._lock:
+                self._preferences[user_name] = cached
+        return dict(cached)
+
+    def set_preferences(self, user_name, general, interaction):
+        self.store.set_notification_preferences(user_name, general, interaction)
+        with self._lock:
+            self._preferences[user_name] = {GENERAL: bool(general), INTERACTION: bool(interaction)}
+
+    # --- Publishing ---
+    def publish(self, kind, record_id, event, title=None, detail=None, count=1, recipients=None, actor=None):
+        """Queue ``event`` (a KINDS key) on a petition/report; ``recipients`` defaults to the event's audience."""
+        if event not in KINDS:
+            raise ValueError(f"Unknown notification event: {event}")
+        with self._lock:
+            self._busy += 1
+        self._events.put((kind, record_id, event, title, detail, count, recipients, actor))
+
+    def votes_received(self, accepted):
+        """VoteCounter flush callback: {petition_id: new votes} -> one coalesced event per petition."""
+        for petition_id, count in accepted.items():
+            if count:
+                self.publish("petition", petition_id, "votes", count=count)
+
+    # --- Inbox ---
+    def inbox(self, user_name, limit=INBOX_SIZE):
+        inbox = self._inbox(user_name)
+        with self._lock:
+            return [dict(item) for item in list(inbox)[:limit]]
+
+    def unread_count(self, user_name):
+        inbox = self._inbox(user_name)
+        with self._lock:
+            return sum(1 for item in inbox if not item["is_read"])
+
+    def mark_all_read(self, user_name):
+        self.store.mark_notifications_read(user_name)
+        inbox = self._inbox(user_name)
+        with self._lock:
+            for item in inbox:
+                item["is_read"] = 1
+
+    def invalidate(self, changed, key=None, local=False):
+        """ChangeFeed listener: forget inboxes and preferences changed by a write, here or on another replica."""
+        with self._lock:
+            if changed is None:
+                self._inbox_version += 1
+                self._inboxes.clear()
+                self._preferences.clear()
+            elif changed == INBOX:
+                self._inbox_version += 1
+                self._inboxes.pop(key, None)
+            elif changed == PREFERENCES:
+                self._preferences.pop(key, None)
+
+    def _inbox(self, user_name):
+        """The cached inbox of ``user_name`` (read its items under the lock).
+
+        Loaded once and reloaded after invalidate() sees a write to it. The query
+        runs without the lock, so one slow load never stalls the other sessions.
+        """
+        with self._lock:
+            inbox = self._inboxes.get(user_name)
+            version = self._inbox_version
+        if inbox is not None:
+            return inbox
+        rows = self.store.list_notifications(user_name, limit=self.inbox_size)
+        inbox = deque(
+            ({"message": row["message"], "is_read": row["is_read"], "created_at": row["created_at"]}
+             for row in rows),
+            maxlen=self.inbox_size,
+        )
+        with self._lock:
+            if self._inbox_version == version:
+                inbox = self._inboxes.setdefault(user_name, inbox)
+        return inbox
+
+    # --- Dispatcher ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mau2-notify", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._events.put(None)
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self, timeout=5.0):
+        """Wait until queued events are fanned out, then deliver every coalesced burst now."""
+        with self._idle:
+            if self._thread is not None:
+                self._idle.wait_for(lambda: self._busy == 0, timeout)
+        self._deliver(force=True)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                deadlines = [pending.deadline for pending in self._pending.values()]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                event = ()
+            if event is None:
+                return
+            try:
+                if event:
+                    self._fan_out(*event)
+                self._deliver()
+            except Exception:
+                logger.exception("notification dispatch failed")
+            finally:
+                if event:
+                    with self._idle:
+                        self._busy -= 1
+                        self._idle.notify_all()
+
+    def _fan_out(self, kind, record_id, event, title, detail, count, recipients, actor):
+        category, audience = KINDS[event][:2]
+        if title is None or (recipients is None and audience == OWNER):
+            record = self.store.get_petition(record_id) if kind == "petition" else self.store.get_report(record_id)
+            if record is None:
+                return
+            # A vote can land on a petition that has since been merged away
+            record_id = record["id"]
+            if title is None:
+                title = record["title"] if kind == "petition" else record["report_type"]
+            if recipients is None and audience == OWNER:
+                owner = record["creator"] if kind == "petition" else \
+                    (None if record["anonymous"] else record["reporter"])
+                recipients = [owner] if owner and owner != "Anonymous" else []
+        if recipients is None:
+            recipients = self.store.subscribers(topic(kind, record_id))
+        deadline = time.monotonic() + self.coalesce_seconds
+        for user_name in recipients:
+            if user_name == actor or not self.preferences(user_name)[category]:
+                continue
+            key = (user_name, topic(kind, record_id), event)
+            with self._lock:
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = _Pending(deadline, title, detail)
+                pending.count += count
+                pending.detail = detail
+
+    def _deliver(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key, pending in self._pending.items() if force or pending.deadline <= now]
+            ready = [(key, self._pending.pop(key)) for key in due]
+        if not ready:
+            return 0
+        created_at = time.time()
+        rows = []
+        for (user_name, _, event), pending in ready:
+            single, burst = KINDS[event][2:]
+            template = single if pending.count == 1 else burst
+            rows.append((user_name, template.format(title=pending.title, detail=pending.detail,
+                                                    count=pending.count), created_at))
+        self.store.add_notifications(rows, keep=self.inbox_size)
+        with self._lock:
+            self._inbox_version += 1
+            for user_name, message, _ in rows:
+                inbox = self._inboxes.get(user_name)
+                if inbox is not None:
+                    inbox.appendleft({"message": message, "is_read": 0, "created_at": created_at})
+            self.delivered += len(rows)
+        return len(rows)
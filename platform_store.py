@@ -0,0 +1,983 @@
+# MAU2 Democracy Platform - Shared Petition/Report Store
+# Process-wide SQLite store (WAL mode) shared by every Streamlit session
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import aggregates
+import civic_graph
+import dedup
+import geo
+import lifecycle
+import notifications
+import replication
+import review_queue
+import search
+from ids import new_id
+from replication import ANALYTICS, DRAFTS, INBOX, PETITIONS, PREFERENCES, REPORTS
+
+DEFAULT_DATA_DIR = os.environ.get("MAU2_DATA_DIR", "mau2_data")
+DEFAULT_DB_PATH = os.environ.get("MAU2_DB_PATH", os.path.join(DEFAULT_DATA_DIR, "platform.db"))
+
+# === SCHEMA ===
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS petitions (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    creator TEXT NOT NULL DEFAULT 'Anonymous',
+    location TEXT NOT NULL DEFAULT '',
+    votes INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    first_response_at REAL,
+    lat REAL,
+    lon REAL,
+    geohash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_petitions_category ON petitions (category, created_at);
+CREATE INDEX IF NOT EXISTS idx_petitions_status ON petitions (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_petitions_category_status ON petitions (category, status, created_at);
+DROP INDEX IF EXISTS idx_petitions_created;
+CREATE INDEX IF NOT EXISTS idx_petitions_feed_recent ON petitions (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_petitions_feed_votes ON petitions (votes, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_petitions_geohash ON petitions (geohash);
+
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    report_type TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT 'Other',
+    description TEXT NOT NULL,
+    reporter TEXT NOT NULL DEFAULT 'Anonymous',
+    anonymous INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'submitted',
+    location TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    first_response_at REAL,
+    lat REAL,
+    lon REAL,
+    geohash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reports_category ON reports (category, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_status ON reports (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_reports_category_status ON reports (category, status, created_at);
+DROP INDEX IF EXISTS idx_reports_created;
+CREATE INDEX IF NOT EXISTS idx_reports_feed_recent ON reports (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_geohash ON reports (geohash);
+
+CREATE TABLE IF NOT EXISTS petition_votes (
+    petition_id TEXT NOT NULL,
+    voter_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (petition_id, voter_id)
+);
+
+CREATE TABLE IF NOT EXISTS petition_merges (
+    duplicate_id TEXT PRIMARY KEY,
+    canonical_id TEXT NOT NULL,
+    merged_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_name TEXT NOT NULL,
+    message TEXT NOT NULL,
+    is_read INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user_name, created_at);
+
+CREATE TABLE IF NOT EXISTS notification_preferences (
+    user_name TEXT PRIMARY KEY,
+    general INTEGER NOT NULL DEFAULT 1,
+    interaction INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS notification_subscriptions (
+    topic TEXT NOT NULL,
+    user_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (topic, user_name)
+);
+
+CREATE TABLE IF NOT EXISTS petition_drafts (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    category TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_petition_drafts_updated ON petition_drafts (updated_at);
+
+CREATE TABLE IF NOT EXISTS store_backfills (
+    name TEXT PRIMARY KEY,
+    applied_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    petition_id TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (petition_id, sha256)
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_sha256 ON evidence (sha256);
+"""
+
+
+# Columns added after the first release; older databases get them via ALTER TABLE
+ADDED_COLUMNS = {
+    "petitions": (("first_response_at", "REAL"), ("lat", "REAL"), ("lon", "REAL"), ("geohash", "TEXT")),
+    "reports": (("first_response_at", "REAL"), ("lat", "REAL"), ("lon", "REAL"), ("geohash", "TEXT")),
+}
+
+
+# Derived tables filled from existing rows by PlatformStore._backfill_<name>, in this order
+BACKFILLS = ("graph", "dedup", "search", "aggregates", "lifecycle", "review_queue")
+
+
+# Keyset pagination orders: each key column list matches an index, newest/highest first
+FEED_ORDERS = {
+    "recent": ("created_at", "id"),
+    "votes": ("votes", "created_at", "id"),
+}
+
+
+PETITION_COLUMNS = ("id", "title", "description", "category", "status", "creator", "location", "votes",
+                    "created_at", "first_response_at", "lat", "lon", "geohash")
+REPORT_COLUMNS = ("id", "report_type", "category", "description", "reporter", "anonymous", "status", "location",
+                  "created_at", "first_response_at", "lat", "lon", "geohash")
+
+
+def _insert_sql(table, columns, verb="INSERT"):
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + column for column in columns)})"
+
+
+INSERT_PETITION = _insert_sql("petitions", PETITION_COLUMNS)
+INSERT_REPORT = _insert_sql("reports", REPORT_COLUMNS)
+
+
+def _migrate(conn):
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            continue
+        for name, column_type in columns:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+def _geo_fields(coordinates):
+    if not coordinates:
+        return {"lat": None, "lon": None, "geohash": None}
+    lat, lon = coordinates
+    return {"lat": lat, "lon": lon, "geohash": geo.encode(lat, lon)}
+
+
+# === CONNECTION POOL ===
+class ConnectionPool:
+    """Small fixed-size pool of SQLite connections shared across threads."""
+
+    def __init__(self, path, size=8, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+# === REPOSITORY API ===
+class PlatformStore:
+    """Repository for petitions, reports and notifications."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, pool_size=8):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.pool = ConnectionPool(path, size=pool_size)
+        # Identifies this process's writes in change_log (see replication.py)
+        self.replica_id = new_id("replica")
+        self._commit_listeners = []
+        self._event_listeners = []
+        self._local = threading.local()
+        with self.pool.connection() as conn:
+            _migrate(conn)
+            conn.executescript(SCHEMA)
+            conn.executescript(aggregates.SCHEMA)
+            conn.executescript(geo.SCHEMA)
+            conn.executescript(civic_graph.SCHEMA)
+            conn.executescript(dedup.SCHEMA)
+            conn.executescript(search.SCHEMA)
+            conn.executescript(lifecycle.SCHEMA)
+            conn.executescript(replication.SCHEMA)
+            conn.executescript(review_queue.SCHEMA)
+        self._run_backfills()
+
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        self._local.published = False
+        self._local.events = []
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        # Listeners run after the connection is back in the pool, since they read the change log
+        if self._local.published:
+            for listener in self._commit_listeners:
+                listener()
+        for kind, record_id, event, details in self._local.events:
+            for listener in self._event_listeners:
+                listener(kind, record_id, event, **details)
+
+    def on_commit(self, listener):
+        """Call ``listener()`` after every committed transaction that published a change."""
+        self._commit_listeners.append(listener)
+
+    def on_event(self, listener):
+        """Call ``listener(kind, record_id, event, **details)`` for every status change, merge and evidence link.
+
+        Events fire once their transaction has committed; ``event`` is a notifications.KINDS key.
+        """
+        self._event_listeners.append(listener)
+
+    def _publish(self, conn, *topics, key=None):
+        for topic in topics:
+            replication.publish(conn, self.replica_id, topic, key)
+        self._local.published = True
+
+    def _event(self, kind, record_id, event, **details):
+        self._local.events.append((kind, record_id, event, details))
+
+    # --- Petitions ---
+    def add_petition(self, title, description, category, creator="Anonymous", location="", status="active",
+                     coordinates=None):
+        petition = {
+            "id": new_id("petition"),
+            "title": title,
+            "description": description,
+            "category": category,
+            "status": status,
+            "creator": creator,
+            "location": location,
+            "votes": 0,
+            "created_at": time.time(),
+            "first_response_at": None,
+            **_geo_fields(coordinates),
+        }
+        with self.transaction() as conn:
+            conn.execute(INSERT_PETITION, petition)
+            aggregates.record_opened(conn, "petition", category, petition["created_at"])
+            lifecycle.record_opened(conn, "petition", petition, creator)
+            self._index_petition(conn, petition)
+            self._publish(conn, PETITIONS, ANALYTICS)
+        return petition
+
+    def get_petition(self, petition_id):
+        """Fetch a petition; IDs of merged duplicates resolve to the petition they were merged into."""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM petitions WHERE id = COALESCE("
+                "(SELECT canonical_id FROM petition_merges WHERE duplicate_id = ?), ?)",
+                (petition_id, petition_id),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def similar_petitions(self, title, description="", limit=5, threshold=dedup.DEFAULT_THRESHOLD):
+        """Existing petitions that look like a near-duplicate of the given text, each with a ``similarity``."""
+        with self.connection() as conn:
+            matches = dedup.similar(conn, title, description, limit, threshold)
+            petitions = []
+            for petition_id, score in matches:
+                row = conn.execute("SELECT * FROM petitions WHERE id = ?", (petition_id,)).fetchone()
+                if row is not None:
+                    petitions.append({**dict(row), "similarity": score})
+        return petitions
+
+    def merge_petitions(self, duplicate_id, canonical_id):
+        """Fold ``duplicate_id`` into ``canonical_id``: votes, evidence and citizen edges move over, the copy is removed."""
+        if duplicate_id == canonical_id:
+            return False
+        with self.transaction() as conn:
+            duplicate = conn.execute("SELECT * FROM petitions WHERE id = ?", (duplicate_id,)).fetchone()
+            canonical = conn.execute("SELECT title FROM petitions WHERE id = ?", (canonical_id,)).fetchone()
+            if duplicate is None or canonical is None:
+                return False
+            recorded = conn.execute(
+                "SELECT COUNT(*) FROM petition_votes WHERE petition_id = ?", (duplicate_id,)
+            ).fetchone()[0]
+            moved = conn.execute(
+                "INSERT OR IGNORE INTO petition_votes (petition_id, voter_id, created_at) "
+                "SELECT ?, voter_id, created_at FROM petition_votes WHERE petition_id = ?",
+                (canonical_id, duplicate_id),
+            ).rowcount
+            # Votes counted before per-voter rows existed carry over as-is
+            carried = moved + max(0, duplicate["votes"] - recorded)
+            conn.execute("UPDATE petitions SET votes = votes + ? WHERE id = ?", (carried, canonical_id))
+            # The copy leaves the analytics; its evidence only counts once more if the canonical had none
+            verified = conn.execute(
+                "SELECT COUNT(DISTINCT petition_id) FROM evidence WHERE petition_id IN (?, ?)",
+                (duplicate_id, canonical_id),
+            ).fetchone()[0]
+            if verified == 2:
+                aggregates.record_verified(conn, "petition", -1)
+            closed_at = conn.execute(
+                "SELECT at FROM lifecycle_events WHERE record_id = ? AND status IN ('closed', 'resolved') "
+                "AND (previous IS NULL OR previous NOT IN ('closed', 'resolved')) ORDER BY seq DESC LIMIT 1",
+                (duplicate_id,),
+            ).fetchone()
+            aggregates.record_removed(conn, "petition", duplicate, closed_at[0] if closed_at else None)
+            conn.execute(
+                "INSERT OR IGNORE INTO evidence (petition_id, sha256, filename, content_type, size, created_at) "
+                "SELECT ?, sha256, filename, content_type, size, created_at FROM evidence WHERE petition_id = ?",
+                (canonical_id, duplicate_id),
+            )
+            # The copy's author becomes a supporter of the canonical petition, not one of its creators
+            conn.execute(
+                "UPDATE OR IGNORE graph_edges SET target = ?, label = ? WHERE target = ? AND label = ?",
+                (canonical_id, civic_graph.SUPPORTED_PETITION, duplicate_id, civic_graph.CREATED_PETITION),
+            )
+            conn.execute(
+                "UPDATE OR IGNORE graph_edges SET target = ? WHERE target = ?", (canonical_id, duplicate_id)
+            )
+            conn.execute("DELETE FROM petition_votes WHERE petition_id = ?", (duplicate_id,))
+            conn.execute("DELETE FROM evidence WHERE petition_id = ?", (duplicate_id,))
+            conn.execute("DELETE FROM graph_edges WHERE target = ?", (duplicate_id,))
+            conn.execute(
+                "UPDATE petition_merges SET canonical_id = ? WHERE canonical_id = ?", (canonical_id, duplicate_id)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO petition_merges (duplicate_id, canonical_id, merged_at) VALUES (?, ?, ?)",
+                (duplicate_id, canonical_id, time.time()),
+            )
+            dedup.forget(conn, duplicate_id)
+            search.remove(conn, duplicate_id)
+            if duplicate["geohash"]:
+                geo.remove_point(conn, duplicate["geohash"])
+            conn.execute("DELETE FROM petitions WHERE id = ?", (duplicate_id,))
+            # Followers of the copy follow the canonical petition from now on
+            old_topic = notifications.topic("petition", duplicate_id)
+            new_topic = notifications.topic("petition", canonical_id)
+            followers = [row[0] for row in conn.execute(
+                "SELECT user_name FROM notification_subscriptions WHERE topic = ?", (old_topic,)
+            )]
+            conn.execute(
+                "UPDATE OR IGNORE notification_subscriptions SET topic = ? WHERE topic = ?", (new_topic, old_topic)
+            )
+            conn.execute("DELETE FROM notification_subscriptions WHERE topic = ?", (old_topic,))
+            self._publish(conn, PETITIONS, ANALYTICS)
+            self._event("petition", duplicate_id, "merged", title=duplicate["title"], detail=canonical["title"],
+                        recipients=followers)
+        return True
+
+    def set_petition_status(self, petition_id, status, actor=None):
+        return self.apply_transitions([("petition", petition_id, status, actor)])[0]
+
+    def list_petitions(self, category=None, status=None, limit=20):
+        return self._list("petitions", category, status, limit)
+
+    def apply_votes(self, votes):
+        """Persist a batch of (petition_id, voter_id) upvotes; duplicates are ignored.
+
+        Returns {petition_id: accepted_votes} for the votes that were new.
+        """
+        accepted = {}
+        now = time.time()
+        with self.transaction() as conn:
+            for petition_id, voter_id in votes:
+                # A vote buffered for a petition that has since been merged lands on the canonical copy
+                target = conn.execute(
+                    "SELECT canonical_id FROM petition_merges WHERE duplicate_id = ?", (petition_id,)
+                ).fetchone()
+                target = target[0] if target else petition_id
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO petition_votes (petition_id, voter_id, created_at) "
+                    "SELECT id, ?, ? FROM petitions WHERE id = ?",
+                    (voter_id, now, target),
+                )
+                if cursor.rowcount:
+                    accepted[target] = accepted.get(target, 0) + 1
+            conn.executemany(
+                "UPDATE petitions SET votes = votes + ? WHERE id = ?",
+                [(count, petition_id) for petition_id, count in accepted.items()],
+            )
+            if accepted:
+                self._publish(conn, PETITIONS)
+        return accepted
+
+    def has_voted(self, petition_id, voter_id):
+        with self.connection() as conn:
+            return conn.execute(
+                "SELECT 1 FROM petition_votes WHERE petition_id = ? AND voter_id = ?", (petition_id, voter_id)
+            ).fetchone() is not None
+
+    def petition_feed(self, order="recent", cursor=None, limit=10, category=None, status=None):
+        """One page of petitions; pass the returned cursor back to get the next page."""
+        return self._feed("petitions", FEED_ORDERS[order], cursor, limit, category, status)
+
+    def search_petitions(self, query="", category=None, status=None, location=None, limit=10, offset=0):
+        """BM25-ranked petitions matching ``query`` and the facet filters; returns (items, next_offset, truncated)."""
+        with self.connection() as conn:
+            return search.search(conn, "petition", query, category, status, location, limit, offset)
+
+    def count_petitions(self, category=None, status=None):
+        return self._count("petitions", category, status)
+
+    # --- Reports ---
+    def add_report(self, report_type, description, category="Other", reporter="Anonymous", anonymous=False,
+                   location="", status="submitted", coordinates=None, department=None):
+        """Store a report and queue it for the oversight body ``department`` (routed from its text if None)."""
+        report = {
+            "id": new_id("report"),
+            "report_type": report_type,
+            "category": category,
+            "description": description,
+            "reporter": "Anonymous" if anonymous else reporter,
+            "anonymous": int(bool(anonymous)),
+            "status": status,
+            "location": location,
+            "created_at": time.time(),
+            "first_response_at": None,
+            **_geo_fields(coordinates),
+        }
+        with self.transaction() as conn:
+            conn.execute(INSERT_REPORT, report)
+            aggregates.record_opened(conn, "report", category, report["created_at"])
+            lifecycle.record_opened(conn, "report", report, report["reporter"])
+            self._index_report(conn, report)
+            report["department"] = review_queue.enqueue(conn, report, department)
+            if report["reporter"] != "Anonymous":
+                # A named reporter hears about every status change on their report
+                conn.execute(
+                    "INSERT OR IGNORE INTO notification_subscriptions (topic, user_name, created_at) VALUES (?, ?, ?)",
+                    (notifications.topic("report", report["id"]), report["reporter"], report["created_at"]),
+                )
+            self._publish(conn, REPORTS, ANALYTICS)
+        return report
+
+    def get_report(self, report_id):
+        with self.connection() as conn:
+            row = conn.execute("SELECT * FROM reports WHERE id = ?", (report_id,)).fetchone()
+        return dict(row) if row else None
+
+    def set_report_status(self, report_id, status, actor=None):
+        return self.apply_transitions([("report", report_id, status, actor)])[0]
+
+    def list_reports(self, category=None, status=None, limit=20):
+        return self._list("reports", category, status, limit)
+
+    def report_feed(self, cursor=None, limit=10, category=None, status=None):
+        return self._feed("reports", FEED_ORDERS["recent"], cursor, limit, category, status)
+
+    def search_reports(self, query="", category=None, status=None, location=None, limit=10, offset=0):
+        with self.connection() as conn:
+            return search.search(conn, "report", query, category, status, location, limit, offset)
+
+    def search_facets(self, kind, field, query="", category=None, status=None, location=None):
+        """({value: count}, complete) for facet ``field`` ('category' or 'status') under the other filters."""
+        with self.connection() as conn:
+            return search.facet_counts(conn, kind, field, query, category, status, location)
+
+    def count_reports(self, category=None, status=None):
+        return self._count("reports", category, status)
+
+    # --- Citizens (civic graph) ---
+    def join_citizen(self, name):
+        """Register ``name`` as a citizen (idempotent); returns the citizen node."""
+        with self.transaction() as conn:
+            if civic_graph.join(conn, name):
+                aggregates.record_joined(conn)
+                self._publish(conn, ANALYTICS)
+            return civic_graph.get_citizen(conn, name)
+
+    def get_citizen(self, name):
+        with self.connection() as conn:
+            return civic_graph.get_citizen(conn, name)
+
+    def petitions_by(self, name, limit=20):
+        with self.connection() as conn:
+            return civic_graph.neighbours(conn, "petitions", name, civic_graph.CREATED_PETITION, limit)
+
+    def reports_by(self, name, limit=20):
+        with self.connection() as conn:
+            return civic_graph.neighbours(conn, "reports", name, civic_graph.FILED_REPORT, limit)
+
+    def platform_summary(self):
+        """Totals of the platform node, read from the running counters."""
+        with self.connection() as conn:
+            counters = {row["name"]: row["value"] for row in conn.execute(
+                "SELECT name, value FROM metric_counters WHERE name IN "
+                "('citizen_joined', 'petition_opened', 'report_opened')"
+            )}
+        return {
+            "active_users": int(counters.get("citizen_joined", 0)),
+            "total_petitions": int(counters.get("petition_opened", 0)),
+            "total_reports": int(counters.get("report_opened", 0)),
+        }
+
+    # --- Evidence ---
+    def link_evidence(self, petition_id, sha256, filename, content_type, size, actor=None):
+        with self.transaction() as conn:
+            already_verified = conn.execute(
+                "SELECT 1 FROM evidence WHERE petition_id = ? LIMIT 1", (petition_id,)
+            ).fetchone()
+            linked = conn.execute(
+                "INSERT OR IGNORE INTO evidence (petition_id, sha256, filename, content_type, size, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (petition_id, sha256, filename, content_type, size, time.time()),
+            ).rowcount
+            # Feed cards show the first photo or video as their cover
+            self._publish(conn, PETITIONS)
+            if linked:
+                self._event("petition", petition_id, "evidence", actor=actor)
+            if not already_verified:
+                aggregates.record_verified(conn, "petition")
+                self._publish(conn, ANALYTICS)
+
+    def list_evidence(self, petition_id):
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM evidence WHERE petition_id = ? ORDER BY created_at", (petition_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def evidence_covers(self, petition_ids):
+        """{petition_id: (sha256, content_type)} of each petition's first photo, else its first video."""
+        if not petition_ids:
+            return {}
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"SELECT petition_id, sha256, content_type FROM evidence "
+                f"WHERE petition_id IN ({', '.join('?' * len(petition_ids))}) "
+                "AND (content_type LIKE 'image/%' OR content_type LIKE 'video/%') "
+                "ORDER BY content_type LIKE 'image/%' DESC, created_at",
+                list(petition_ids),
+            ).fetchall()
+        covers = {}
+        for row in rows:
+            covers.setdefault(row["petition_id"], (row["sha256"], row["content_type"]))
+        return covers
+
+    # --- Notifications ---
+    def add_notification(self, user_name, message):
+        self.add_notifications([(user_name, message, time.time())])
+
+    def add_notifications(self, notifications, keep=None):
+        """Insert (user_name, message, created_at) rows; with ``keep``, each inbox is trimmed to its newest rows."""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO notifications (user_name, message, created_at) VALUES (?, ?, ?)", notifications
+            )
+            for user_name in {row[0] for row in notifications}:
+                self._publish(conn, INBOX, key=user_name)
+            if keep:
+                conn.executemany(
+                    "DELETE FROM notifications WHERE user_name = ? AND id NOT IN "
+                    "(SELECT id FROM notifications WHERE user_name = ? ORDER BY created_at DESC, id DESC LIMIT ?)",
+                    [(user_name, user_name, keep) for user_name in {row[0] for row in notifications}],
+                )
+
+    def mark_notifications_read(self, user_name):
+        with self.transaction() as conn:
+            if conn.execute(
+                "UPDATE notifications SET is_read = 1 WHERE user_name = ? AND is_read = 0", (user_name,)
+            ).rowcount:
+                self._publish(conn, INBOX, key=user_name)
+
+    def list_notifications(self, user_name, limit=20):
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM notifications WHERE user_name = ? ORDER BY created_at DESC LIMIT ?",
+                (user_name, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_notification_preferences(self, user_name):
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT general, interaction FROM notification_preferences WHERE user_name = ?", (user_name,)
+            ).fetchone()
+        return {"general": bool(row["general"]), "interaction": bool(row["interaction"])} if row else \
+            {"general": True, "interaction": True}
+
+    def set_notification_preferences(self, user_name, general, interaction):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO notification_preferences (user_name, general, interaction) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_name) DO UPDATE SET general = excluded.general, interaction = excluded.interaction",
+                (user_name, int(bool(general)), int(bool(interaction))),
+            )
+            self._publish(conn, PREFERENCES, key=user_name)
+
+    def subscribe(self, topic, user_name):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO notification_subscriptions (topic, user_name, created_at) VALUES (?, ?, ?)",
+                (topic, user_name, time.time()),
+            )
+
+    def subscribers(self, topic):
+        with self.connection() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT user_name FROM notification_subscriptions WHERE topic = ?", (topic,)
+            )]
+
+    # --- Drafts ---
+    def save_draft(self, draft_id, title, description, category, updated_at):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO petition_drafts (id, title, description, category, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title = excluded.title, description = excluded.description, "
+                "category = excluded.category, updated_at = excluded.updated_at",
+                (draft_id, title, description, category, updated_at),
+            )
+            self._publish(conn, DRAFTS, key=draft_id)
+
+    def get_draft(self, draft_id):
+        with self.connection() as conn:
+            row = conn.execute("SELECT * FROM petition_drafts WHERE id = ?", (draft_id,)).fetchone()
+        return dict(row) if row else None
+
+    def delete_draft(self, draft_id):
+        with self.transaction() as conn:
+            if conn.execute("DELETE FROM petition_drafts WHERE id = ?", (draft_id,)).rowcount:
+                self._publish(conn, DRAFTS, key=draft_id)
+
+    def delete_drafts_before(self, cutoff):
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM petition_drafts WHERE updated_at < ?", (cutoff,)).rowcount
+
+    # --- Spatial ---
+    def petitions_in_bbox(self, bbox, limit=500):
+        return self._in_bbox("petitions", bbox, limit)
+
+    def reports_in_bbox(self, bbox, limit=500):
+        return self._in_bbox("reports", bbox, limit)
+
+    def heatmap_tiles(self, precision=5, bbox=None, limit=2000):
+        with self.connection() as conn:
+            return geo.tiles(conn, precision, bbox, limit)
+
+    def _in_bbox(self, table, bbox, limit):
+        min_lat, min_lon, max_lat, max_lon = bbox
+        results = []
+        with self.connection() as conn:
+            for start, end in geo.cover_ranges(bbox):
+                rows = conn.execute(
+                    f"SELECT * FROM {table} WHERE geohash >= ? AND geohash < ? "
+                    "AND lat BETWEEN ? AND ? AND lon BETWEEN ? AND ? LIMIT ?",
+                    (start, end, min_lat, max_lat, min_lon, max_lon, limit - len(results)),
+                ).fetchall()
+                results.extend(dict(row) for row in rows)
+                if len(results) >= limit:
+                    break
+        return results
+
+    # --- Lifecycle ---
+    def apply_transitions(self, transitions):
+        """Apply a batch of (kind, record_id, status, actor) transitions in one transaction.
+
+        Each one is appended to the lifecycle log; returns a list of booleans,
+        False where the record is missing or already had that status.
+        """
+        for kind, _, status, _ in transitions:
+            lifecycle.check_status(kind, status)
+        now = time.time()
+        with self.transaction() as conn:
+            changed = [self._set_status(conn, kind, record_id, status, actor, now)
+                       for kind, record_id, status, actor in transitions]
+            for kind in {kind for (kind, *_), done in zip(transitions, changed) if done}:
+                self._publish(conn, PETITIONS if kind == "petition" else REPORTS, ANALYTICS)
+        return changed
+
+    def lifecycle_history(self, record_id):
+        with self.connection() as conn:
+            return lifecycle.history(conn, record_id)
+
+    def lifecycle_state(self, record_id=None):
+        """{record_id: state} rebuilt from the latest snapshot and the events logged after it."""
+        with self.connection() as conn:
+            return lifecycle.replay(conn, record_id)
+
+    def snapshot_lifecycle(self, min_events=0):
+        """Snapshot the replayed state once ``min_events`` events were logged since the last one.
+
+        Returns the number of records captured, or None when no snapshot was due.
+        """
+        with self.transaction() as conn:
+            pending = lifecycle.events_since_snapshot(conn)
+            if not pending or pending < min_events:
+                return None
+            return lifecycle.take_snapshot(conn)
+
+    def response_percentiles(self, metric=lifecycle.RESPONSE, quantiles=(0.5, 0.9, 0.99), kind=None, category=None):
+        with self.connection() as conn:
+            return lifecycle.percentiles(conn, metric, quantiles, kind, category)
+
+    def response_percentiles_by_category(self, metric=lifecycle.RESPONSE, quantile=0.5):
+        with self.connection() as conn:
+            return lifecycle.percentiles_by_category(conn, metric, quantile)
+
+    # --- Oversight review ---
+    def join_review_team(self, body, reviewer):
+        with self.transaction() as conn:
+            review_queue.join(conn, body, reviewer)
+
+    def next_review(self, body, reviewer, lease_seconds=review_queue.LEASE_SECONDS):
+        """Lease the next report for ``reviewer`` in ``body``; None when the queue is empty.
+
+        The report is marked acknowledged on its first lease. Unless it is
+        acked (see complete_review) before the lease ends, it is handed out again.
+        """
+        review_queue.check_body(body)
+        now = time.time()
+        with self.transaction() as conn:
+            leased = review_queue.lease(conn, body, reviewer, lease_seconds, now)
+            if leased is None:
+                return None
+            if self._set_status(conn, "report", leased["report_id"], "acknowledged", reviewer, now):
+                self._publish(conn, REPORTS, ANALYTICS)
+            report = dict(conn.execute("SELECT * FROM reports WHERE id = ?", (leased["report_id"],)).fetchone())
+        report["lease"] = leased
+        return report
+
+    def complete_review(self, report_id, reviewer, status="in_progress"):
+        """Ack a leased report and move it on to ``status``; False when the lease was lost."""
+        lifecycle.check_status("report", status)
+        if status in review_queue.WAITING_STATUSES:
+            raise ValueError(f"A reviewed report must move past {', '.join(review_queue.WAITING_STATUSES)}")
+        now = time.time()
+        with self.transaction() as conn:
+            if not review_queue.ack(conn, report_id, reviewer, now):
+                return False
+            self._set_status(conn, "report", report_id, status, reviewer, now)
+            self._publish(conn, REPORTS, ANALYTICS)
+        return True
+
+    def release_review(self, report_id, reviewer):
+        with self.transaction() as conn:
+            return review_queue.release(conn, report_id, reviewer)
+
+    def extend_review(self, report_id, reviewer, lease_seconds=review_queue.LEASE_SECONDS):
+        with self.transaction() as conn:
+            return review_queue.extend(conn, report_id, reviewer, lease_seconds)
+
+    def review_backlog(self):
+        with self.connection() as conn:
+            return review_queue.backlog(conn)
+
+    # --- Analytics ---
+    def analytics_snapshot(self):
+        with self.connection() as conn:
+            return aggregates.snapshot(conn)
+
+    def _run_backfills(self):
+        """Fill derived tables from rows written before they existed, once per store.
+
+        Each backfill scans whole tables under the write lock, so it is recorded
+        in store_backfills and later opens (on any replica) only read that table.
+        """
+        with self.connection() as conn:
+            applied = {row[0] for row in conn.execute("SELECT name FROM store_backfills")}
+        for name in BACKFILLS:
+            if name in applied:
+                continue
+            with self.transaction() as conn:
+                # Another replica may have run it while this one waited for the write lock
+                if conn.execute("SELECT 1 FROM store_backfills WHERE name = ?", (name,)).fetchone():
+                    continue
+                getattr(self, f"_backfill_{name}")(conn)
+                conn.execute("INSERT INTO store_backfills (name, applied_at) VALUES (?, ?)", (name, time.time()))
+
+    @staticmethod
+    def _backfill_graph(conn):
+        if conn.execute("SELECT 1 FROM citizens LIMIT 1").fetchone():
+            return
+        civic_graph.rebuild(conn)
+        joined = conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0]
+        if joined and conn.execute("SELECT 1 FROM metric_counters LIMIT 1").fetchone():
+            aggregates.record_joined(conn, joined)
+
+    @staticmethod
+    def _backfill_dedup(conn):
+        dedup.rebuild(conn)
+
+    @staticmethod
+    def _backfill_search(conn):
+        search.rebuild(conn)
+
+    @staticmethod
+    def _backfill_aggregates(conn):
+        has_counters = conn.execute("SELECT 1 FROM metric_counters LIMIT 1").fetchone()
+        has_rows = conn.execute("SELECT 1 FROM petitions UNION ALL SELECT 1 FROM reports LIMIT 1").fetchone()
+        if has_rows and not has_counters:
+            aggregates.rebuild(conn)
+
+    @staticmethod
+    def _backfill_lifecycle(conn):
+        lifecycle.rebuild(conn)
+
+    @staticmethod
+    def _backfill_review_queue(conn):
+        review_queue.rebuild(conn)
+
+    # --- Bulk import/export ---
+    def import_records(self, kind, records):
+        """Insert a batch of validated records (see bulk_io) in one transaction; returns (inserted, skipped).
+
+        Records whose ID already exists are skipped, so re-running an import is harmless.
+        """
+        if kind == "petition":
+            insert, index = _insert_sql("petitions", PETITION_COLUMNS, "INSERT OR IGNORE"), self._index_petition
+        else:
+            insert, index = _insert_sql("reports", REPORT_COLUMNS, "INSERT OR IGNORE"), self._index_report
+        inserted = 0
+        with self.transaction() as conn:
+            for record in records:
+                record.setdefault("id", new_id(kind))
+                record.update(_geo_fields(record.pop("coordinates", None)))
+                if not conn.execute(insert, record).rowcount:
+                    continue
+                aggregates.record_existing(conn, kind, record)
+                lifecycle.record_existing(conn, kind, record)
+                index(conn, record)
+                if kind == "report":
+                    review_queue.enqueue(conn, record)
+                inserted += 1
+            if inserted:
+                self._publish(conn, PETITIONS if kind == "petition" else REPORTS, ANALYTICS)
+        return inserted, len(records) - inserted
+
+    def export_rows(self, kind, columns, after_id=None, limit=5000):
+        """One page of ``columns`` from petitions/reports in ID order, continuing after ``after_id``."""
+        table = "petitions" if kind == "petition" else "reports"
+        with self.connection() as conn:
+            return conn.execute(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (after_id or "", limit)
+            ).fetchall()
+
+    # --- Helpers ---
+    def _index_petition(self, conn, petition):
+        self._link_citizen(conn, petition["creator"], civic_graph.CREATED_PETITION, petition["id"],
+                           petition["created_at"])
+        dedup.record(conn, petition["id"], petition["title"], petition["description"])
+        search.index(conn, "petition", petition)
+        if petition["geohash"]:
+            geo.record_point(conn, petition["geohash"])
+
+    def _index_report(self, conn, report):
+        search.index(conn, "report", report)
+        if not report["anonymous"]:
+            # Anonymous reports never get an edge back to the citizen who filed them
+            self._link_citizen(conn, report["reporter"], civic_graph.FILED_REPORT, report["id"], report["created_at"])
+        if report["geohash"]:
+            geo.record_point(conn, report["geohash"])
+
+    @staticmethod
+    def _link_citizen(conn, name, label, target, created_at):
+        if not name or name == "Anonymous":
+            return
+        if civic_graph.join(conn, name, created_at):
+            aggregates.record_joined(conn)
+        civic_graph.connect(conn, name, label, target, created_at)
+
+    @staticmethod
+    def _filters(category, status):
+        clauses, params = [], []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _list(self, table, category, status, limit):
+        where, params = self._filters(category, status)
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM {table}{where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _set_status(self, conn, kind, record_id, status, actor, now):
+        table = "petitions" if kind == "petition" else "reports"
+        row = conn.execute(
+            f"SELECT id, category, status, created_at, first_response_at FROM {table} WHERE id = ?", (record_id,)
+        ).fetchone()
+        if row is None or row["status"] == status:
+            return False
+        first_response = row["first_response_at"] is None
+        conn.execute(
+            f"UPDATE {table} SET status = ?, first_response_at = COALESCE(first_response_at, ?) WHERE id = ?",
+            (status, now, record_id),
+        )
+        aggregates.record_status_change(
+            conn, kind, row["category"], row["created_at"], row["status"], status, first_response, now
+        )
+        lifecycle.record_transition(conn, kind, row, row["status"], status, first_response, now, actor)
+        if kind == "report":
+            review_queue.status_changed(conn, record_id, status)
+        self._event(kind, record_id, "status", detail=status.replace("_", " "), actor=actor)
+        return True
+
+    def _feed(self, table, keys, cursor, limit, category=None, status=None):
+        columns = ", ".join(keys)
+        where, params = self._filters(category, status)
+        if cursor:
+            where += " AND " if where else " WHERE "
+            where += f"({columns}) < ({', '.join('?' * len(keys))})"
+            params = [*params, *cursor]
+        order_by = ", ".join(f"{key} DESC" for key in keys)
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM {table}{where} ORDER BY {order_by} LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = tuple(items[-1][key] for key in keys) if len(rows) > limit else None
+        return items, next_cursor
+
+    def _count(self, table, category, status):
+        where, params = self._filters(category, status)
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+
+    def close(self):
+        self.pool.close()
+
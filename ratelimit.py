@@ -0,0 +1,133 @@
+# MAU2 Democracy Platform - Submission Rate Limiting & Admission Control
+# Every submission needs a token from the citizen's bucket and from their IP's
+# bucket (a whole office behind one NAT shares the IP bucket, so it is larger).
+# Independently of who is asking, new work is refused while the submission queue
+# is deeper than max_depth: a quick "try again" beats a queue whose latency
+# keeps climbing for everyone.
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Sustained submissions per minute and burst size
+CITIZEN_RATE = (3, 5)
+IP_RATE = (20, 30)
+MAX_QUEUE_DEPTH = int(os.environ.get("MAU2_MAX_QUEUE_DEPTH", "32"))
+# Set only when the app is reachable solely through a proxy that appends X-Forwarded-For;
+# otherwise any client could pick its own IP bucket with that header
+TRUST_PROXY = os.environ.get("MAU2_TRUST_PROXY", "").lower() in ("1", "true", "yes")
+MAX_TRACKED_KEYS = 100000
+
+RATE_LIMITED = "rate_limited"
+OVERLOADED = "overloaded"
+
+
+class SubmissionRejected(Exception):
+    """Raised instead of queueing a submission; ``retry_after`` is in seconds."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"{reason}; retry in {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def friendly_message(self):
+        seconds = max(1, math.ceil(self.retry_after))
+        if self.reason == OVERLOADED:
+            return f"MAU2 is handling a lot of submissions right now. Please try again in {seconds} seconds."
+        return f"You're submitting faster than we can accept. Please try again in {seconds} seconds."
+
+
+# === TOKEN BUCKETS ===
+class RateLimiter:
+    """One token bucket per key, refilled continuously at ``per_minute`` up to ``burst``.
+
+    Buckets are kept in LRU order; the oldest are dropped past ``max_keys``
+    (an evicted key simply starts again with a full bucket).
+    """
+
+    def __init__(self, per_minute, burst, max_keys=MAX_TRACKED_KEYS, clock=time.monotonic):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refill_locked(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def acquire(self, key, cost=1.0):
+        """Take ``cost`` tokens; returns 0.0 on success, else the seconds until they are available."""
+        with self._lock:
+            bucket = self._refill_locked(key, self.clock())
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def refund(self, key, cost=1.0):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + cost)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# === ADMISSION CONTROL ===
+class AdmissionController:
+    """Decides whether a submission may enter the queue.
+
+    ``depth`` is a callable returning the current queue depth (e.g.
+    SubmissionQueue.depth). ``admit`` raises SubmissionRejected or returns None.
+    """
+
+    def __init__(self, depth, max_depth=MAX_QUEUE_DEPTH, citizen_rate=CITIZEN_RATE, ip_rate=IP_RATE):
+        self.depth = depth
+        self.max_depth = max_depth
+        self.citizens = RateLimiter(*citizen_rate)
+        self.ips = RateLimiter(*ip_rate)
+        self.admitted = 0
+        self.rejected = {RATE_LIMITED: 0, OVERLOADED: 0}
+        self._lock = threading.Lock()
+
+    def overloaded(self):
+        return self.depth() >= self.max_depth
+
+    def admit(self, citizen, ip=None):
+        # Shed before touching the buckets, so a busy spell does not cost citizens their tokens
+        if self.overloaded():
+            self._count(OVERLOADED)
+            # Roughly how long the workers need to drain back under the threshold
+            raise SubmissionRejected(OVERLOADED, 5.0)
+        wait = self.citizens.acquire(citizen)
+        if not wait and ip:
+            wait = self.ips.acquire(ip)
+            if wait:
+                self.citizens.refund(citizen)
+        if wait:
+            self._count(RATE_LIMITED)
+            raise SubmissionRejected(RATE_LIMITED, wait)
+        with self._lock:
+            self.admitted += 1
+
+    def stats(self):
+        with self._lock:
+            return {"admitted": self.admitted, "rejected": dict(self.rejected), "queue_depth": self.depth(),
+                    "tracked_citizens": len(self.citizens), "tracked_ips": len(self.ips)}
+
+    def _count(self, reason):
+        with self._lock:
+            self.rejected[reason] += 1
@@ -0,0 +1,168 @@
+# MAU2 Democracy Platform - Cross-Replica Change Feed
+# Several app processes can share one SQLite store (same host or volume). Every
+# write transaction also appends the topics it touched to change_log; each
+# process follows that table and drops whatever it cached for those topics, so
+# a petition created on one replica shows up in the feeds and analytics of all
+# the others. The writing process dispatches its own changes right after commit.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("mau2")
+
+# Topics published by PlatformStore; ``key`` narrows a topic to one citizen/draft
+PETITIONS = "petitions"
+REPORTS = "reports"
+ANALYTICS = "analytics"
+INBOX = "inbox"
+PREFERENCES = "preferences"
+DRAFTS = "drafts"
+
+POLL_INTERVAL = 0.25
+# change_log rows older than this are pruned; a replica that falls further behind resets its caches
+RETENTION = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    key TEXT,
+    origin TEXT NOT NULL,
+    at REAL NOT NULL
+);
+"""
+
+
+def publish(conn, origin, topic, key=None):
+    """Record a change inside the writer's transaction."""
+    conn.execute("INSERT INTO change_log (topic, key, origin, at) VALUES (?, ?, ?, ?)",
+                 (topic, key, origin, time.time()))
+
+
+# === CHANGE FEED ===
+class ChangeFeed:
+    """Follows change_log and hands every new change to the registered listeners.
+
+    Listeners are called as ``listener(topic, key, local)``; ``local`` is True
+    for changes this process wrote itself. ``topic`` is None when the feed fell
+    behind the retained log and every cache should be dropped.
+    """
+
+    def __init__(self, store, poll_interval=POLL_INTERVAL, retention=RETENTION):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.dispatched = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        with store.connection() as conn:
+            self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+        # The writing process catches up right after each commit, without waiting for the poller
+        store.on_commit(self.poll)
+
+    def listen(self, listener):
+        self._listeners.append(listener)
+
+    def poll(self):
+        """Dispatch every change committed since the last poll; returns how many there were."""
+        with self._lock:
+            with self.store.connection() as conn:
+                rows = conn.execute(
+                    "SELECT seq, topic, key, origin FROM change_log WHERE seq > ? ORDER BY seq", (self._last_seq,)
+                ).fetchall()
+                oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+            changes = [(row["topic"], row["key"], row["origin"] == self.store.replica_id) for row in rows]
+            if self._last_seq and oldest is not None and oldest > self._last_seq + 1:
+                # Rows this replica never saw were pruned
+                changes = [(None, None, False)]
+            if rows:
+                self._last_seq = rows[-1]["seq"]
+            for change in changes:
+                for listener in self._listeners:
+                    try:
+                        listener(*change)
+                    except Exception:
+                        logger.exception("change listener failed")
+            self.dispatched += len(changes)
+            return len(changes)
+
+    def prune(self):
+        with self.store.transaction() as conn:
+            return conn.execute("DELETE FROM change_log WHERE at < ?", (time.time() - self.retention,)).rowcount
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mau2-change-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        last_prune = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+                if time.monotonic() - last_prune > self.retention / 10:
+                    self.prune()
+                    last_prune = time.monotonic()
+            except Exception:
+                logger.exception("change feed poll failed")
+
+
+# === READ CACHE ===
+class ReadCache:
+    """Process-wide LRU cache of store reads, dropped topic by topic as the change feed reports writes.
+
+    Each read first catches the feed up (one indexed lookup on change_log),
+    so a write committed on any replica is visible to the next read here.
+    Cached values are shared between sessions and must not be mutated.
+    """
+
+    def __init__(self, feed, maxsize=512):
+        self.feed = feed
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        feed.listen(self.invalidate)
+
+    def get(self, topic, args, load):
+        self.feed.poll()
+        key = (topic, args)
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(topic, 0))
+        value = load()
+        with self._lock:
+            # Only keep the value if no write to the topic landed while it was loading
+            if (self._epoch, self._generations.get(topic, 0)) == generation:
+                self._items[key] = value
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+        return value
+
+    def invalidate(self, topic, key=None, local=False):
+        with self._lock:
+            if topic is None:
+                self._epoch += 1
+                self._items.clear()
+                return
+            self._generations[topic] = self._generations.get(topic, 0) + 1
+            for cached in [cached for cached in self._items if cached[0] == topic]:
+                del self._items[cached]
@@ -0,0 +1,110 @@
+# MAU2 Democracy Platform - Shared Resources
+# Process-wide services, created once and shared by every Streamlit session
+
+import logging
+
+import streamlit as st
+
+import instrumentation
+
+from categorizer import CategorizationService, load_default_model
+from evidence_store import EvidenceStore
+from geo import Gazetteer
+from lifecycle import LifecycleLog
+from media import MediaWorker
+from notifications import NotificationHub
+from platform_store import PlatformStore
+from ratelimit import AdmissionController
+from replication import ChangeFeed, ReadCache
+from sessions import DraftStore, SessionRegistry
+from submissions import SubmissionQueue
+from votes import VoteCounter
+
+logger = logging.getLogger("mau2")
+
+
+@st.cache_resource
+def get_platform_store():
+    return PlatformStore()
+
+
+@st.cache_resource
+def get_change_feed():
+    return ChangeFeed(get_platform_store()).start()
+
+
+@st.cache_resource
+def get_read_cache():
+    return ReadCache(get_change_feed())
+
+
+@st.cache_resource
+def get_evidence_store():
+    return EvidenceStore(get_platform_store())
+
+
+@st.cache_resource
+def get_media_worker():
+    return MediaWorker(get_evidence_store())
+
+
+@st.cache_resource
+def get_submission_queue():
+    return SubmissionQueue(get_platform_store(), evidence_store=get_evidence_store(), gazetteer=get_gazetteer(),
+                           categorizer=get_categorizer(), notifications=get_notification_hub(),
+                           media=get_media_worker())
+
+
+@st.cache_resource
+def get_admission_controller():
+    return AdmissionController(get_submission_queue().depth)
+
+
+@st.cache_resource
+def get_vote_counter():
+    return VoteCounter(get_platform_store(), on_flush=get_notification_hub().votes_received).start()
+
+
+@st.cache_resource
+def get_lifecycle_log():
+    return LifecycleLog(get_platform_store()).start()
+
+
+@st.cache_resource
+def get_gazetteer():
+    return Gazetteer()
+
+
+@st.cache_resource
+def get_categorizer():
+    return CategorizationService(model=load_default_model())
+
+
+@st.cache_resource
+def get_session_registry():
+    drafts = DraftStore(store=get_platform_store())
+    get_change_feed().listen(drafts.invalidate)
+    return SessionRegistry(drafts)
+
+
+@st.cache_resource
+def get_notification_hub():
+    store = get_platform_store()
+    hub = NotificationHub(store).start()
+    store.on_event(hub.publish)
+    get_change_feed().listen(hub.invalidate)
+    return hub
+
+
+@st.cache_resource
+def start_instrumentation():
+    """Install render instrumentation and the /metrics endpoint once per process (MAU2_INSTRUMENT=1 only)."""
+    if not instrumentation.ENABLED:
+        return None
+    instrumentation.install()
+    try:
+        return instrumentation.start_metrics_server()
+    except OSError as exc:
+        # Another worker on this host already serves the port; the admin page still works
+        logger.warning("metrics endpoint not started on port %s: %s", instrumentation.METRICS_PORT, exc)
+        return None
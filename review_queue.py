@@ -0,0 +1,220 @@
+# MAU2 Democracy Platform - Oversight Review Queue
+# Every stored report is routed to Police, Legal or an NGO and queued there by
+# urgency. Reviewers lease the next report (it is redelivered if they do not
+# ack before the lease runs out) and each reviewer works through their own
+# assignments first, then steals the most urgent report left in their body's
+# queue. Both lookups are a seek on a (body, [assignee,] priority, seq) index,
+# so fetching the next report stays O(log n) however long the backlog grows.
+
+import time
+
+from categorizer import DEPARTMENTS, KeywordClassifier, normalize
+
+LEASE_SECONDS = 300.0
+
+URGENT = 3
+HIGH = 2
+NORMAL = 1
+URGENT_TERMS = frozenset(
+    "weapon weapons gun knife fire injured injury bleeding assault violence violent emergency danger "
+    "collapse collapsed gas missing abuse overdose".split()
+)
+# Reports still in these states are waiting for a reviewer; later ones were already acted on
+WAITING_STATUSES = ("submitted", "acknowledged")
+# Reports whose text matches no department keyword go by category
+CATEGORY_BODIES = {"Public Safety": "Police", "Transportation": "Police"}
+DEFAULT_BODY = "NGO"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_queue (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL UNIQUE,
+    body TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    assignee TEXT,
+    lease_owner TEXT,
+    available_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_review_queue_next ON review_queue (body, priority DESC, seq);
+CREATE INDEX IF NOT EXISTS idx_review_queue_assignee ON review_queue (body, assignee, priority DESC, seq);
+
+CREATE TABLE IF NOT EXISTS reviewers (
+    body TEXT NOT NULL,
+    name TEXT NOT NULL,
+    joined_at REAL NOT NULL,
+    assigned INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (body, name)
+);
+"""
+
+_classifier = KeywordClassifier()
+
+
+# === ROUTING ===
+def route(report):
+    """The oversight body (one of DEPARTMENTS) that should review ``report``.
+
+    New reports are routed by CategorizationService.classify_report before
+    they are stored; this offline fallback covers imports and backfills.
+    """
+    text = f"{report['report_type']}\n{report['description']}"
+    scores = _classifier.scores(text, DEPARTMENTS)
+    best = max(DEPARTMENTS, key=lambda body: scores[body])
+    if scores[best] > 0:
+        return best
+    return CATEGORY_BODIES.get(report["category"], DEFAULT_BODY)
+
+
+def urgency(report):
+    words = set(normalize(f"{report['report_type']} {report['description']}").split())
+    if words & URGENT_TERMS:
+        return URGENT
+    if report["category"] == "Public Safety":
+        return HIGH
+    return NORMAL
+
+
+def check_body(body):
+    if body not in DEPARTMENTS:
+        raise ValueError(f"Unknown oversight body {body!r}; expected one of: {', '.join(DEPARTMENTS)}")
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def _assign(conn, body, reviewer, change):
+    if reviewer is not None:
+        conn.execute("UPDATE reviewers SET assigned = assigned + ? WHERE body = ? AND name = ?",
+                     (change, body, reviewer))
+
+
+def _remove(conn, row):
+    conn.execute("DELETE FROM review_queue WHERE seq = ?", (row["seq"],))
+    _assign(conn, row["body"], row["assignee"], -1)
+
+
+def enqueue(conn, report, body=None):
+    """Queue a report waiting for review; the least-loaded reviewer of its body gets it first."""
+    if report["status"] not in WAITING_STATUSES:
+        return None
+    body = body or route(report)
+    assignee = conn.execute(
+        "SELECT name FROM reviewers WHERE body = ? ORDER BY assigned, joined_at LIMIT 1", (body,)
+    ).fetchone()
+    assignee = assignee[0] if assignee else None
+    if conn.execute(
+        "INSERT OR IGNORE INTO review_queue (report_id, body, priority, assignee, available_at, enqueued_at) "
+        "VALUES (?, ?, ?, ?, 0, ?)",
+        (report["id"], body, urgency(report), assignee, report["created_at"]),
+    ).rowcount:
+        _assign(conn, body, assignee, 1)
+    return body
+
+
+def status_changed(conn, report_id, status):
+    """Reports leave the queue once someone acts on them, however that happened."""
+    if status not in WAITING_STATUSES:
+        row = conn.execute("SELECT seq, body, assignee FROM review_queue WHERE report_id = ?", (report_id,)).fetchone()
+        if row is not None:
+            _remove(conn, row)
+
+
+def join(conn, body, reviewer, now=None):
+    check_body(body)
+    conn.execute("INSERT OR IGNORE INTO reviewers (body, name, joined_at) VALUES (?, ?, ?)",
+                 (body, reviewer, now or time.time()))
+
+
+def lease(conn, body, reviewer, lease_seconds=LEASE_SECONDS, now=None):
+    """Lease the next report for ``reviewer``: their own most urgent one, else the body's.
+
+    Returns the queue row (with ``stolen`` set when it came from someone
+    else's assignments) or None when nothing is available.
+    """
+    now = now or time.time()
+    row = conn.execute(
+        "SELECT * FROM review_queue WHERE body = ? AND assignee = ? AND available_at <= ? "
+        "ORDER BY priority DESC, seq LIMIT 1",
+        (body, reviewer, now),
+    ).fetchone()
+    if row is None:
+        row = conn.execute(
+            "SELECT * FROM review_queue WHERE body = ? AND available_at <= ? ORDER BY priority DESC, seq LIMIT 1",
+            (body, now),
+        ).fetchone()
+    if row is None:
+        return None
+    conn.execute(
+        "UPDATE review_queue SET assignee = ?, lease_owner = ?, available_at = ?, attempts = attempts + 1 "
+        "WHERE seq = ?",
+        (reviewer, reviewer, now + lease_seconds, row["seq"]),
+    )
+    if row["assignee"] != reviewer:
+        _assign(conn, body, row["assignee"], -1)
+        _assign(conn, body, reviewer, 1)
+    leased = dict(row)
+    leased["stolen"] = row["assignee"] is not None and row["assignee"] != reviewer
+    leased.update(assignee=reviewer, lease_owner=reviewer, available_at=now + lease_seconds,
+                  attempts=row["attempts"] + 1)
+    return leased
+
+
+def _held(conn, report_id, reviewer, now):
+    return conn.execute(
+        "SELECT seq, body, assignee FROM review_queue WHERE report_id = ? AND lease_owner = ? AND available_at > ?",
+        (report_id, reviewer, now),
+    ).fetchone()
+
+
+def ack(conn, report_id, reviewer, now=None):
+    """Take a leased report off the queue; False when the lease expired or belongs to someone else."""
+    held = _held(conn, report_id, reviewer, now or time.time())
+    if held is None:
+        return False
+    _remove(conn, held)
+    return True
+
+
+def release(conn, report_id, reviewer, now=None):
+    """Hand a leased report back so the next lease picks it up straight away."""
+    now = now or time.time()
+    held = _held(conn, report_id, reviewer, now)
+    if held is None:
+        return False
+    conn.execute("UPDATE review_queue SET lease_owner = NULL, available_at = ? WHERE seq = ?", (now, held["seq"]))
+    return True
+
+
+def extend(conn, report_id, reviewer, lease_seconds=LEASE_SECONDS, now=None):
+    now = now or time.time()
+    held = _held(conn, report_id, reviewer, now)
+    if held is None:
+        return False
+    conn.execute("UPDATE review_queue SET available_at = ? WHERE seq = ?", (now + lease_seconds, held["seq"]))
+    return True
+
+
+def backlog(conn, now=None):
+    """{body: {"queued", "leased", "urgent"}} across the whole queue."""
+    now = now or time.time()
+    counts = {body: {"queued": 0, "leased": 0, "urgent": 0} for body in DEPARTMENTS}
+    for row in conn.execute(
+        "SELECT body, SUM(available_at <= ?) AS queued, SUM(available_at > ?) AS leased, "
+        "SUM(priority >= ? AND available_at <= ?) AS urgent FROM review_queue GROUP BY body",
+        (now, now, URGENT, now),
+    ):
+        counts[row["body"]] = {"queued": row["queued"], "leased": row["leased"], "urgent": row["urgent"]}
+    return counts
+
+
+def rebuild(conn):
+    """Queue every open report that is not queued yet (stores that predate the queue)."""
+    rows = conn.execute(
+        "SELECT id, report_type, description, category, status, created_at FROM reports "
+        f"WHERE status IN ({', '.join('?' * len(WAITING_STATUSES))}) "
+        "AND id NOT IN (SELECT report_id FROM review_queue) ORDER BY created_at",
+        WAITING_STATUSES,
+    ).fetchall()
+    for row in rows:
+        enqueue(conn, row)
+    return len(rows)
@@ -0,0 +1,269 @@
+# MAU2 Democracy Platform - Full-Text Search
+# One SQLite FTS5 inverted index over petitions and reports, ranked with BM25.
+# Text and location are matched inside the index; kind, category and status are
+# checked against the base row of each candidate, so no filter ever has to load
+# a posting list that covers most of the table.
+# No stemmer: Porter rewrites query prefixes ("play" -> "plai") and breaks search-as-you-type.
+#
+# Ranking is done here rather than with FTS5's bm25(): that function counts every
+# match of every term before scoring the first row, which is linear in the size
+# of the table for common words. Document frequencies and column lengths are kept
+# up to date in side tables instead, and only the candidate window is scored.
+
+import math
+import re
+import unicodedata
+
+# BM25F column weights and parameters (title, body, location)
+COLUMNS = ("title", "body", "location")
+WEIGHTS = {"title": 10.0, "body": 1.0, "location": 2.0}
+K1, B = 1.2, 0.75
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Very common terms can match most of the table; only the newest RANK_WINDOW
+# matches are scored (exact whenever a query matches fewer records than that).
+# search() reports when the window cut matches off, so the page can say so.
+RANK_WINDOW = 500
+FACET_COUNT_CAP = 1000
+# Prefixes up to this length are served by the FTS5 prefix index; longer ones are
+# expanded into their most frequent completions, because FTS5 would otherwise merge
+# the full posting list of every completion before returning the first row
+PREFIX_INDEX_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 16
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    record_id UNINDEXED, title, body, location,
+    tokenize = "unicode61 remove_diacritics 2",
+    prefix = '1 2 3'
+);
+
+CREATE TABLE IF NOT EXISTS search_docs (
+    record_id TEXT PRIMARY KEY,
+    doc INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_terms (
+    term TEXT PRIMARY KEY,
+    docs INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+TABLES = {"petition": "petitions", "report": "reports"}
+
+
+def tokens(text):
+    text = (text or "").lower()
+    if not text.isascii():
+        # Same folding as the index's unicode61 tokenizer with remove_diacritics
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    return _TOKEN.findall(text)
+
+
+def _document(kind, record):
+    title = record["title"] if kind == "petition" else record["report_type"]
+    return title, record["description"], record.get("location") or ""
+
+
+def prefix_expansions(conn, prefix):
+    """Most frequent indexed terms starting with ``prefix``, or None to use the FTS5 prefix index."""
+    if len(prefix) <= PREFIX_INDEX_LENGTH:
+        return None
+    return [row[0] for row in conn.execute(
+        "SELECT term FROM search_terms WHERE term >= ? AND term < ? AND docs > 0 ORDER BY docs DESC LIMIT ?",
+        (prefix, prefix + "\uffff", MAX_PREFIX_EXPANSIONS),
+    )]
+
+
+def match_expression(query="", location=None, expansions=None):
+    """FTS5 MATCH string, or None when there is nothing to match.
+
+    User text is reduced to quoted tokens so it can never inject query syntax.
+    The last query word is a prefix, so results update while the citizen is still
+    typing it; ``expansions`` lists its completions (see prefix_expansions).
+    """
+    clauses = []
+    location_tokens = tokens(location)
+    if location_tokens:
+        clauses.append(f'location : "{" ".join(location_tokens)}"')
+    words = tokens(query)
+    for word in words[:-1]:
+        clauses.append(f'"{word}"')
+    if words:
+        if expansions is None:
+            clauses.append(f'"{words[-1]}"*')
+        else:
+            clauses.append("(" + " OR ".join(f'"{term}"' for term in expansions or [words[-1]]) + ")")
+    return " AND ".join(clauses) or None
+
+
+def _filters(category, status):
+    clauses, params = [], []
+    if category:
+        clauses.append("t.category = ?")
+        params.append(category)
+    if status:
+        clauses.append("t.status = ?")
+        params.append(status)
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+# === WRITE-SIDE UPDATES (called inside the store's transaction) ===
+def _account(conn, document, sign):
+    columns = {column: tokens(text) for column, text in zip(COLUMNS, document)}
+    stats = [("docs", sign)] + [(f"{column}_length", sign * len(words)) for column, words in columns.items()]
+    conn.executemany(
+        "INSERT INTO search_stats (name, value) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        stats,
+    )
+    conn.executemany(
+        "INSERT INTO search_terms (term, docs) VALUES (?, ?) "
+        "ON CONFLICT(term) DO UPDATE SET docs = docs + excluded.docs",
+        [(term, sign) for term in set().union(*columns.values())],
+    )
+
+
+def index(conn, kind, record):
+    document = _document(kind, record)
+    doc = conn.execute(
+        "INSERT INTO search_index (record_id, title, body, location) VALUES (?, ?, ?, ?)",
+        (record["id"], *document),
+    ).lastrowid
+    conn.execute("INSERT OR REPLACE INTO search_docs (record_id, doc) VALUES (?, ?)", (record["id"], doc))
+    _account(conn, document, 1)
+
+
+def remove(conn, record_id):
+    row = conn.execute(
+        "SELECT d.doc, s.title, s.body, s.location FROM search_docs d "
+        "JOIN search_index s ON s.rowid = d.doc WHERE d.record_id = ?",
+        (record_id,),
+    ).fetchone()
+    if row is not None:
+        _account(conn, (row["title"], row["body"], row["location"]), -1)
+        conn.execute("DELETE FROM search_index WHERE rowid = ?", (row["doc"],))
+        conn.execute("DELETE FROM search_docs WHERE record_id = ?", (record_id,))
+
+
+# === RANKING ===
+def _query_terms(query, location):
+    """[(term, is_prefix, columns)] matching how match_expression() builds the query."""
+    terms = [(word, False, ("location",)) for word in tokens(location)]
+    words = tokens(query)
+    terms += [(word, position == len(words) - 1, COLUMNS) for position, word in enumerate(words)]
+    return terms
+
+
+def _document_frequency(conn, term, is_prefix):
+    if not is_prefix:
+        row = conn.execute("SELECT docs FROM search_terms WHERE term = ?", (term,)).fetchone()
+        return row[0] if row else 0
+    # Completions of a prefix may share documents; their summed frequency is an upper bound
+    return conn.execute(
+        "SELECT COALESCE(SUM(docs), 0) FROM (SELECT docs FROM search_terms "
+        "WHERE term >= ? AND term < ? ORDER BY docs DESC LIMIT ?)",
+        (term, term + "\uffff", MAX_PREFIX_EXPANSIONS),
+    ).fetchone()[0]
+
+
+def _scorer(conn, query, location):
+    stats = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM search_stats")}
+    total = max(stats.get("docs", 0), 1)
+    average = {column: max(stats.get(f"{column}_length", 0) / total, 1.0) for column in COLUMNS}
+    terms = []
+    for term, is_prefix, columns in _query_terms(query, location):
+        frequency = min(_document_frequency(conn, term, is_prefix), total)
+        idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+        terms.append((term, is_prefix, columns, idf))
+
+    def score(document):
+        words = {column: tokens(text) for column, text in zip(COLUMNS, document)}
+        total_score = 0.0
+        for term, is_prefix, columns, idf in terms:
+            weighted_tf = 0.0
+            for column in columns:
+                column_words = words[column]
+                tf = sum(1 for word in column_words if (word.startswith(term) if is_prefix else word == term))
+                if tf:
+                    norm = 1 - B + B * len(column_words) / average[column]
+                    weighted_tf += WEIGHTS[column] * tf / norm
+            total_score += idf * weighted_tf * (K1 + 1) / (weighted_tf + K1)
+        return total_score
+
+    return score
+
+
+# === READ SIDE ===
+def _expression(conn, query, location):
+    words = tokens(query)
+    return match_expression(query, location, prefix_expansions(conn, words[-1]) if words else None)
+
+
+def search(conn, kind, query="", category=None, status=None, location=None, limit=10, offset=0):
+    """Best BM25 matches first; returns (records, next_offset or None, truncated).
+
+    ``truncated`` is True when more than RANK_WINDOW records matched and only
+    the newest of them were ranked.
+    """
+    expression = _expression(conn, query, location)
+    if expression is None:
+        return [], None, False
+    where, params = _filters(category, status)
+    # Postings are walked newest-first and stop after the window, so the cost of
+    # ranking is bounded no matter how many records match
+    rows = conn.execute(
+        "SELECT t.*, search_index.title AS fts_title, search_index.body AS fts_body, "
+        f"search_index.location AS fts_location FROM search_index "
+        f"JOIN {TABLES[kind]} t ON t.id = search_index.record_id "
+        f"WHERE search_index MATCH ?{where} ORDER BY search_index.rowid DESC LIMIT ?",
+        (expression, *params, RANK_WINDOW + 1),
+    ).fetchall()
+    truncated = len(rows) > RANK_WINDOW
+    rows = rows[:RANK_WINDOW]
+    score = _scorer(conn, query, location)
+    # Stable sort over newest-first rows: equal scores keep the newer record first
+    ranked = sorted(rows, key=lambda row: score((row["fts_title"], row["fts_body"], row["fts_location"])),
+                    reverse=True)
+    page = ranked[offset:offset + limit]
+    items = [{key: row[key] for key in row.keys() if not key.startswith("fts_")} for row in page]
+    return items, (offset + limit if len(ranked) > offset + limit else None), truncated
+
+
+def facet_counts(conn, kind, field, query="", category=None, status=None, location=None):
+    """({value: matching records}, complete) for facet ``field`` under the other active filters.
+
+    At most FACET_COUNT_CAP matches are counted; ``complete`` is False when the cap was hit.
+    """
+    expression = _expression(conn, query, location)
+    if expression is None:
+        return {}, True
+    filters = {"category": category, "status": status}
+    filters[field] = None
+    where, params = _filters(filters["category"], filters["status"])
+    rows = conn.execute(
+        f"SELECT {field}, COUNT(*) AS hits FROM (SELECT t.{field} FROM search_index "
+        f"JOIN {TABLES[kind]} t ON t.id = search_index.record_id "
+        f"WHERE search_index MATCH ?{where} LIMIT ?) GROUP BY {field}",
+        (expression, *params, FACET_COUNT_CAP + 1),
+    ).fetchall()
+    counts = {row[field]: row["hits"] for row in rows}
+    return counts, sum(counts.values()) <= FACET_COUNT_CAP
+
+
+def rebuild(conn):
+    """Index every petition/report missing from the search index (stores that predate it)."""
+    indexed = 0
+    for kind, table in TABLES.items():
+        rows = conn.execute(
+            f"SELECT * FROM {table} WHERE id NOT IN (SELECT record_id FROM search_docs)"
+        ).fetchall()
+        for row in rows:
+            index(conn, kind, dict(row))
+        indexed += len(rows)
+    return indexed
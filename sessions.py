@@ -0,0 +1,216 @@
+# MAU2 Democracy Platform - Server-Side Session Store
+# Per-session st.session_state keeps IDs and short strings only. Petition drafts
+# live in one process-wide store keyed by a token in the page URL, so a citizen
+# whose websocket reconnects (new Streamlit session) picks the draft back up.
+# Drafts expire after DRAFT_TTL; sessions not seen for IDLE_TIMEOUT are dropped.
+# Given the platform store, drafts are also written through to it, so a citizen
+# who reconnects to a different app replica still finds theirs.
+
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from ids import new_id
+from replication import DRAFTS
+
+DRAFT_TTL = 24 * 3600.0
+IDLE_TIMEOUT = 30 * 60.0
+MAX_DRAFTS = 10000
+# Idle sessions and expired drafts are swept at most this often, from whichever session runs next
+SWEEP_INTERVAL = 60.0
+
+
+# === COMPACT RECORDS ===
+class Draft:
+    __slots__ = ("id", "title", "description", "category", "updated_at")
+
+    def __init__(self, draft_id, title, description, category, updated_at):
+        self.id = draft_id
+        self.title = title
+        self.description = description
+        self.category = category
+        self.updated_at = updated_at
+
+    def as_dict(self):
+        return {"title": self.title, "description": self.description, "category": self.category}
+
+
+class SessionRecord:
+    __slots__ = ("session_id", "user_name", "page", "draft_id", "last_seen", "state_bytes")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.user_name = None
+        self.page = None
+        self.draft_id = None
+        self.last_seen = 0.0
+        self.state_bytes = 0
+
+
+def deep_size(value, _seen=None):
+    """Approximate bytes held by ``value`` and everything it references."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(deep_size(getattr(value, slot, None), seen) for slot in value.__slots__)
+    elif hasattr(value, "__dict__"):
+        size += deep_size(vars(value), seen)
+    return size
+
+
+# === DRAFT STORE ===
+class DraftStore:
+    """Process-wide petition drafts with LRU + TTL eviction.
+
+    With a ``store``, memory only caches drafts: every save is written
+    through and a miss is looked up in the store.
+    """
+
+    def __init__(self, ttl=DRAFT_TTL, max_drafts=MAX_DRAFTS, store=None):
+        self.ttl = ttl
+        self.max_drafts = max_drafts
+        self.store = store
+        self._drafts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, draft_id, title, description, category=None):
+        """Create or overwrite a draft; returns its ID (a new one when ``draft_id`` is None)."""
+        draft = Draft(draft_id or new_id("draft"), title, description, category, time.time())
+        if self.store is not None:
+            self.store.save_draft(draft.id, title, description, category, draft.updated_at)
+        self._remember(draft)
+        return draft.id
+
+    def get(self, draft_id):
+        if not draft_id:
+            return None
+        with self._lock:
+            draft = self._drafts.get(draft_id)
+        if draft is None and self.store is not None:
+            row = self.store.get_draft(draft_id)
+            if row is not None:
+                draft = self._remember(Draft(row["id"], row["title"], row["description"], row["category"],
+                                             row["updated_at"]))
+        if draft is None or draft.updated_at < time.time() - self.ttl:
+            self.forget(draft_id)
+            return None
+        return draft
+
+    def discard(self, draft_id):
+        self.forget(draft_id)
+        if self.store is not None:
+            self.store.delete_draft(draft_id)
+
+    def forget(self, draft_id):
+        """Drop the in-memory copy only (another replica changed the draft)."""
+        with self._lock:
+            self._drafts.pop(draft_id, None)
+
+    def invalidate(self, topic, key=None, local=False):
+        """ChangeFeed listener: drop drafts another replica saved or discarded."""
+        if topic is None:
+            with self._lock:
+                self._drafts.clear()
+        elif topic == DRAFTS and not local:
+            self.forget(key)
+
+    def _remember(self, draft):
+        with self._lock:
+            self._drafts[draft.id] = draft
+            self._drafts.move_to_end(draft.id)
+            while len(self._drafts) > self.max_drafts:
+                self._drafts.popitem(last=False)
+        return draft
+
+    def evict(self):
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            # Insertion order is update order, so expired drafts sit at the front
+            expired = []
+            for draft_id, draft in self._drafts.items():
+                if draft.updated_at >= cutoff:
+                    break
+                expired.append(draft_id)
+            for draft_id in expired:
+                del self._drafts[draft_id]
+        if self.store is not None:
+            self.store.delete_drafts_before(cutoff)
+        return len(expired)
+
+    def memory_bytes(self):
+        with self._lock:
+            return sum(deep_size(draft) for draft in self._drafts.values())
+
+    def __len__(self):
+        return len(self._drafts)
+
+
+# === SESSION REGISTRY ===
+class SessionRegistry:
+    """Tracks live sessions as compact records and reports their memory use."""
+
+    def __init__(self, drafts=None, idle_timeout=IDLE_TIMEOUT, sweep_interval=SWEEP_INTERVAL):
+        self.drafts = drafts if drafts is not None else DraftStore()
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def touch(self, session_id, user_name=None, page=None, draft_id=None, state=None):
+        """Record activity from ``session_id``; ``state`` (its session_state dict) is sized for the report."""
+        state_bytes = deep_size(state) if state is not None else None
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                record = self._sessions[session_id] = SessionRecord(session_id)
+            record.user_name = user_name
+            record.page = page
+            record.draft_id = draft_id
+            record.last_seen = time.time()
+            if state_bytes is not None:
+                record.state_bytes = state_bytes
+            sweep = time.monotonic() - self._last_sweep >= self.sweep_interval
+            if sweep:
+                self._last_sweep = time.monotonic()
+        if sweep:
+            self.evict_idle()
+
+    def end(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_idle(self):
+        """Drop sessions idle for longer than idle_timeout and expired drafts; returns sessions dropped."""
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = [session_id for session_id, record in self._sessions.items() if record.last_seen < cutoff]
+            for session_id in idle:
+                del self._sessions[session_id]
+        self.drafts.evict()
+        return len(idle)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def memory_report(self):
+        with self._lock:
+            sizes = sorted(record.state_bytes for record in self._sessions.values())
+            records = list(self._sessions.values())
+        return {
+            "sessions": len(sizes),
+            "state_bytes_total": sum(sizes),
+            "state_bytes_median": sizes[len(sizes) // 2] if sizes else 0,
+            "state_bytes_max": sizes[-1] if sizes else 0,
+            "registry_bytes": sum(deep_size(record) for record in records),
+            "drafts": len(self.drafts),
+            "draft_bytes": self.drafts.memory_bytes(),
+        }
@@ -0,0 +1,147 @@
+# MAU2 Democracy Platform - Background Submission Queue
+# Petition/evidence submissions are processed off the Streamlit script thread
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ids import new_id
+
+QUEUED = "queued"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+# === SUBMISSION TICKETS ===
+class SubmissionTicket:
+    __slots__ = ("id", "state", "result", "error", "created_at", "finished_at")
+
+    def __init__(self, ticket_id):
+        self.id = ticket_id
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "state": self.state,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+# === SUBMISSION QUEUE ===
+class SubmissionQueue:
+    """Accepts petition drafts plus uploaded files and persists them on a worker pool."""
+
+    def __init__(self, store, evidence_store=None, gazetteer=None, categorizer=None, notifications=None,
+                 media=None, max_workers=4, ticket_ttl=600.0):
+        self.store = store
+        self.evidence_store = evidence_store
+        self.media = media
+        self.gazetteer = gazetteer
+        self.categorizer = categorizer
+        self.notifications = notifications
+        self.ticket_ttl = ticket_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mau2-submit")
+        self._tickets = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, draft, files=(), creator="Anonymous", location="", follower=None):
+        """Queue a petition; returns the ticket ID.
+
+        ``creator`` is stored on the petition. ``follower`` is the citizen key
+        subscribed to its notifications, by default the creator unless anonymous.
+        """
+        if follower is None and creator != "Anonymous":
+            follower = creator
+        ticket = SubmissionTicket(new_id("ticket"))
+        with self._lock:
+            self._prune_locked()
+            self._tickets[ticket.id] = ticket
+            self._pending += 1
+        self._executor.submit(self._run, ticket, dict(draft), list(files or ()), creator, location,
+                              follower)
+        return ticket.id
+
+    def status(self, ticket_id):
+        with self._lock:
+            ticket = self._tickets.get(ticket_id)
+            return ticket.as_dict() if ticket else None
+
+    def depth(self):
+        with self._lock:
+            return self._pending
+
+    def wait(self, ticket_id, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.status(ticket_id)
+            if status is None or status["state"] in (DONE, FAILED):
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            time.sleep(0.01)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    # --- Worker ---
+    def _run(self, ticket, draft, files, creator, location, follower):
+        ticket.state = PROCESSING
+        try:
+            ticket.result = self._process(draft, files, creator, location, follower)
+            ticket.state = DONE
+        except Exception as exc:
+            ticket.error = str(exc)
+            ticket.state = FAILED
+        finally:
+            ticket.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+
+    def _process(self, draft, files, creator, location, follower):
+        evidence = []
+        if self.evidence_store is not None:
+            # Stream files into the blob store before the petition exists, so an
+            # oversized upload fails the ticket without leaving a half-made petition
+            evidence = [self.evidence_store.store_upload(file) for file in files]
+        place = self.gazetteer.geocode(location) if self.gazetteer is not None else None
+        category = draft.get("category")
+        if not category and self.categorizer is not None:
+            category = self.categorizer.categorize(f"{draft['title']}\n{draft['description']}")
+        petition = self.store.add_petition(
+            title=draft["title"],
+            description=draft["description"],
+            category=category or "Other",
+            creator=creator,
+            location=location,
+            coordinates=(place["lat"], place["lon"]) if place else None,
+        )
+        for record in evidence:
+            self.evidence_store.link(petition["id"], record, actor=follower)
+            if self.media is not None:
+                # Thumbnails are ready by the time the petition reaches a feed page, usually
+                self.media.request(record["sha256"], record["content_type"])
+        if self.notifications is not None and follower:
+            # The creator follows their own petition from now on
+            self.notifications.subscribe(follower, "petition", petition["id"])
+            self.notifications.publish("petition", petition["id"], "created", title=petition["title"],
+                                       recipients=[follower])
+        return {"petition_id": petition["id"], "evidence": evidence}
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.ticket_ttl
+        expired = [
+            ticket_id for ticket_id, ticket in self._tickets.items()
+            if ticket.finished_at is not None and ticket.finished_at < cutoff
+        ]
+        for ticket_id in expired:
+            del self._tickets[ticket_id]
@@ -0,0 +1,41 @@
+# MAU2 Democracy Platform - Page Registry
+# Page modules are imported on first visit, so e.g. pandas is only loaded once
+# someone opens a page that needs it.
+
+import importlib
+import logging
+import sys
+import time
+
+logger = logging.getLogger("mau2")
+
+# page key -> (module, render function)
+PAGES = {
+    'landing': ("views.landing", "render_landing_page"),
+    'onboarding': ("views.onboarding", "render_onboarding_page"),
+    'dashboard': ("views.dashboard", "render_dashboard"),
+    'petitions': ("views.browse", "render_petitions"),
+    'reports': ("views.browse", "render_reports"),
+    'create_petition': ("views.create_petition", "render_create_petition"),
+    'petition_evidence': ("views.petition_evidence", "render_petition_evidence"),
+    'analytics': ("views.analytics", "render_analytics"),
+    'settings': ("views.settings", "render_settings"),
+    # Hidden: reached through ?admin=metrics with the admin token, not the navigation bar
+    'admin': ("views.admin", "render_admin"),
+}
+DEFAULT_PAGE = 'dashboard'
+
+# Cold import time per page module, in milliseconds
+IMPORT_TIMES_MS = {}
+
+
+def load_page(page):
+    """Return the render function for ``page``, importing its module on first use."""
+    module_name, function_name = PAGES.get(page, PAGES[DEFAULT_PAGE])
+    module = sys.modules.get(module_name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        IMPORT_TIMES_MS[module_name] = (time.perf_counter() - started) * 1000
+        logger.info("imported %s in %.1f ms", module_name, IMPORT_TIMES_MS[module_name])
+    return getattr(module, function_name)
@@ -0,0 +1,64 @@
+# MAU2 Democracy Platform - Hidden Instrumentation Page (?admin=metrics&admin_token=...)
+
+import collections
+import time
+
+import streamlit as st
+
+import instrumentation
+from components import render_navigation
+
+# === PROFILER ===
+def hottest_frames(stacks, limit=15):
+    # Self time: samples in which the frame was the innermost call
+    leaves = collections.Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    total = sum(leaves.values()) or 1
+    return [{"frame": frame, "samples": count, "share": f"{count / total:.1%}"}
+            for frame, count in leaves.most_common(limit)]
+
+def render_profiler():
+    st.markdown("### 🔥 Sampling Profiler")
+    st.caption("Samples every thread's stack, including background workers, and returns collapsed stacks "
+               "for flame-graph tools.")
+    seconds = st.number_input("Seconds", min_value=1, max_value=int(instrumentation.MAX_PROFILE_SECONDS),
+                              value=5, key="admin_profile_seconds")
+    if st.button("Capture profile", key="admin_profile"):
+        with st.spinner(f"Sampling for {seconds} s..."):
+            stacks = instrumentation.sample_stacks(seconds)
+        st.dataframe(hottest_frames(stacks), use_container_width=True)
+        st.download_button("Download collapsed stacks", instrumentation.collapsed(stacks),
+                           file_name=f"mau2-profile-{time.strftime('%Y%m%d-%H%M%S')}.txt", mime="text/plain")
+
+# === ADMIN PAGE ===
+def render_admin():
+    st.markdown("# 🛠️ Instrumentation")
+    
+    # Set by initialize_platform() once ?admin_token= matched MAU2_ADMIN_TOKEN
+    if not st.session_state.get('admin_verified'):
+        st.error("This page needs an admin token.")
+        render_navigation()
+        return
+    
+    if not instrumentation.ENABLED:
+        st.info("Instrumentation is off. Start the app with `MAU2_INSTRUMENT=1` to record render timings.")
+        render_navigation()
+        return
+    
+    st.caption(f"Prometheus endpoint: `http://127.0.0.1:{instrumentation.METRICS_PORT}/metrics` "
+               f"(profiles: `/profile?seconds=5`)")
+    
+    st.markdown("### ⏱️ Render Functions")
+    summary = instrumentation.METRICS.summary()
+    if summary:
+        st.dataframe(summary, use_container_width=True)
+    else:
+        st.info("No renders recorded yet.")
+    
+    with st.expander("Prometheus text"):
+        st.code(instrumentation.METRICS.prometheus(), language="text")
+    
+    render_profiler()
+    
+    render_navigation()
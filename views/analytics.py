@@ -0,0 +1,130 @@
+# MAU2 Democracy Platform - Analytics Page
+
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from components import render_navigation
+from html_fragments import fragment
+from replication import ANALYTICS
+from resources import get_platform_store, get_read_cache
+
+# === ANALYTICS PAGE ===
+def month_over_month(months, field):
+    if len(months) < 2 or not months[-2][field]:
+        return None
+    return (months[-1][field] - months[-2][field]) / months[-2][field]
+
+def render_trend(change, higher_is_better=True):
+    if change is None:
+        return "\u00a0", "#64748b"
+    good = (change >= 0) == higher_is_better
+    arrow = "↗" if change >= 0 else "↘"
+    return f"{arrow} {change:+.0%}", "#10b981" if good else "#ef4444"
+
+def format_response_time(seconds):
+    days = seconds / 86400
+    if days >= 1:
+        return f"{days:.1f} days"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} hrs"
+    return f"{max(1, round(seconds / 60))} min"
+
+HEATMAP_PRECISION = 5
+HEATMAP_TILE_RADIUS_M = 2400
+
+def heat_color(count, peak):
+    if count >= peak * 2 / 3:
+        return "#ef4444"
+    if count >= peak / 3:
+        return "#f59e0b"
+    return "#10b981"
+
+def format_month(month):
+    return datetime.datetime.strptime(month, "%Y-%m").strftime("%b")
+
+def render_analytics():
+    st.markdown("## Analytics & Insights")
+    st.markdown("*Key performance indicators for the MAU2 platform.*")
+    
+    # Rollups are shared by every session on this replica until a write on any replica changes them
+    store, cache = get_platform_store(), get_read_cache()
+    snapshot = cache.get(ANALYTICS, ("snapshot",), store.analytics_snapshot)
+    counters = snapshot['counters']
+    petition_months = snapshot['monthly']['petition']
+    
+    opened = int(counters.get('petition_opened', 0))
+    closed = int(counters.get('petition_closed', 0))
+    # Percentiles come from the lifecycle log's response-time histograms, not a replay
+    response_times = cache.get(ANALYTICS, ("response_percentiles",),
+                               lambda: store.response_percentiles(quantiles=(0.5, 0.9)))
+    verified = int(counters.get('petition_verified', 0))
+    
+    # Metrics row
+    metrics = [
+        (f"{opened:,}", "Petitions Opened", render_trend(month_over_month(petition_months, 'opened'))),
+        (f"{closed:,}", "Petitions Closed", render_trend(month_over_month(petition_months, 'closed'))),
+        (format_response_time(response_times[0.5]) if response_times else "—", "Median Response Time",
+         (f"p90 {format_response_time(response_times[0.9])}", "#64748b") if response_times
+         else render_trend(None)),
+        (f"{verified / opened:.0%}" if opened else "—", "Verification Rate", (f"of {opened:,} petitions", "#64748b")),
+    ]
+    
+    for column, (value, label, (trend, trend_color)) in zip(st.columns(4), metrics):
+        with column:
+            st.markdown(fragment('metric_card', value=value, label=label, trend=trend, trend_color=trend_color),
+                        unsafe_allow_html=True)
+    
+    # Map section
+    st.markdown("### Incident Concentration Heatmap")
+    
+    # Tiles are aggregated server-side from the geohash rollups; raw points never reach the browser
+    tiles = cache.get(ANALYTICS, ("tiles", HEATMAP_PRECISION), lambda: store.heatmap_tiles(precision=HEATMAP_PRECISION))
+    if tiles:
+        peak = tiles[0]['count']
+        st.map(pd.DataFrame({
+            'lat': [tile['lat'] for tile in tiles],
+            'lon': [tile['lon'] for tile in tiles],
+            'size': [HEATMAP_TILE_RADIUS_M] * len(tiles),
+            'color': [heat_color(tile['count'], peak) for tile in tiles]
+        }), size='size', color='color')
+    else:
+        st.markdown(fragment('map_placeholder', height=400, icon="🌡️", title="Heat Map Visualization",
+                             subtitle="No geocoded incidents yet"), unsafe_allow_html=True)
+    
+    st.markdown(fragment('heat_legend'), unsafe_allow_html=True)
+    
+    # Charts section
+    col_chart1, col_chart2 = st.columns(2)
+    
+    with col_chart1:
+        st.markdown("### Petition Trends")
+        st.markdown("*Opened vs. Closed over the last 6 months*")
+        
+        if petition_months:
+            # Rollups are already one row per month, so the chart needs no pivot
+            chart_data = pd.DataFrame({
+                'Opened': [row['opened'] for row in petition_months],
+                'Closed': [row['closed'] for row in petition_months]
+            }, index=[format_month(row['month']) for row in petition_months])
+            st.line_chart(chart_data)
+        else:
+            st.info("No petitions yet.")
+    
+    with col_chart2:
+        st.markdown("### Response Time by Category")
+        st.markdown("*Median days to first response*")
+        
+        response_days = {
+            category: seconds / 86400
+            for category, seconds in cache.get(ANALYTICS, ("response_by_category",),
+                                               store.response_percentiles_by_category).items()
+        }
+        
+        if response_days:
+            st.bar_chart(pd.DataFrame({'Response Time (Days)': response_days}))
+        else:
+            st.info("No responses recorded yet.")
+    
+    render_navigation()
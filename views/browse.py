@@ -0,0 +1,111 @@
+# MAU2 Democracy Platform - Petition & Report Search
+
+import streamlit as st
+
+from components import render_navigation
+from replication import PETITIONS, REPORTS
+from resources import get_platform_store, get_read_cache
+from search import RANK_WINDOW
+from views.dashboard import CATEGORY_STYLES, FEED_PAGE_SIZE, render_feed_section, reset_feed
+
+ANY = "Any"
+
+SEARCH_PAGES = {
+    "petition": {
+        "section": "petitions",
+        "title": "📋 Petitions",
+        "subtitle": "Search and browse every petition on MAU2.",
+        "categories": list(CATEGORY_STYLES),
+        "statuses": ["active", "under_review", "resolved", "closed"],
+        "action": "View Petition",
+    },
+    "report": {
+        "section": "reports",
+        "title": "📝 Reports",
+        "subtitle": "Search and browse reported community issues.",
+        "categories": list(CATEGORY_STYLES) + ["Other"],
+        "statuses": ["submitted", "acknowledged", "in_progress", "resolved", "closed"],
+        "action": "View Report",
+    },
+}
+
+# === SEARCH PAGE ===
+def facet_label(counts, complete):
+    def label(value):
+        if value == ANY or not counts:
+            return value
+        count = counts.get(value, 0)
+        return f"{value} ({count}{'' if complete else '+'})"
+    return label
+
+def render_search_page(kind):
+    page = SEARCH_PAGES[kind]
+    key = f"search_{kind}"
+    store = get_platform_store()
+    
+    st.markdown(f"# {page['title']}")
+    st.markdown(f"*{page['subtitle']}*")
+    
+    col_query, col_location = st.columns([2, 1])
+    with col_query:
+        query = st.text_input("Search", key=f"{key}_query", placeholder="e.g. pothole main street",
+                              on_change=reset_feed, args=(key,))
+    with col_location:
+        location = st.text_input("Location", key=f"{key}_location", placeholder="e.g. Mission District",
+                                 on_change=reset_feed, args=(key,))
+    
+    # Facet counts come from the text search, so they only apply once there is something to search for
+    category = st.session_state.get(f"{key}_category", ANY)
+    status = st.session_state.get(f"{key}_status", ANY)
+    filters = {
+        "query": query,
+        "category": None if category == ANY else category,
+        "status": None if status == ANY else status,
+        "location": location,
+    }
+    
+    col_category, col_status = st.columns(2)
+    with col_category:
+        counts, complete = store.search_facets(kind, "category", **filters)
+        st.selectbox("Category", [ANY] + page["categories"], key=f"{key}_category",
+                     format_func=facet_label(counts, complete), on_change=reset_feed, args=(key,))
+    with col_status:
+        counts, complete = store.search_facets(kind, "status", **filters)
+        st.selectbox("Status", [ANY] + page["statuses"], key=f"{key}_status",
+                     format_func=facet_label(counts, complete), on_change=reset_feed, args=(key,))
+    
+    # Set when a search matched more records than the ranking window holds
+    truncated = []
+    if query.strip() or location.strip():
+        search = store.search_petitions if kind == "petition" else store.search_reports
+        
+        def load_page(cursor):
+            items, next_offset, cut_off = search(limit=FEED_PAGE_SIZE, offset=cursor or 0, **filters)
+            truncated.append(cut_off)
+            return items, next_offset
+        empty_message = f"No {page['section']} match your search."
+    else:
+        # Plain browsing walks the keyset feed, newest first
+        feed = store.petition_feed if kind == "petition" else store.report_feed
+        topic = PETITIONS if kind == "petition" else REPORTS
+        load_page = lambda cursor: get_read_cache().get(
+            topic, ("browse", cursor, filters["category"], filters["status"]),
+            lambda: feed(cursor=cursor, limit=FEED_PAGE_SIZE, category=filters["category"], status=filters["status"]))
+        empty_message = f"No {page['section']} match these filters."
+    
+    load_covers = None
+    if kind == "petition":
+        load_covers = lambda ids: get_read_cache().get(PETITIONS, ("covers", ids), lambda: store.evidence_covers(ids))
+    render_feed_section(page["section"], load_page, page["action"], key=key, empty_message=empty_message,
+                        load_covers=load_covers)
+    if any(truncated):
+        st.caption(f"More than {RANK_WINDOW:,} {page['section']} match; these are the best of the most recent "
+                   "ones. Add words, a location or a filter to narrow the search.")
+    
+    render_navigation()
+
+def render_petitions():
+    render_search_page("petition")
+
+def render_reports():
+    render_search_page("report")
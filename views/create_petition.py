@@ -0,0 +1,103 @@
+# MAU2 Democracy Platform - Create Petition Page
+
+import streamlit as st
+
+from components import citizen_key, get_draft, navigate, render_navigation, save_draft
+from html_fragments import fragment, progress_steps
+from resources import (get_admission_controller, get_categorizer, get_notification_hub, get_platform_store,
+                       get_vote_counter)
+
+SIMILAR_LIMIT = 3
+MIN_QUERY_LENGTH = 8
+
+# === NEAR-DUPLICATE SUGGESTIONS ===
+def render_similar_petitions(title, description):
+    if len(title.strip()) < MIN_QUERY_LENGTH and not description.strip():
+        return
+    matches = get_platform_store().similar_petitions(title, description, limit=SIMILAR_LIMIT)
+    if not matches:
+        return
+    
+    st.info("Similar petitions already exist. Supporting one keeps votes from being split across copies.")
+    counter = get_vote_counter()
+    voter = citizen_key()
+    for petition in matches:
+        col_text, col_action = st.columns([3, 1])
+        with col_text:
+            votes = petition['votes'] + counter.pending_votes(petition['id'])
+            st.markdown(f"**{petition['title']}**  \n"
+                        f"👍 {votes:,} · {petition['category']} · {petition['similarity']:.0%} match")
+        with col_action:
+            voted = counter.has_voted(petition['id'], voter)
+            if st.button("✅ Supported" if voted else "👍 Support", key=f"support_{petition['id']}",
+                         disabled=voted, use_container_width=True):
+                counter.upvote(petition['id'], voter)
+                get_notification_hub().subscribe(voter, "petition", petition['id'])
+                navigate('dashboard')
+
+# === CREATE PETITION PAGE ===
+def render_create_petition():
+    # Progress indicator
+    st.markdown(progress_steps(1), unsafe_allow_html=True)
+    
+    st.markdown(fragment('form_header', title="Create a Petition",
+                         subtitle="Fill in the details below to start your petition."), unsafe_allow_html=True)
+    
+    # Title and description live outside the form so suggestions refresh as the citizen types
+    draft = get_draft()
+    if draft and 'petition_title' not in st.session_state:
+        # A new session (e.g. after a reconnect) resumes the saved draft
+        st.session_state.petition_title = draft.title
+        st.session_state.petition_description = draft.description
+    petition_title = st.text_input("Petition Title", key="petition_title",
+                                   placeholder="Enter a concise title for your petition")
+    
+    description = st.text_area(
+        "Description", 
+        key="petition_description",
+        placeholder="Provide a detailed description of the issue you want to address",
+        height=150
+    )
+    
+    # Saved as the citizen types, so a dropped connection does not lose the petition;
+    # reruns that leave the text as loaded (suggestion clicks, fragment refreshes) write nothing
+    edited = draft is None or (petition_title, description) != (draft.title, draft.description)
+    if (petition_title or description) and edited:
+        save_draft(petition_title, description, draft.category if draft else None)
+    
+    render_similar_petitions(petition_title, description)
+    
+    with st.form("petition_form"):
+        category = st.selectbox("Category", [
+            "Select a category",
+            "Transportation", 
+            "Environment",
+            "Infrastructure", 
+            "Public Safety",
+            "Education",
+            "Healthcare"
+        ], help="Leave unselected and MAU2 will categorize the petition for you.")
+        
+        col_submit, col_back = st.columns([1, 1])
+        with col_submit:
+            submitted = st.form_submit_button("Next →", use_container_width=True)
+        with col_back:
+            if st.form_submit_button("← Back to Dashboard", use_container_width=True):
+                navigate('dashboard')
+        
+        if submitted:
+            if get_admission_controller().overloaded():
+                # Shed here too: no categorization work while the submission queue is backed up
+                st.warning("⏳ MAU2 is handling a lot of submissions right now. Please try again in a few "
+                           "seconds. Your draft is saved.")
+            elif petition_title and description:
+                if category == "Select a category":
+                    # Categorize in the background; the submission worker picks up the cached answer
+                    category = None
+                    get_categorizer().submit(f"{petition_title}\n{description}")
+                save_draft(petition_title, description, category)
+                navigate('petition_evidence')
+            else:
+                st.error("Please fill in all required fields")
+    
+    render_navigation()
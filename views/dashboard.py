@@ -0,0 +1,131 @@
+# MAU2 Democracy Platform - Dashboard
+
+import streamlit as st
+
+from components import citizen_key, navigate, render_navigation, rerun_page
+from html_fragments import fragment
+from replication import PETITIONS, REPORTS
+from resources import get_media_worker, get_notification_hub, get_platform_store, get_read_cache, get_vote_counter
+
+FEED_PAGE_SIZE = 4
+FEED_SORTS = {"Most recent": "recent", "Most upvoted": "votes"}
+
+CATEGORY_STYLES = {
+    "Transportation": ("🚦", "#3b82f6", "#1d4ed8"),
+    "Environment": ("🏞️", "#10b981", "#059669"),
+    "Infrastructure": ("🕳️", "#f59e0b", "#d97706"),
+    "Public Safety": ("🚨", "#ef4444", "#dc2626"),
+    "Education": ("🎓", "#8b5cf6", "#6d28d9"),
+    "Healthcare": ("🏥", "#ec4899", "#db2777"),
+}
+DEFAULT_STYLE = ("📌", "#64748b", "#475569")
+
+# === CIVIC FEED ===
+def summarize(text, limit=140):
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "…"
+
+def reset_feed(section):
+    st.session_state[f"feed_cursors_{section}"] = [None]
+
+def render_upvote_button(petition_id):
+    counter = get_vote_counter()
+    voter = citizen_key()
+    voted = counter.has_voted(petition_id, voter)
+    if st.button("✅ Upvoted" if voted else "👍 Upvote", key=f"upvote_{petition_id}",
+                 disabled=voted, use_container_width=True):
+        counter.upvote(petition_id, voter)
+        # Supporters hear about status changes and merges from now on
+        get_notification_hub().subscribe(voter, "petition", petition_id)
+        rerun_page()
+
+def render_feed_section(section, load_page, action, key=None, empty_message=None, load_covers=None):
+    # Keyset pagination: the session keeps only the cursors of visited pages, never the rows
+    key = key or section
+    cursors = st.session_state.setdefault(f"feed_cursors_{key}", [None])
+    items, next_cursor = load_page(cursors[-1])
+    # Cards show a cached thumbnail once the media worker has made one, the category icon until then
+    covers = load_covers(tuple(item['id'] for item in items)) if load_covers and items else {}
+    media = get_media_worker() if covers else None
+    
+    if not items:
+        if len(cursors) > 1:
+            st.info(f"No more {section}.")
+        else:
+            st.info(empty_message or f"No {section} yet — be the first to create one.")
+    
+    for start in range(0, len(items), 2):
+        for column, item in zip(st.columns(2), items[start:start + 2]):
+            icon, color_from, color_to = CATEGORY_STYLES.get(item['category'], DEFAULT_STYLE)
+            if section == "petitions":
+                votes = item['votes'] + get_vote_counter().pending_votes(item['id'])
+                title, meta = item['title'], f"👍 {votes:,} · {item['category']} · {item['status']}"
+            else:
+                title, meta = item['report_type'], f"{item['category']} · {item['status']}"
+            thumbnail = media.thumbnail(*covers[item['id']]) if item['id'] in covers else None
+            with column:
+                if thumbnail:
+                    st.image(thumbnail)
+                    st.markdown(fragment('feed_card_text', title=title, text=summarize(item['description']),
+                                         meta=meta, action=action), unsafe_allow_html=True)
+                else:
+                    st.markdown(fragment('feed_card', icon=icon, color_from=color_from, color_to=color_to,
+                                         title=title, text=summarize(item['description']), meta=meta,
+                                         action=action), unsafe_allow_html=True)
+                if section == "petitions":
+                    render_upvote_button(item['id'])
+    
+    col_newer, col_more = st.columns(2)
+    with col_newer:
+        if len(cursors) > 1 and st.button("← Newer", key=f"feed_newer_{key}", use_container_width=True):
+            cursors.pop()
+            rerun_page()
+    with col_more:
+        if next_cursor and st.button("Load more →", key=f"feed_more_{key}", use_container_width=True):
+            cursors.append(next_cursor)
+            rerun_page()
+
+# === DASHBOARD ===
+def render_dashboard():
+    # User profile section
+    col1, col2 = st.columns([1, 3])
+    
+    with col1:
+        st.markdown(fragment('profile_card', user_name=st.session_state.get('user_name', 'Sophia Carter'),
+                             role="Citizen", joined=2021, petitions=12, reports=5, resolved=2), unsafe_allow_html=True)
+        
+        # Quick actions
+        st.markdown("### Quick Actions")
+        if st.button("📋 Create Petition", use_container_width=True):
+            navigate('create_petition')
+        if st.button("📝 Report an Issue", use_container_width=True):
+            navigate('report_incident')
+        if st.button("👀 View My Activity", use_container_width=True):
+            navigate('my_activity')
+    
+    with col2:
+        st.markdown("## Your Civic Feed")
+        st.markdown("*Stay informed and engaged with your community.*")
+        
+        store = get_platform_store()
+        # Feed pages are shared by every session on this replica until a write on any replica touches them
+        cache = get_read_cache()
+        
+        st.markdown("### Petitions")
+        sort = st.selectbox("Sort petitions by", list(FEED_SORTS), key="feed_sort_petitions",
+                            on_change=reset_feed, args=("petitions",), label_visibility="collapsed")
+        render_feed_section(
+            "petitions",
+            lambda cursor: cache.get(PETITIONS, ("feed", FEED_SORTS[sort], cursor),
+                                     lambda: store.petition_feed(FEED_SORTS[sort], cursor, FEED_PAGE_SIZE)),
+            "View Petition",
+            load_covers=lambda ids: cache.get(PETITIONS, ("covers", ids), lambda: store.evidence_covers(ids))
+        )
+        
+        st.markdown("### Reports")
+        render_feed_section(
+            "reports",
+            lambda cursor: cache.get(REPORTS, ("feed", cursor), lambda: store.report_feed(cursor, FEED_PAGE_SIZE)),
+            "View Report"
+        )
+    
+    render_navigation()
@@ -0,0 +1,28 @@
+# MAU2 Democracy Platform - Landing Page
+
+import streamlit as st
+
+from components import navigate, render_navigation
+from html_fragments import fragment
+
+# === LANDING PAGE ===
+def render_landing_page():
+    st.markdown(fragment('hero'), unsafe_allow_html=True)
+    
+    # Feature showcase
+    features = [
+        ("📋", "#3b82f6", "#1d4ed8", "Create Petitions", "Start petitions for community issues and gather support from fellow citizens."),
+        ("📍", "#10b981", "#059669", "Report Issues", "Report incidents and issues in your community with location-based mapping."),
+        ("📊", "#f59e0b", "#d97706", "Track Progress", "Monitor the status and progress of your petitions and community issues."),
+    ]
+    
+    for column, (icon, color_from, color_to, title, text) in zip(st.columns(3), features):
+        with column:
+            st.markdown(fragment('feature_card', icon=icon, color_from=color_from, color_to=color_to,
+                                 title=title, text=text), unsafe_allow_html=True)
+    
+    # Call to action
+    if st.button("🚀 Get Started", key="cta_button", use_container_width=True):
+        navigate('onboarding')
+    
+    render_navigation()
@@ -0,0 +1,13 @@
+# MAU2 Democracy Platform - Onboarding/Rights Page
+
+import streamlit as st
+
+from components import navigate
+from html_fragments import fragment
+
+# === ONBOARDING/RIGHTS PAGE ===
+def render_onboarding_page():
+    st.markdown(fragment('onboarding'), unsafe_allow_html=True)
+    
+    if st.button("Next", key="next_onboarding", use_container_width=True):
+        navigate('dashboard')
@@ -0,0 +1,94 @@
+# MAU2 Democracy Platform - Petition Evidence & Location Page
+
+import streamlit as st
+
+from components import citizen_key, clear_draft, get_draft, go_to, navigate, render_navigation, submitter_keys
+from html_fragments import fragment, progress_steps
+from ratelimit import SubmissionRejected
+from resources import get_admission_controller, get_gazetteer, get_submission_queue
+
+# === PETITION EVIDENCE & LOCATION PAGE ===
+def render_petition_evidence():
+    # Progress indicator
+    st.markdown(progress_steps(2), unsafe_allow_html=True)
+    
+    st.markdown(fragment('form_header', title="Specify Location & Upload Evidence",
+                         subtitle="Pinpoint the incident on the map and provide supporting evidence."), unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("### 📍 Incident Location")
+        
+        location_input = st.text_input("Address or Coordinates", placeholder="e.g., 123 Main St, City Hall")
+        
+        # Geocoded offline against the local gazetteer
+        place = get_gazetteer().geocode(location_input)
+        if place:
+            st.map({'lat': [place['lat']], 'lon': [place['lon']]}, zoom=13)
+            st.caption(f"📍 {place['name']} ({place['lat']:.4f}, {place['lon']:.4f})")
+        else:
+            st.markdown(fragment('map_placeholder', height=300, icon="🗺️", title="Interactive Map",
+                                 subtitle="Enter an address or coordinates to pin the incident"), unsafe_allow_html=True)
+            if location_input:
+                st.warning("Location not found in the local gazetteer; it will be saved as text only.")
+        
+        col_auto1, col_auto2 = st.columns(2)
+        with col_auto1:
+            auto_snap_time = st.checkbox("Auto-snap location & time", value=True)
+        with col_auto2:
+            manual_override = st.button("Manual override")
+    
+    with col2:
+        st.markdown("### 📎 Upload Evidence")
+        st.markdown("*Drag and drop files here*")
+        st.markdown("*or*")
+        
+        # File uploader
+        uploaded_files = st.file_uploader(
+            "Browse files",
+            type=['jpg', 'png', 'mp4', 'pdf', 'mp3'],
+            accept_multiple_files=True,
+            help="Supports: Images, Videos, PDFs, Voice Notes. Max 25MB."
+        )
+        
+        if uploaded_files:
+            st.success(f"✅ {len(uploaded_files)} file(s) uploaded successfully")
+            for file in uploaded_files:
+                st.markdown(f"📎 `{file.name}`")
+        
+        st.info("**Supports:** Images, Videos, PDFs, Voice Notes. Max 25MB.")
+    
+    col_back, col_next = st.columns([1, 1])
+    with col_back:
+        if st.button("← Back", key="back_to_petition_form", use_container_width=True):
+            navigate('create_petition')
+    
+    with col_next:
+        if st.button("Submit Report →", key="submit_report", use_container_width=True):
+            draft = get_draft()
+            if draft is None:
+                st.error("Please start a petition before submitting evidence")
+            else:
+                try:
+                    # Checked before any upload work; a rejected submission keeps its draft
+                    get_admission_controller().admit(*submitter_keys())
+                except SubmissionRejected as exc:
+                    st.warning(f"⏳ {exc.friendly_message()} Your draft is saved.")
+                else:
+                    # Hand the draft to the background queue and return straight away
+                    ticket_id = get_submission_queue().submit(
+                        draft.as_dict(),
+                        uploaded_files or [],
+                        # Signed-out visitors stay anonymous on the petition but still follow it
+                        creator=st.session_state.get('user_name') or "Anonymous",
+                        location=location_input,
+                        follower=citizen_key()
+                    )
+                    st.session_state.pending_submissions.append(ticket_id)
+                    clear_draft()
+                    # Full rerun so the header starts polling the new ticket
+                    go_to('dashboard')
+                    st.rerun()
+    
+    render_navigation()
@@ -0,0 +1,48 @@
+# MAU2 Democracy Platform - Settings Page
+
+import streamlit as st
+
+from components import citizen_key, render_navigation
+from resources import get_notification_hub
+
+# === NOTIFICATION PREFERENCES ===
+def save_notification_preferences(user_name):
+    get_notification_hub().set_preferences(user_name, st.session_state.settings_general_notifications,
+                                           st.session_state.settings_interaction_notifications)
+
+# === SETTINGS PAGE ===
+def render_settings():
+    st.markdown("# Settings")
+    user_name = citizen_key()
+    preferences = get_notification_hub().preferences(user_name)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🛡️ Privacy")
+        
+        incognito_mode = st.toggle("Incognito Mode", help="Browse privately. Your activity won't be saved.")
+        
+    with col2:
+        st.markdown("### 🔔 Notifications")
+        
+        st.toggle("General Notifications", value=preferences['general'], key="settings_general_notifications",
+                  on_change=save_notification_preferences, args=(user_name,),
+                  help="Receive updates on petitions, issues, and community activity.")
+        
+        st.toggle("Interaction Notifications", value=preferences['interaction'], key="settings_interaction_notifications",
+                  on_change=save_notification_preferences, args=(user_name,),
+                  help="Get notified about new comments and reactions on your posts.")
+    
+    st.markdown("---")
+    
+    st.markdown("### 🔐 Security")
+    
+    if st.button("Enable Two-Factor Authentication", use_container_width=True):
+        st.info("Two-factor authentication setup would be initiated here.")
+    
+    st.markdown("---")
+    
+    st.markdown("*For more detailed information on how we handle your data, please refer to our [Privacy Policy](#).*")
+    
+    render_navigation()
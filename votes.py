@@ -0,0 +1,122 @@
+# MAU2 Democracy Platform - Upvote Counters
+# Votes land in sharded in-memory buffers and are flushed to the store in batches,
+# so a viral petition does not turn every click into its own write transaction.
+
+import logging
+import threading
+import zlib
+
+logger = logging.getLogger("mau2")
+
+
+# === COUNTER SHARDS ===
+class _Shard:
+    __slots__ = ("lock", "pending", "seen", "counts")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = []
+        self.seen = set()
+        self.counts = {}
+
+
+class VoteCounter:
+    """Accepts upvotes concurrently and flushes them to the store periodically.
+
+    Every (petition, voter) pair always maps to the same shard, so duplicate
+    clicks are dropped in memory; the store's primary key on petition_votes
+    guarantees each voter is counted at most once across flushes and processes.
+    """
+
+    def __init__(self, store, shards=16, flush_interval=0.5, on_flush=None):
+        self.store = store
+        self.flush_interval = flush_interval
+        # Called with {petition_id: new votes} after each successful flush
+        self.on_flush = on_flush
+        self._shards = [_Shard() for _ in range(shards)]
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _shard(self, petition_id, voter_id):
+        key = f"{petition_id}\x00{voter_id}".encode()
+        return self._shards[zlib.crc32(key) % len(self._shards)]
+
+    def upvote(self, petition_id, voter_id):
+        """Buffer an upvote; returns False if this voter's vote is already pending."""
+        shard = self._shard(petition_id, voter_id)
+        with shard.lock:
+            if (petition_id, voter_id) in shard.seen:
+                return False
+            shard.seen.add((petition_id, voter_id))
+            shard.pending.append((petition_id, voter_id))
+            shard.counts[petition_id] = shard.counts.get(petition_id, 0) + 1
+        return True
+
+    def pending_votes(self, petition_id):
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += shard.counts.get(petition_id, 0)
+        return total
+
+    def has_voted(self, petition_id, voter_id):
+        shard = self._shard(petition_id, voter_id)
+        with shard.lock:
+            if (petition_id, voter_id) in shard.seen:
+                return True
+        return self.store.has_voted(petition_id, voter_id)
+
+    # === FLUSHING ===
+    def flush(self):
+        """Write every buffered vote in one transaction; returns the number of new votes."""
+        with self._flush_lock:
+            batch = []
+            drained = []
+            for shard in self._shards:
+                with shard.lock:
+                    if shard.pending:
+                        drained.append((shard, shard.pending, shard.counts))
+                        batch.extend(shard.pending)
+                        shard.pending, shard.counts = [], {}
+            if not batch:
+                return 0
+            try:
+                accepted = self.store.apply_votes(batch)
+            except Exception:
+                # Put the batch back so the next flush retries it
+                for shard, pending, counts in drained:
+                    with shard.lock:
+                        shard.pending[:0] = pending
+                        for petition_id, count in counts.items():
+                            shard.counts[petition_id] = shard.counts.get(petition_id, 0) + count
+                raise
+            for shard, pending, _ in drained:
+                with shard.lock:
+                    shard.seen.difference_update(pending)
+            if self.on_flush is not None and accepted:
+                try:
+                    self.on_flush(accepted)
+                except Exception:
+                    logger.exception("vote flush callback failed")
+            return sum(accepted.values())
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mau2-vote-flush", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("vote flush failed; batch will be retried")